@@ -0,0 +1,47 @@
+# routers/admin.py
+import logging
+from typing import Literal, Union
+from fastapi import APIRouter, Depends, Query
+from core.response import to_response
+from core.security import is_admin
+from db.slow_query import slow_query_log
+from schemas.Response import ApiResponse, ErrorResponse
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+logger = logging.getLogger("api.v1.admin")
+
+
+@router.get("/slow-queries", response_model=Union[ApiResponse, ErrorResponse])
+async def get_slow_queries_route(
+    limit: int = Query(20, ge=1, le=200),
+    order_by: Literal["total", "max", "count", "slow"] = "total",
+    _: None = Depends(is_admin),
+):
+    """
+    查看 SQL 指纹聚合统计（Top-N）
+
+    仅管理员可访问，返回当前 worker 进程内按指纹聚合的 SQL 执行统计。
+
+    - 权限：仅限管理员
+    - 参数：limit 返回条数；order_by 排序维度（total 总耗时 / max 最大耗时 / count 次数 / slow 慢查询次数）
+    - 返回：指纹列表及慢查询阈值
+    """
+    return to_response(
+        data={
+            "threshold_ms": slow_query_log.threshold * 1000,
+            "items": slow_query_log.top(limit, order_by),
+        }
+    )
+
+
+@router.delete("/slow-queries", response_model=Union[ApiResponse, ErrorResponse])
+async def reset_slow_queries_route(_: None = Depends(is_admin)):
+    """
+    清空 SQL 指纹聚合统计
+
+    - 权限：仅限管理员
+    - 返回：清空成功消息
+    """
+    slow_query_log.reset()
+    logger.info("SQL 指纹统计已清空")
+    return to_response(message="Slow query statistics reset")
@@ -0,0 +1,135 @@
+# routers/attachments.py
+import logging
+import os
+from mimetypes import guess_type
+from pathlib import PurePosixPath
+from typing import Union
+from urllib.parse import quote
+import anyio
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import FileResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from core import exceptions
+from core.config import settings
+from core.dependencies import get_principal
+from core.principal import Principal
+from core.response import to_response
+from core.security import is_teacher_or_admin
+from db.connector import DatabaseConnector
+from schemas.Response import ApiResponse, ErrorResponse, UploadedAttachmentData
+from services.attachments import (
+    STORAGE_ROOT,
+    blob_path,
+    get_attachment,
+    save_attachment,
+)
+
+router = APIRouter(prefix="/attachments", tags=["Attachments"])
+logger = logging.getLogger("api.v1.attachments")
+
+# 附件内容按 SHA-256 寻址、写入后不再变化，浏览器可永久缓存（需要登录，因此为 private）
+CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+def _content_disposition(filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+@router.post("", response_model=Union[ApiResponse, ErrorResponse])
+async def upload_attachment_route(
+    request: Request,
+    filename: str = Query(..., min_length=1, max_length=255),
+    db: AsyncSession = Depends(DatabaseConnector.get_lazy_db),
+    _: None = Depends(is_teacher_or_admin),
+    principal: Principal = Depends(get_principal),
+):
+    """
+    附件上传接口
+
+    请求体即文件内容（不使用 multipart），服务端按块写盘并计算 SHA-256，不会把整个文件读入内存。
+
+    - 权限：教师或管理员
+    - 参数：filename 原始文件名（查询参数）；Content-Type 为文件的 MIME 类型，
+      未提供时按文件名推断
+    - 限制：文件大小不超过 ATTACHMENT_MAX_SIZE，超出时返回 413
+    - 返回：附件信息与下载地址 url（可直接填入创建作业的 attachments）
+    """
+    filename = PurePosixPath(filename.replace("\\", "/")).name
+    if not filename:
+        raise exceptions.InvalidParameter("文件名无效")
+    content_type = (
+        request.headers.get("content-type", "").split(";")[0].strip()
+        or guess_type(filename)[0]
+        or "application/octet-stream"
+    )
+    content_length = request.headers.get("content-length", "")
+    attachment = await save_attachment(
+        db,
+        request.stream(),
+        filename,
+        content_type,
+        int(content_length) if content_length.isdigit() else None,
+        principal.uuid,
+    )
+    data = UploadedAttachmentData.model_validate(attachment)
+    data.url = str(
+        request.url_for("download_attachment_route", attachment_id=attachment.id)
+    )
+    return to_response(data=data)
+
+
+@router.get("/{attachment_id}", name="download_attachment_route")
+async def download_attachment_route(
+    attachment_id: str,
+    request: Request,
+    db: AsyncSession = Depends(DatabaseConnector.get_lazy_db),
+    _: Principal = Depends(get_principal),
+):
+    """
+    附件下载接口
+
+    - 权限：已登录用户
+    - 支持 Range 请求（断点续传、视频拖动），返回 206；If-None-Match 命中时返回 304
+    - 缓存：强 ETag（内容 SHA-256）+ Cache-Control immutable
+    - 文件以 64KB 分块发送，内存占用与文件大小无关；服务器支持 ASGI pathsend 扩展时直接交给服务器发送，
+      配置了 ATTACHMENT_ACCEL_PREFIX 时只返回 X-Accel-Redirect，由 Nginx 完成 sendfile
+    """
+    attachment = await get_attachment(db, attachment_id)
+    etag = f'"{attachment.sha256}"'
+    headers = {
+        "Cache-Control": CACHE_CONTROL,
+        "ETag": etag,
+        "X-Content-Type-Options": "nosniff",
+    }
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+
+    path = blob_path(attachment.sha256)
+    if settings.attachment_accel_prefix:
+        relative = path.relative_to(STORAGE_ROOT).as_posix()
+        headers["X-Accel-Redirect"] = (
+            f"{settings.attachment_accel_prefix.rstrip('/')}/{relative}"
+        )
+        headers["Content-Disposition"] = _content_disposition(attachment.filename)
+        return Response(headers=headers, media_type=attachment.content_type)
+
+    try:
+        stat_result = await anyio.to_thread.run_sync(os.stat, path)
+    except FileNotFoundError:
+        logger.error("附件文件丢失: %s (sha256=%s)", attachment_id, attachment.sha256)
+        raise exceptions.NotExists(uuid=attachment_id)
+    return FileResponse(
+        path,
+        headers=headers,
+        media_type=attachment.content_type,
+        filename=attachment.filename,
+        stat_result=stat_result,
+    )
@@ -1,6 +1,9 @@
 # routers/auth.py
 import logging
-from fastapi import APIRouter, Cookie, Depends
+from datetime import datetime, timezone
+from fastapi import APIRouter, Cookie, Depends, Request
+from fastapi.responses import JSONResponse
+from core import exceptions
 from core.response import to_response
 from core.rate_limit import rate_limiter
 from schemas.User import User
@@ -9,23 +12,65 @@ from schemas.Response import (
     ErrorResponse,
     LoginData,
     ApiResponse,
+    SessionData,
 )
 from schemas.Request import LoginRequest
+from services.activity import activity_tracker
 from services.auth import authenticate_user, get_user_by_uuid
+from core.principal import Principal
+from core.revocation import revocation_list
+from core.sessions import session_store
 from utils.token import (
+    FRESH_TOKEN_EXPIRE_DAYS,
     create_access_token,
     create_fresh_token,
+    verify_access_token,
     verify_fresh_token,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Union
 from db.connector import DatabaseConnector
-from core.dependencies import get_current_user
+from core.dependencies import get_current_user, get_principal
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 logger = logging.getLogger("api.v1.auth")
 
+# 刷新令牌 Cookie 作用于 /auth 下全部接口（refresh / logout / sessions）
+REFRESH_COOKIE_PATH = "/api/v1/auth"
+SESSION_TTL = FRESH_TOKEN_EXPIRE_DAYS * 24 * 3600
+
+
+def set_refresh_cookie(response: JSONResponse, refresh_token: str, max_age: int):
+    response.set_cookie(
+        key="refresh_token",
+        value=refresh_token,
+        max_age=max_age,
+        httponly=True,
+        secure=True,
+        samesite="Lax",
+        path=REFRESH_COOKIE_PATH,
+    )
+
+
+def clear_refresh_cookie(response: JSONResponse):
+    response.delete_cookie(
+        key="refresh_token", path=REFRESH_COOKIE_PATH, secure=True, httponly=True
+    )
+
+
+def read_refresh_session(refresh_token: str | None) -> dict | None:
+    """解析刷新令牌中的会话信息，令牌无效时返回 None"""
+    if not refresh_token:
+        return None
+    try:
+        payload = verify_fresh_token(refresh_token)
+    except Exception:
+        return None
+    if not payload.get("sid"):
+        return None
+    return payload
+
 
 @router.post(
     "/login",
@@ -33,7 +78,9 @@ logger = logging.getLogger("api.v1.auth")
     response_model=Union[LoginResponse, ErrorResponse],
 )
 async def login_route(
-    form_data: LoginRequest, db: AsyncSession = Depends(DatabaseConnector.get_db)
+    request: Request,
+    form_data: LoginRequest,
+    db: AsyncSession = Depends(DatabaseConnector.get_lazy_db),
 ):
     """
     用户登录接口
@@ -44,27 +91,28 @@ async def login_route(
     - 请求频率限制：每分钟最多10次
     - 返回：LoginResponse 或 ErrorResponse
     """
-    logger.info("登录请求: 用户名:%s", form_data.username)
+    logger.debug("登录请求: 用户名:%s", form_data.username)
     user = await authenticate_user(db, form_data.username, form_data.password)
+    activity_tracker.record_login(user.uuid)
+    user_data = User.model_validate(user)
 
+    sid, jti = await session_store.create(
+        user.uuid,
+        SESSION_TTL,
+        user_meta=user_data.model_dump_json(),
+        ip=request.client.host if request.client else "",
+        user_agent=request.headers.get("user-agent", ""),
+    )
     token, expires_in = create_access_token({"uuid": str(user.uuid)})
-    refresh_token, refresh_expires_in = create_fresh_token({"uuid": str(user.uuid)})
+    refresh_token, refresh_expires_in = create_fresh_token(
+        {"uuid": str(user.uuid), "sid": sid, "jti": jti}
+    )
 
     logger.info("登录成功: 用户名: %s, UUID: %s", user.username, user.uuid)
     response = to_response(
-        data=LoginData(
-            access_token=token, expires_in=expires_in, user=User.model_validate(user)
-        ),
-    )
-    response.set_cookie(
-        key="refresh_token",
-        value=refresh_token,
-        max_age=refresh_expires_in,
-        httponly=True,
-        secure=True,
-        samesite="Lax",
-        path="/api/v1/auth/refresh",
+        data=LoginData(access_token=token, expires_in=expires_in, user=user_data),
     )
+    set_refresh_cookie(response, refresh_token, refresh_expires_in)
 
     return response
 
@@ -79,7 +127,7 @@ async def profile_route(current_user: User = Depends(get_current_user)):
     - 需要提供有效的 access_token
     - 返回：ApiResponse 包含用户信息，或 ErrorResponse
     """
-    logger.info(
+    logger.debug(
         "获取用户信息成功: 用户名: %s, UUID: %s",
         current_user.username,
         current_user.uuid,
@@ -94,35 +142,128 @@ async def profile_route(current_user: User = Depends(get_current_user)):
 )
 async def refresh_token_route(
     refresh_token: str = Cookie(...),
-    db: AsyncSession = Depends(DatabaseConnector.get_db),
+    db: AsyncSession = Depends(DatabaseConnector.get_lazy_db),
 ):
     """
     刷新 access token 接口
 
-    从 Cookie 中读取 fresh_token（HttpOnly），验证通过后签发新的 access_token。
+    从 Cookie 中读取 fresh_token（HttpOnly），验证通过后签发新的 access_token，
+    同时轮换 fresh_token（旧令牌立即失效，重复使用会吊销整个会话）。
 
     - 适用于 access_token 过期但 fresh_token 仍有效的场景
+    - 常规情况下只访问一次 Redis，用户信息取自会话缓存，缓存未命中时才查询数据库
     - 返回：新的 access_token 及用户信息
     - 请求频率限制：每分钟最多10次
     """
 
     payload = verify_fresh_token(refresh_token)
-    user = await get_user_by_uuid(db, payload["uuid"])
-    new_token, expires_in = create_access_token({"uuid": str(user.uuid)})
-    logger.info(
-        "刷新令牌成功: 用户名: %s, UUID: %s, 新令牌: %s",
-        user.username,
-        user.uuid,
-        new_token,
+    user_uuid, sid = payload["uuid"], payload.get("sid")
+    if not sid:
+        raise exceptions.InvalidVerifyToken("刷新令牌缺少会话信息，请重新登录")
+    new_jti, user_meta = await session_store.rotate(
+        user_uuid, sid, payload.get("jti"), SESSION_TTL
+    )
+    if user_meta is not None:
+        user_data = User.model_validate_json(user_meta)
+    else:
+        user_data = User.model_validate(await get_user_by_uuid(db, user_uuid))
+        await session_store.cache_user(
+            user_uuid, user_data.model_dump_json(), SESSION_TTL
+        )
+    activity_tracker.record_seen(user_uuid)
+    new_token, expires_in = create_access_token({"uuid": user_uuid})
+    new_refresh_token, refresh_expires_in = create_fresh_token(
+        {"uuid": user_uuid, "sid": sid, "jti": new_jti}
     )
-    return to_response(
+    logger.info("刷新令牌成功: 用户名: %s, UUID: %s", user_data.username, user_uuid)
+    response = to_response(
         message="Token refreshed successfully",
         data=LoginData(
             access_token=new_token,
             expires_in=expires_in,
-            user=User.model_validate(user),
+            user=user_data,
         ),
     )
+    set_refresh_cookie(response, new_refresh_token, refresh_expires_in)
+    return response
+
+
+@router.post("/logout", response_model=Union[ApiResponse, ErrorResponse])
+async def logout_route(request: Request, refresh_token: str | None = Cookie(None)):
+    """
+    退出登录接口
+
+    吊销 Cookie 中刷新令牌对应的会话并清除 Cookie；
+    请求携带有效的 access_token 时同时吊销该令牌。
+    不要求 access_token 有效，令牌已失效时同样返回成功。
+    """
+    scheme, _, access_token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and access_token:
+        try:
+            access_payload = verify_access_token(access_token)
+        except exceptions.InvalidVerifyToken:
+            access_payload = None
+        if access_payload is not None and access_payload.get("jti"):
+            await revocation_list.revoke_token(
+                access_payload["jti"], access_payload["exp"]
+            )
+    payload = read_refresh_session(refresh_token)
+    if payload is not None:
+        await session_store.revoke(payload["uuid"], payload["sid"])
+        logger.info("退出登录: UUID: %s, 会话: %s", payload["uuid"], payload["sid"])
+    response = to_response(message="Logged out")
+    clear_refresh_cookie(response)
+    return response
+
+
+@router.post("/logout_all", response_model=Union[ApiResponse, ErrorResponse])
+async def logout_all_route(principal: Principal = Depends(get_principal)):
+    """
+    退出全部设备接口
+
+    吊销当前用户的全部会话与已签发的访问令牌（所有设备立即失效）。
+    """
+    await session_store.revoke_all(principal.uuid)
+    await revocation_list.revoke_user(principal.uuid)
+    response = to_response(message="Logged out from all sessions")
+    clear_refresh_cookie(response)
+    return response
+
+
+@router.get("/sessions", response_model=Union[ApiResponse, ErrorResponse])
+async def list_sessions_route(
+    principal: Principal = Depends(get_principal),
+    refresh_token: str | None = Cookie(None),
+):
+    """
+    当前用户的登录会话列表
+
+    返回各会话的登录时间、最近刷新时间与来源，current 标记当前会话。
+    """
+    payload = read_refresh_session(refresh_token)
+    current_sid = payload["sid"] if payload else None
+    sessions = await session_store.list(principal.uuid)
+    items = [
+        SessionData(
+            sid=s["sid"],
+            created_at=datetime.fromtimestamp(s["created"], timezone.utc),
+            last_used_at=datetime.fromtimestamp(s["last_used"], timezone.utc),
+            ip=s["ip"],
+            user_agent=s["user_agent"],
+            current=s["sid"] == current_sid,
+        ).model_dump(mode="json")
+        for s in sessions
+    ]
+    return to_response(data={"items": items})
+
+
+@router.delete("/sessions/{sid}", response_model=Union[ApiResponse, ErrorResponse])
+async def revoke_session_route(sid: str, principal: Principal = Depends(get_principal)):
+    """
+    吊销当前用户的指定会话（如在其他设备上退出登录）
+    """
+    await session_store.revoke(principal.uuid, sid)
+    return to_response(message="Session revoked")
 
 
 @router.get("/verify_token", response_model=Union[ApiResponse, ErrorResponse])
@@ -135,7 +276,7 @@ async def verify_token_route(current_user: User = Depends(get_current_user)):
     - 返回：验证通过则返回 "Token is valid"，否则返回错误信息
     """
 
-    logger.info(
+    logger.debug(
         "令牌验证成功: 用户名: %s, UUID: %s", current_user.username, current_user.uuid
     )
     return to_response(message="Token is valid")
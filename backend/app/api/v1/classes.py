@@ -1,15 +1,20 @@
 import logging
 from typing import Optional, Union
 from fastapi import APIRouter, Depends, Query
-from core.dependencies import get_current_user
+from core.dependencies import get_current_user, get_principal
+from core.principal import Principal
 from schemas import User
 from services.classes import (
     create_assignment,
     create_class,
     delete_class,
+    enqueue_class_deletion,
     get_assignment,
     get_assignments,
     get_class,
+    get_class_dashboard,
+    get_deadline_feed,
+    get_my_classes,
     join_class,
     update_class,
 )
@@ -21,6 +26,7 @@ from schemas.Response import (
     AssignmentResponse,
     ClassData,
     ErrorResponse,
+    JobData,
     PageData,
     Pagination,
 )
@@ -40,7 +46,7 @@ logger = logging.getLogger("api.v1.classes")
 @router.post("", response_model=Union[ApiResponse, ErrorResponse])
 async def create_class_route(
     form_data: CreateClassRequest,
-    db: AsyncSession = Depends(DatabaseConnector.get_db),
+    db: AsyncSession = Depends(DatabaseConnector.get_lazy_db),
     _: None = Depends(is_admin),
 ):
     """
@@ -52,38 +58,81 @@ async def create_class_route(
     - 参数：班级名、描述、教师UUID
     - 返回：创建成功消息
     """
-    logger.info(f"创建新班级请求，{form_data.class_name}")
+    logger.info("创建新班级请求，%s", form_data.class_name)
     await create_class(
         db,
         class_name=form_data.class_name,
         description=form_data.description,
         teacher_uuid=form_data.teacher_uuid,
     )
-    logger.info(f"创建新班级成功，{form_data.class_name}")
+    logger.info("创建新班级成功，%s", form_data.class_name)
     return to_response(message="Class created successfully")
 
 
+@router.get("/mine", response_model=Union[ApiResponse, ErrorResponse])
+async def get_my_classes_route(
+    page: int = Query(1, ge=1),
+    size: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(DatabaseConnector.get_lazy_db),
+    principal: Principal = Depends(get_principal),
+):
+    """
+    我的班级接口
+
+    返回当前用户所在的班级（含班级内角色、成员数与作业数），按加入时间倒序分页。
+
+    - 权限：已登录用户
+    - 注意：必须声明在 /{class_uuid} 系列路由之前，避免 "mine" 被当作班级 UUID
+    - 缓存：按用户缓存，加入班级、班级信息变更或删除时自动失效
+    """
+    data = await get_my_classes(db, principal, page, size)
+    return to_response(data=data)
+
+
+@router.get("/mine/deadlines", response_model=Union[ApiResponse, ErrorResponse])
+async def get_deadline_feed_route(
+    cursor: Optional[str] = None,
+    size: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(DatabaseConnector.get_lazy_db),
+    principal: Principal = Depends(get_principal),
+):
+    """
+    跨班级截止提醒接口
+
+    返回当前用户所在全部班级中尚未截止的已发布作业，按截止时间升序。
+
+    - 权限：已登录用户
+    - 分页：键集分页，首页不传 cursor，之后传入上一页返回的 next_cursor
+    - 缓存：按用户缓存，所在班级发布新作业、加入或删除班级时自动失效
+    """
+    feed = await get_deadline_feed(db, principal, cursor, size)
+    return to_response(data=feed)
+
+
 @router.delete("/{class_uuid}", response_model=Union[ApiResponse, ErrorResponse])
 async def delete_class_route(
     class_uuid: str,
-    db: AsyncSession = Depends(DatabaseConnector.get_db),
+    background: bool = False,
+    db: AsyncSession = Depends(DatabaseConnector.get_lazy_db),
     _: None = Depends(is_teacher_or_admin),
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_principal),
 ):
     """
     删除指定班级接口
 
     参数:
     - class_uuid (str): 路径参数，目标班级的 UUID，用于标识要删除的班级。
+    - background (bool): 查询参数，为 true 时放入后台任务分批删除，立即返回 202 与任务信息，
+      之后通过 GET /jobs/{job_id} 查询进度（适用于作业或成员很多的班级）。
     - db (AsyncSession): 依赖注入，异步数据库会话，用于执行删除操作。
     - _ (None): 依赖注入，用于权限验证，确保当前用户是教师或管理员。
-    - current_user (User): 依赖注入，当前经过身份验证的用户对象。
+    - principal (Principal): 依赖注入，当前经过身份验证的用户身份对象。
 
     权限:
     - 只有拥有教师或管理员权限的用户可以执行删除操作。
 
     功能:
-    - 调用 `delete_class` 函数，传入数据库会话、班级 UUID、当前用户 UUID 和角色，执行班级删除逻辑。
+    - 调用 `delete_class` 函数，传入数据库会话、班级 UUID 和当前用户身份对象，执行班级删除逻辑。
     - 删除班级时，应级联删除该班级相关的作业、班级成员等关联数据（具体由数据库约束和业务逻辑决定）。
 
     返回:
@@ -93,7 +142,14 @@ async def delete_class_route(
     注意:
     - 这里返回信息中的“Class created successfully”应修改为删除成功提示，避免语义混淆。
     """
-    await delete_class(db, class_uuid, current_user.uuid, current_user.role)
+    if background:
+        job = await enqueue_class_deletion(db, class_uuid, principal)
+        return to_response(
+            data=JobData.model_validate(job),
+            message="Class deletion scheduled",
+            status_code=202,
+        )
+    await delete_class(db, class_uuid, principal)
     return to_response(message="Class deleted successfully")
 
 
@@ -106,8 +162,8 @@ async def get_assignments_route(
     search: Optional[str] = None,
     page: int = Query(1, ge=1),
     size: int = Query(10, le=15),
-    db: AsyncSession = Depends(DatabaseConnector.get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(DatabaseConnector.get_lazy_db),
+    principal: Principal = Depends(get_principal),
 ):
     """
     获取指定班级的作业列表（支持分页、搜索、筛选和排序）
@@ -121,7 +177,7 @@ async def get_assignments_route(
     - page (int): 查询参数，分页页码，默认1，最小值为1。
     - size (int): 查询参数，每页条数，默认10，最大值为10。
     - db (AsyncSession): 依赖注入，异步数据库会话，用于执行数据库操作。
-    - current_user (User): 依赖注入，当前经过身份验证的用户对象。
+    - principal (Principal): 依赖注入，当前经过身份验证的用户身份对象。
 
     返回:
     - ApiResponse: 包含分页后的作业数据列表和分页信息。
@@ -135,7 +191,7 @@ async def get_assignments_route(
     """
     items, total = await get_assignments(
         db=db,
-        user_uuid=current_user.uuid,
+        principal=principal,
         class_uuid=class_uuid,
         page=page,
         size=size,
@@ -155,13 +211,34 @@ async def get_assignments_route(
     )
 
 
+@router.get(
+    "/{class_uuid}/dashboard", response_model=Union[ApiResponse, ErrorResponse]
+)
+async def get_class_dashboard_route(
+    class_uuid: str,
+    db: AsyncSession = Depends(DatabaseConnector.get_lazy_db),
+    principal: Principal = Depends(get_principal),
+):
+    """
+    班级看板接口
+
+    一次返回班级页面所需的聚合数据，替代班级信息、作业列表与计数的多次请求。
+
+    - 权限：管理员或班级成员（邀请码仅对教师与管理员返回）
+    - 返回：班级信息、按角色的成员数、按状态的作业数、即将截止的作业及数据版本号
+    - 缓存：按班级版本缓存，班级信息、成员或作业变更后自动失效
+    """
+    dashboard = await get_class_dashboard(db, class_uuid, principal)
+    return to_response(data=dashboard)
+
+
 @router.post(
     "/{class_uuid}/homeworks", response_model=Union[ApiResponse, ErrorResponse]
 )
 async def create_assignment_route(
     form_data: CreateAssignmentRequest,
     class_uuid: str,
-    db: AsyncSession = Depends(DatabaseConnector.get_db),
+    db: AsyncSession = Depends(DatabaseConnector.get_lazy_db),
     current_user: User = Depends(get_current_user),
     _: None = Depends(is_teacher),
 ):
@@ -174,7 +251,7 @@ async def create_assignment_route(
     - 参数：作业标题、描述、内容、截止时间、是否允许迟交、最大分数、附件
     - 返回：创建成功消息
     """
-    logger.info(f"创建新作业请求，{form_data.title}")
+    logger.debug("创建新作业请求，%s", form_data.title)
     await create_assignment(
         db,
         class_uuid=class_uuid,
@@ -188,7 +265,7 @@ async def create_assignment_route(
         attachments=form_data.attachments,
         created_by=current_user.username,
     )
-    logger.info(f"创建新作业成功，{form_data.title}")
+    logger.info("创建新作业成功，%s", form_data.title)
     return to_response(message="Assignment created successfully")
 
 
@@ -199,26 +276,27 @@ async def create_assignment_route(
 async def get_assignment_route(
     assignment_uuid: str,
     class_uuid: str,
-    db: AsyncSession = Depends(DatabaseConnector.get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(DatabaseConnector.get_lazy_db),
+    principal: Principal = Depends(get_principal),
 ):
     """
     查询作业详情接口
 
     当前用户在指定班级中查询指定作业的详细信息。
 
-    - 权限：班级成员（已通过 get_class_member_by_uuid 验证）
+    - 权限：班级成员（通过 Principal.require_member 验证）
     - 参数：
         - class_uuid：班级唯一标识符
         - assignment_uuid：作业唯一标识符
     - 返回：作业详情（包含标题、内容、截止时间、附件等信息）
     """
 
-    assignment = await get_assignment(
-        db, assignment_uuid, class_uuid, current_user.uuid
-    )
-    logger.info(
-        f"请求结束 - 查询作业成功: class_uuid: {class_uuid}, assignment_uuid: {assignment_uuid}, user_uuid: {current_user.uuid}"
+    assignment = await get_assignment(db, assignment_uuid, class_uuid, principal)
+    logger.debug(
+        "查询作业成功: class_uuid: %s, assignment_uuid: %s, user_uuid: %s",
+        class_uuid,
+        assignment_uuid,
+        principal.uuid,
     )
     return to_response(data=AssignmentData.model_validate(assignment))
 
@@ -227,9 +305,9 @@ async def get_assignment_route(
 async def join_class_route(
     form_data: JoinClassRequest,
     db: AsyncSession = Depends(
-        DatabaseConnector.get_db,
+        DatabaseConnector.get_lazy_db,
     ),
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_principal),
 ):
     """
     学生加入班级接口
@@ -242,10 +320,10 @@ async def join_class_route(
     - 返回：
         - 当前用户在该班级中的角色信息及加入时间
     """
-    joined_class = await join_class(db, form_data.invite_code, current_user)
+    joined_class = await join_class(db, form_data.invite_code, principal)
 
     logger.info(
-        "请求结束 - 加入班级成功: class_uuid=%s, user_uuid=%s",
+        "加入班级成功: class_uuid=%s, user_uuid=%s",
         joined_class.class_uuid,
         joined_class.profile_name,
     )
@@ -258,9 +336,9 @@ async def update_class_route(
     class_uuid: str,
     form_data: UpdateClassRequest,
     db: AsyncSession = Depends(
-        DatabaseConnector.get_db,
+        DatabaseConnector.get_lazy_db,
     ),
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_principal),
     _: None = Depends(is_teacher_or_admin),
 ):
     """
@@ -300,11 +378,10 @@ async def update_class_route(
         class_uuid,
         form_data.class_name,
         form_data.description,
-        current_user.uuid,
-        current_user.role,
+        principal,
     )
 
-    logger.info("请求结束 - 更新班级信息班级成功: class_uuid=%s", class_uuid)
+    logger.info("更新班级信息成功: class_uuid=%s", class_uuid)
     return to_response(data=ClassData.model_validate(class_obj))
 
 
@@ -312,10 +389,10 @@ async def update_class_route(
 async def get_class_route(
     class_uuid: str,
     db: AsyncSession = Depends(
-        DatabaseConnector.get_db,
+        DatabaseConnector.get_lazy_db,
     ),
     _: None = Depends(is_teacher_or_admin),
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_principal),
 ):
     """
     根据班级UUID获取单个班级信息。
@@ -323,20 +400,20 @@ async def get_class_route(
     主要流程：
     1. 通过路径参数 {class_uuid} 接收班级唯一标识符。
     2. 使用 `Depends(is_teacher_or_admin)` 确保只有教师或管理员角色能访问此路由。
-    3. 获取当前登录的用户信息，以便进行后续的权限校验。
-    4. 调用 `get_class` 业务逻辑函数，传入数据库会话、班级UUID和当前用户信息。
-       - **注意：这里需要传入 `current_user.user_uuid` 参数，以确保 `get_class` 函数能够正确校验权限。**
+    3. 获取当前请求的身份对象 Principal，以便进行后续的权限校验。
+    4. 调用 `get_class` 业务逻辑函数，传入数据库会话、班级UUID和当前用户身份对象。
+       - 教师需为该班级成员，成员关系由 Principal 按需加载并在请求内复用。
     5. 将获取到的班级对象 `class_obj` 传递给 `ClassData.model_validate` 进行数据验证和模型转换。
     6. 使用 `to_response` 函数封装最终的响应数据，返回给客户端。
 
     参数：
         class_uuid (str): 班级的唯一标识符。
         db (AsyncSession): 数据库异步会话。
-        current_user (User): 当前认证的用户对象。
+        principal (Principal): 当前认证的用户身份对象。
 
     返回：
         ApiResponse: 包含班级数据的成功响应。
         ErrorResponse: 如果发生错误（如班级不存在、权限不足等）则返回错误响应。
     """
-    class_obj = await get_class(db, class_uuid, current_user.role)
+    class_obj = await get_class(db, class_uuid, principal)
     return to_response(data=ClassData.model_validate(class_obj))
@@ -1,9 +1,21 @@
 # routers/health.py
 from fastapi import APIRouter
 from starlette.responses import JSONResponse
+from core.readiness import readiness_prober
 
 router = APIRouter(prefix="/health", tags=["Health"])
+ready_router = APIRouter(prefix="/ready", tags=["Health"])
 
 @router.get("", summary="健康检查", description="返回服务是否正常运行")
 async def health_check():
-    return JSONResponse(content={"status": "ok"})
\ No newline at end of file
+    return JSONResponse(content={"status": "ok"})
+
+
+@ready_router.get(
+    "",
+    summary="就绪检查",
+    description="返回后台探测到的数据库、Redis、连接池与事件循环状态，未就绪时返回 503",
+)
+async def readiness_check():
+    report = readiness_prober.report()
+    return JSONResponse(content=report, status_code=200 if report["ready"] else 503)
@@ -0,0 +1,56 @@
+# routers/jobs.py
+import logging
+from typing import Literal, Optional, Union
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.dependencies import get_principal
+from core.principal import Principal
+from core.response import to_response
+from db.connector import DatabaseConnector
+from schemas.Response import ApiResponse, ErrorResponse, JobData, PageData, Pagination
+from services.jobs import get_job, list_jobs
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+logger = logging.getLogger("api.v1.jobs")
+
+
+@router.get("", response_model=Union[ApiResponse, ErrorResponse])
+async def list_jobs_route(
+    status: Optional[Literal["queued", "running", "succeeded", "failed"]] = None,
+    type: Optional[str] = None,
+    page: int = Query(1, ge=1),
+    size: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(DatabaseConnector.get_lazy_db),
+    principal: Principal = Depends(get_principal),
+):
+    """
+    后台任务列表接口
+
+    - 权限：已登录用户（管理员可查看全部任务，其他用户只能查看自己创建的任务）
+    - 参数：status / type 筛选；page / size 分页
+    - 返回：按创建时间倒序的任务列表与分页信息
+    """
+    items, total = await list_jobs(db, principal, status, type, page, size)
+    data = PageData(
+        items=[JobData.model_validate(item) for item in items],
+        pagination=Pagination(
+            page=page, size=size, total=total, pages=(total + size - 1) // size
+        ),
+    )
+    return to_response(data=data)
+
+
+@router.get("/{job_id}", response_model=Union[ApiResponse, ErrorResponse])
+async def get_job_route(
+    job_id: str,
+    db: AsyncSession = Depends(DatabaseConnector.get_lazy_db),
+    principal: Principal = Depends(get_principal),
+):
+    """
+    后台任务状态接口（供客户端轮询）
+
+    - 权限：任务创建者或管理员
+    - 返回：任务状态、进度、重试次数，完成后包含执行结果，失败时包含错误信息
+    """
+    job = await get_job(db, job_id, principal)
+    return to_response(data=JobData.model_validate(job))
@@ -0,0 +1,62 @@
+# routers/metrics.py
+import hmac
+import ipaddress
+from fastapi import APIRouter, Depends, Request
+from starlette.responses import PlainTextResponse
+from core import exceptions
+from core.config import settings
+from core.metrics import registry
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def parse_networks(value: str) -> tuple:
+    """解析逗号分隔的 CIDR 列表"""
+    return tuple(
+        ipaddress.ip_network(item.strip(), strict=False)
+        for item in value.split(",")
+        if item.strip()
+    )
+
+
+METRICS_TOKEN = settings.metrics_token
+METRICS_ALLOW_NETWORKS = parse_networks(settings.metrics_allow_networks)
+
+
+def _client_allowed(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    if address.version == 6 and address.ipv4_mapped is not None:
+        address = address.ipv4_mapped
+    return any(address in network for network in METRICS_ALLOW_NETWORKS)
+
+
+async def require_metrics_access(request: Request):
+    """
+    指标中包含各路由延迟、连接池与任务队列状态，不对公网开放：
+    携带 METRICS_TOKEN（Authorization: Bearer）或来源地址在 METRICS_ALLOW_NETWORKS 内才允许访问。
+    """
+    if METRICS_TOKEN:
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and hmac.compare_digest(
+            token.encode(), METRICS_TOKEN.encode()
+        ):
+            return
+    if request.client is not None and _client_allowed(request.client.host):
+        return
+    raise exceptions.PermissionDenied()
+
+
+@router.get(
+    "",
+    summary="Prometheus 指标",
+    description="以 Prometheus 文本格式返回当前 worker 进程的指标",
+    include_in_schema=False,
+    dependencies=[Depends(require_metrics_access)],
+)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,83 @@
+# routers/notifications.py
+import logging
+from typing import Union
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.dependencies import get_principal
+from core.principal import Principal
+from core.response import to_response
+from db.connector import DatabaseConnector
+from schemas.Request import MarkNotificationsReadRequest
+from schemas.Response import (
+    ApiResponse,
+    ErrorResponse,
+    NotificationData,
+    PageData,
+    Pagination,
+)
+from services.notifications import count_unread, list_notifications, mark_read
+
+router = APIRouter(prefix="/notifications", tags=["Notifications"])
+logger = logging.getLogger("api.v1.notifications")
+
+
+@router.get("", response_model=Union[ApiResponse, ErrorResponse])
+async def list_notifications_route(
+    unread_only: bool = False,
+    page: int = Query(1, ge=1),
+    size: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(DatabaseConnector.get_lazy_db),
+    principal: Principal = Depends(get_principal),
+):
+    """
+    通知列表接口
+
+    按时间倒序分页返回当前用户的站内通知，同时返回未读数。
+
+    - 权限：已登录用户
+    - 参数：unread_only 只看未读；page / size 分页
+    - 返回：通知列表、分页信息与未读数（unread）
+    """
+    items, total, unread = await list_notifications(
+        db, principal.uuid, unread_only, page, size
+    )
+    data = PageData(
+        items=[NotificationData.model_validate(item) for item in items],
+        pagination=Pagination(
+            page=page, size=size, total=total, pages=(total + size - 1) // size
+        ),
+    ).model_dump(mode="json")
+    data["unread"] = unread
+    return to_response(data=data)
+
+
+@router.get("/unread-count", response_model=Union[ApiResponse, ErrorResponse])
+async def unread_count_route(
+    db: AsyncSession = Depends(DatabaseConnector.get_lazy_db),
+    principal: Principal = Depends(get_principal),
+):
+    """
+    未读通知数接口（供前端轮询角标使用，只执行一条索引计数查询）
+
+    - 权限：已登录用户
+    - 返回：{"unread": 未读数}
+    """
+    return to_response(data={"unread": await count_unread(db, principal.uuid)})
+
+
+@router.post("/read", response_model=Union[ApiResponse, ErrorResponse])
+async def mark_read_route(
+    form_data: MarkNotificationsReadRequest,
+    db: AsyncSession = Depends(DatabaseConnector.get_lazy_db),
+    principal: Principal = Depends(get_principal),
+):
+    """
+    标记通知已读接口
+
+    - 权限：已登录用户（只能标记自己的通知）
+    - 参数：ids 通知ID列表；不传时标记全部未读通知，空列表不做任何更新
+    - 返回：{"updated": 更新条数}
+    """
+    updated = await mark_read(db, principal.uuid, form_data.ids)
+    logger.debug("标记通知已读: user=%s, 条数=%d", principal.uuid, updated)
+    return to_response(data={"updated": updated})
@@ -25,7 +25,7 @@ logger = logging.getLogger("api.v1.users")
 @router.post("", response_model=Union[ApiResponse, UserProfile])
 async def register_route(
     form_data: RegisterRequest,
-    db: AsyncSession = Depends(DatabaseConnector.get_db),
+    db: AsyncSession = Depends(DatabaseConnector.get_lazy_db),
     _: None = Depends(is_admin),
 ):
     """
@@ -38,7 +38,9 @@ async def register_route(
     - 返回：用户信息或错误信息
     - 状态码：201 Created
     """
-    logger.info(f"用户注册请求: 用户名: {form_data.username}, 角色: {form_data.role}")
+    logger.info(
+        "用户注册请求: 用户名: %s, 角色: %s", form_data.username, form_data.role
+    )
     user = await create_user(
         db=db,
         username=form_data.username,
@@ -48,14 +50,14 @@ async def register_route(
         avatar_url=form_data.profile.avatar_url,
         role=form_data.role,
     )
-    logger.info(f"用户注册成功: 用户名: {user.username}, UUID: {user.uuid}")
+    logger.info("用户注册成功: 用户名: %s, UUID: %s", user.username, user.uuid)
     return to_response(status_code=201, message="User registered successfully")
 
 
 @router.delete("/{user_uuid}", response_model=Union[ApiResponse, ErrorResponse])
 async def delete_route(
     user_uuid: str,
-    db: AsyncSession = Depends(DatabaseConnector.get_db),
+    db: AsyncSession = Depends(DatabaseConnector.get_lazy_db),
     _: None = Depends(is_admin),
 ):
     """
@@ -74,7 +76,7 @@ async def delete_route(
 @router.get("/{user_uuid}", response_model=Union[ApiResponse, ErrorResponse])
 async def retrieve_user_route(
     user_uuid: str,
-    db: AsyncSession = Depends(DatabaseConnector.get_db),
+    db: AsyncSession = Depends(DatabaseConnector.get_lazy_db),
     _: None = Depends(is_admin),
 ):
     """
@@ -88,7 +90,7 @@ async def retrieve_user_route(
     """
     user = await get_user_by_uuid(db, user_uuid)
 
-    logger.info("成功获取用户信息: 用户名: %s, UUID: %s", user.username, user.uuid)
+    logger.debug("成功获取用户信息: 用户名: %s, UUID: %s", user.username, user.uuid)
     return to_response(
         message="User retrieved successfully", data=User.model_validate(user)
     )
@@ -101,7 +103,7 @@ async def get_users_route(
     role: str,
     page: int = Query(1, ge=1),
     size: int = Query(10, le=10),
-    db: AsyncSession = Depends(DatabaseConnector.get_db),
+    db: AsyncSession = Depends(DatabaseConnector.get_lazy_db),
     _: None = Depends(is_admin),
 ):
     """
@@ -136,7 +138,7 @@ async def get_users_route(
 async def update_user_route(
     form_data: UpdateUserRequest,
     user_uuid: str,
-    db: AsyncSession = Depends(DatabaseConnector.get_db),
+    db: AsyncSession = Depends(DatabaseConnector.get_lazy_db),
     current_user: User = Depends(get_current_user),
     _: None = Depends(is_self_or_admin),
 ):
@@ -1,18 +1,39 @@
 # app.py
+import time
+
+_import_started = time.perf_counter()  # 冷启动计时起点（模块导入开始）
+
+import logging
 from contextlib import asynccontextmanager
-import os
 from fastapi import FastAPI
 from api.v1 import users
 from api.v1 import auth
+from api.v1 import admin
 from api.v1 import classes
 from api.v1 import health
+from api.v1 import metrics
+from api.v1 import notifications
+from api.v1 import jobs
+from api.v1 import attachments
 from core.exception_handlers import register_exception_handlers
 from core.middleware import AccessLogMiddleware
+from core.compression import CompressionMiddleware
+from core.profiling import ProfilingMiddleware, profiling_enabled
 from api.v1 import users
 from db.connector import DatabaseConnector
+from core.redis import connection_pool
+from services.activity import activity_tracker
+from services.deadlines import deadline_scheduler
+from services.notifications import notification_dispatcher
+from services.jobs import job_runner
+from core.revocation import revocation_list
+from core.readiness import readiness_prober
 from fastapi.middleware.cors import CORSMiddleware
-from core.logger import setup_logging
-import uvicorn
+from core.logger import setup_logging, stop_logging
+from core.config import settings
+from core.metrics import APP_STARTUP_DURATION
+
+logger = logging.getLogger("app")
 
 logo = r"""
 $$$$$$$$\      $$\           $$$$$$$\  $$\ $$\            $$\     
@@ -33,8 +54,23 @@ async def lifespan(app: FastAPI):
     """
     setup_logging()
     await DatabaseConnector.initialize()
+    activity_tracker.start()
+    revocation_list.start()
+    await deadline_scheduler.start()
+    notification_dispatcher.start()
+    job_runner.start()
+    readiness_prober.start()
+    report_startup_time()
     yield
+    await readiness_prober.stop()  # 先标记为未就绪，负载均衡器停止分配新请求
+    await revocation_list.stop()
+    await deadline_scheduler.stop()
+    await job_runner.stop()  # 等待进行中的任务，超时的放回队列（任务中仍可能发布通知）
+    await notification_dispatcher.stop()  # 最后处理完剩余的通知事件
+    await activity_tracker.stop()  # 最后一次写回用户活跃时间
     await DatabaseConnector.engine.dispose()  # 清理资源
+    await connection_pool.disconnect()  # 关闭 Redis 连接池
+    stop_logging()  # 写完日志队列中剩余的记录
 
 
 app = FastAPI(title="EduPilot", version="0.1a", reload=True, lifespan=lifespan)
@@ -42,7 +78,17 @@ app = FastAPI(title="EduPilot", version="0.1a", reload=True, lifespan=lifespan)
 app.include_router(auth.router, prefix="/api/v1", tags=["Auth"])
 app.include_router(users.router, prefix="/api/v1", tags=["Users"])
 app.include_router(classes.router, prefix="/api/v1", tags=["Classes"])
+app.include_router(admin.router, prefix="/api/v1", tags=["Admin"])
+app.include_router(notifications.router, prefix="/api/v1", tags=["Notifications"])
+app.include_router(jobs.router, prefix="/api/v1", tags=["Jobs"])
+app.include_router(attachments.router, prefix="/api/v1", tags=["Attachments"])
 app.include_router(health.router, prefix="", tags=["Health"])
+app.include_router(health.ready_router, prefix="", tags=["Health"])
+app.include_router(metrics.router, prefix="", tags=["Metrics"])
+# 未启用采样时不注册，保证请求路径零开销
+if profiling_enabled():
+    app.add_middleware(ProfilingMiddleware)
+app.add_middleware(CompressionMiddleware)
 app.add_middleware(AccessLogMiddleware)
 
 
@@ -62,19 +108,35 @@ app.add_middleware(
 )
 
 
+_import_finished = time.perf_counter()
+
+
+def report_startup_time():
+    """
+    记录冷启动耗时（模块导入 + lifespan 初始化），超出 STARTUP_BUDGET_MS 时告警。
+    导入阶段的明细可用 scripts/import_time.py 查看。
+    """
+    import_ms = (_import_finished - _import_started) * 1000
+    total_ms = (time.perf_counter() - _import_started) * 1000
+    APP_STARTUP_DURATION.set(total_ms / 1000)
+    if total_ms > settings.startup_budget_ms:
+        logger.warning(
+            "启动耗时 %.0fms 超出预算 %.0fms（导入 %.0fms），可运行 scripts/import_time.py 定位",
+            total_ms,
+            settings.startup_budget_ms,
+            import_ms,
+        )
+    else:
+        logger.info("启动完成，耗时 %.0fms（导入 %.0fms）", total_ms, import_ms)
+
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to EduPilot API 👋"}
 
 
 if __name__ == "__main__":
+    from core.server import run  # 仅直接运行时需要，worker 导入 app 时不加载 uvicorn
+
     print(logo)
-    uvicorn.run(
-        "app:app",
-        host=os.getenv("APP_HOST", "127.0.0.1"),
-        port=int(os.getenv("APP_PORT", 8000)),
-        reload=bool(os.getenv("APP_RELOAD", "false")),
-        server_header=False,
-        log_level=os.getenv("LOG_LEVEL", "info").lower(),
-        reload_excludes=["**/logs/*", "**/*.log"],
-    )
+    run("app:app")
@@ -0,0 +1,105 @@
+import json
+import logging
+from typing import Any, Optional
+from core.metrics import registry
+
+"""
+core.cache 模块
+
+带版本号的 JSON 缓存，用于聚合查询结果等读多写少的数据。
+
+键结构:
+    cache:{namespace}:ver:{key}                 当前版本号（INCR 递增）
+    cache:{namespace}:{key}:v{ver}[:{variant}]  该版本的缓存内容（JSON，TTL 过期）
+
+    variant 用于同一个键下的多份内容（如分页列表的不同页），共享同一个版本号，一次失效。
+
+失效方式:
+    写操作提交后调用 bump(key) 把版本号加一，旧版本的内容不再被读取、随 TTL 自然过期，
+    不需要逐个删除。读取时先取版本号再取内容，计算期间发生的写入会让本次结果落在旧版本下，
+    不会出现“失效后又写回旧数据”的问题。
+
+说明:
+    存储层为 core.redis.resilient_redis（bump_many 需要其 incr_many）：Redis 熔断期间退化为进程内缓存，
+    此时版本号只在当前 worker 内递增，其他 worker 最多在 TTL 内读到旧数据。
+"""
+
+logger = logging.getLogger("core.cache")
+
+CACHE_REQUESTS = registry.counter(
+    "cache_requests_total",
+    "版本化缓存的读取次数（按命名空间与结果）",
+    ("namespace", "result"),
+)
+
+
+class VersionedCache:
+    """
+    版本化缓存
+
+    参数:
+        store: 键值存储（需支持 get / set / incr / expire，如 ResilientRedis）
+        namespace (str): 命名空间，用于区分不同用途的缓存
+        ttl (int): 缓存内容的有效期（秒）
+        version_ttl (int): 版本号键的有效期（秒），需远大于 ttl；过期后版本号从 0 重新开始
+    """
+
+    def __init__(self, store, namespace: str, ttl: int, version_ttl: int = 86400):
+        self.store = store
+        self.namespace = namespace
+        self.ttl = ttl
+        self.version_ttl = max(version_ttl, ttl * 10)
+
+    def _version_key(self, key: str) -> str:
+        return f"cache:{self.namespace}:ver:{key}"
+
+    def _data_key(self, key: str, version: int, variant: str) -> str:
+        data_key = f"cache:{self.namespace}:{key}:v{version}"
+        return f"{data_key}:{variant}" if variant else data_key
+
+    async def version(self, key: str) -> int:
+        """当前版本号（不存在时为 0）"""
+        value = await self.store.get(self._version_key(key))
+        return int(value) if value is not None else 0
+
+    async def get(self, key: str, variant: str = "") -> tuple[int, Optional[Any]]:
+        """
+        读取缓存，返回 (版本号, 内容)。未命中时内容为 None，
+        调用方应使用返回的版本号写回，保证与读取时看到的数据版本一致。
+        """
+        version = await self.version(key)
+        raw = await self.store.get(self._data_key(key, version, variant))
+        if raw is None:
+            CACHE_REQUESTS.labels(self.namespace, "miss").inc()
+            return version, None
+        try:
+            value = json.loads(raw)
+        except (TypeError, ValueError):
+            logger.warning("缓存内容无法解析，按未命中处理: %s", key)
+            CACHE_REQUESTS.labels(self.namespace, "miss").inc()
+            return version, None
+        CACHE_REQUESTS.labels(self.namespace, "hit").inc()
+        return version, value
+
+    async def set(self, key: str, version: int, value: Any, variant: str = ""):
+        """写入指定版本的缓存内容（value 需可 JSON 序列化）"""
+        await self.store.set(
+            self._data_key(key, version, variant),
+            json.dumps(value, ensure_ascii=False, separators=(",", ":")),
+            ex=self.ttl,
+        )
+
+    async def bump(self, key: str) -> int:
+        """版本号加一，使该键的已有缓存全部失效"""
+        version_key = self._version_key(key)
+        version = await self.store.incr(version_key)
+        await self.store.expire(version_key, self.version_ttl)
+        logger.debug("缓存版本更新: %s:%s -> %s", self.namespace, key, version)
+        return version
+
+    async def bump_many(self, keys: list[str]):
+        """批量使多个键的缓存失效（一次往返，用于按班级成员逐个失效的场景）"""
+        if keys:
+            await self.store.incr_many(
+                [self._version_key(key) for key in keys], self.version_ttl
+            )
@@ -0,0 +1,206 @@
+import gzip
+import logging
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from core.config import settings
+from core.metrics import registry
+
+try:
+    import brotli
+except ImportError:  # 可选依赖：pip install edupilot[compression]
+    brotli = None
+
+"""
+core.compression 模块
+
+响应压缩中间件（纯 ASGI 实现，不经过 BaseHTTPMiddleware）。
+
+- 按 Accept-Encoding 协商：安装了 brotli 时优先 br，否则 gzip；q=0 的编码不会被选用。
+- 只压缩一次性发送的响应体（JSONResponse 等）：首个 body 消息即为最后一条，
+  且大小不低于 COMPRESSION_MINIMUM_SIZE。
+- 以下情况原样透传：
+    - 流式响应（首个 body 消息带 more_body），不会为了压缩而缓存响应体；
+    - 已经设置了 Content-Encoding 的响应，以及 Range 请求的部分响应（Content-Range）；
+    - 图片、音视频、压缩包等本身已压缩的内容类型，以及 text/event-stream；
+    - HEAD 请求，以及 204/205/304 等无响应体的状态；
+    - 不以 http.response.body 发送内容的响应（如 pathsend 扩展），暂存的响应头原样先行发出。
+- 压缩后重写 Content-Length，追加 Vary: Accept-Encoding，强 ETag 改为弱 ETag。
+- 超过 COMPRESSION_OFFLOAD_SIZE 的响应体在线程池中压缩，避免大导出阻塞事件循环。
+"""
+
+logger = logging.getLogger("core.compression")
+
+COMPRESSED_RESPONSES = registry.counter(
+    "http_compressed_responses_total", "经压缩中间件压缩的响应数", ("encoding",)
+)
+COMPRESSION_SAVED_BYTES = registry.counter(
+    "http_compression_saved_bytes_total", "压缩节省的响应字节数", ("encoding",)
+)
+
+# 没有响应体的状态码，响应头原样透传
+NO_BODY_STATUSES = frozenset({204, 205, 304})
+
+# 本身已压缩或不适合整体压缩的内容类型（前缀匹配）
+INCOMPRESSIBLE_TYPES = (
+    "image/",
+    "audio/",
+    "video/",
+    "font/woff",
+    "text/event-stream",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/x-7z-compressed",
+    "application/x-rar-compressed",
+    "application/octet-stream",
+    "application/pdf",
+)
+
+
+def _parse_accept_encoding(value: str) -> dict[str, float]:
+    """解析 Accept-Encoding，返回 编码 -> q 值"""
+    accepted = {}
+    for item in value.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, number = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(number)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def select_encoding(accept_encoding: str) -> str | None:
+    """按客户端声明与服务端支持情况选择编码，无可用编码时返回 None"""
+    if not accept_encoding:
+        return None
+    accepted = _parse_accept_encoding(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    candidates = ("br", "gzip") if brotli is not None else ("gzip",)
+    best, best_quality = None, 0.0
+    for coding in candidates:
+        quality = accepted.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def _compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers or "content-range" in headers:
+        return False
+    content_type = headers.get("content-type", "").lower()
+    return not content_type.startswith(INCOMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """
+    响应压缩中间件
+
+    参数:
+        app: 下游 ASGI 应用
+        minimum_size (int): 小于该字节数的响应不压缩
+        gzip_level (int): gzip 压缩级别（1 ~ 9）
+        brotli_quality (int): brotli 压缩质量（0 ~ 11）
+        offload_size (int): 不低于该字节数的响应体在线程池中压缩
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = settings.compression_minimum_size,
+        gzip_level: int = settings.compression_gzip_level,
+        brotli_quality: int = settings.compression_brotli_quality,
+        offload_size: int = settings.compression_offload_size,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.offload_size = offload_size
+
+    def _compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = select_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+        passthrough = False
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                # 暂存响应头，等到首个 body 消息再决定是否压缩
+                if message["status"] not in NO_BODY_STATUSES and _compressible(
+                    Headers(raw=message["headers"])
+                ):
+                    start_message = message
+                else:
+                    passthrough = True
+                    await send(message)
+                return
+            if start_message is None:
+                await send(message)
+                return
+            if message["type"] != "http.response.body":
+                # 非 body 消息（如 FileResponse 的 http.response.pathsend）：
+                # 先原样发出暂存的响应头，保证 start 总在其他响应消息之前
+                start, start_message = start_message, None
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            start, start_message = start_message, None
+            passthrough = True
+            if more_body or len(body) < self.minimum_size:
+                # 流式响应或响应体太小：原样发出
+                await send(start)
+                await send(message)
+                return
+
+            if len(body) >= self.offload_size:
+                compressed = await anyio.to_thread.run_sync(
+                    self._compress, encoding, body
+                )
+            else:
+                compressed = self._compress(encoding, body)
+            if len(compressed) >= len(body):
+                await send(start)
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            COMPRESSED_RESPONSES.labels(encoding).inc()
+            COMPRESSION_SAVED_BYTES.labels(encoding).inc(len(body) - len(compressed))
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
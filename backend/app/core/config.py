@@ -0,0 +1,177 @@
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+from dotenv import load_dotenv
+
+"""
+core.config 模块
+
+应用配置的唯一入口：进程内只加载一次 .env 并解析全部环境变量，
+其余模块统一通过 settings（或 get_settings()）读取，不再各自调用 load_dotenv / os.getenv。
+
+配置项与环境变量一一对应（字段名大写即环境变量名），默认值见下方 Settings 定义，
+示例配置见 .env.examples。
+"""
+
+
+def _env_str(name: str, default: Optional[str] = None) -> Optional[str]:
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip()
+
+
+def _env_int(name: str, default: int) -> int:
+    value = _env_str(name)
+    return int(value) if value is not None else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = _env_str(name)
+    return float(value) if value is not None else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = _env_str(name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class Settings:
+    # 服务
+    app_host: str = "127.0.0.1"
+    app_port: int = 8000
+    app_reload: bool = False
+    log_level: str = "INFO"
+    log_sample_rates: str = ""  # 按日志器采样，如 "core.access=0.1,services=0.5"
+    log_rate_limit: int = 0  # 每个日志器每秒最多输出的记录数，0 表示不限
+    log_queue_size: int = 10000  # 日志队列容量，队列满时丢弃新记录
+    log_batch_size: int = 256  # 写线程每批最多处理的记录数
+    startup_budget_ms: float = 3000
+
+    # 生产启动器（core.server）
+    app_workers: int = 0  # 0 表示按 CPU 核数
+    app_loop: str = "auto"  # auto / uvloop / asyncio
+    app_http: str = "auto"  # auto / httptools / h11
+    app_keepalive: int = 5  # keep-alive 空闲超时（秒）
+    app_backlog: int = 2048
+    app_max_requests: int = 0  # worker 处理 N 个请求后平滑重启，0 表示不重启
+    app_max_requests_jitter: int = 0  # 每个 worker 的回收阈值额外加上 [0, N] 内的随机数
+    app_graceful_timeout: int = 30  # 平滑退出时等待在途请求的最长时间（秒）
+    app_proxy_headers: bool = False  # 部署在反向代理之后时信任 X-Forwarded-*
+
+    # 令牌
+    secret_key: Optional[str] = None
+    algorithm: Optional[str] = None
+    access_token_expire_minutes: int = 30
+    fresh_token_expire_days: int = 7
+    revocation_resync_interval: float = 60  # 吊销列表从 Redis 全量合并的间隔（秒）
+
+    # 数据库
+    database_url: Optional[str] = None
+    db_auto_migrate: bool = True  # 启动 worker 前由主进程执行一次表结构迁移（db.migrate）
+    # 连接池（SQLite 文件库与 PostgreSQL 均生效）
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 5  # 等待空闲连接的最长时间（秒）
+    db_pool_recycle: int = 1800  # 连接最长存活时间（秒），避免被服务端或中间件断开
+    # PostgreSQL（asyncpg）
+    db_statement_cache_size: int = 500  # 预编译语句缓存，经 pgbouncer 事务池时设为 0
+    db_connect_timeout: float = 5
+    db_command_timeout: float = 30  # 单条语句超时（秒）
+
+    # 用户活跃时间写回
+    activity_flush_interval: float = 30  # 写回间隔（秒）
+    activity_batch_size: int = 500
+    query_budget: int = 10
+    slow_query_ms: float = 200
+    slow_query_max_fingerprints: int = 1000
+
+    # Redis
+    redis_host: Optional[str] = None
+    redis_port: int = 6379
+    redis_db: int = 0
+    redis_password: Optional[str] = None
+    redis_max_connections: int = 50
+    redis_pool_timeout: float = 1
+    redis_connect_timeout: float = 0.5
+    redis_socket_timeout: float = 0.5
+    redis_health_check_interval: int = 30
+    redis_breaker_threshold: int = 5
+    redis_breaker_reset_timeout: float = 10
+
+    # 指标接口（/metrics）访问控制：两者都未配置时拒绝所有请求
+    metrics_token: str = ""  # 抓取端携带 Authorization: Bearer <token>
+    metrics_allow_networks: str = ""  # 允许免令牌访问的网段，逗号分隔（CIDR）
+
+    # 请求性能采样
+    profile_secret: str = ""
+    profile_sample_rate: float = 0
+    profile_dir: str = "logs/profiles"
+
+    # 班级聚合数据缓存
+    class_cache_ttl: int = 60
+    dashboard_upcoming_limit: int = 5
+
+    # 作业截止调度
+    deadline_reload_interval: float = 300
+    deadline_batch_size: int = 500
+    deadline_lock_ttl: int = 30
+
+    # 站内通知
+    notification_queue_size: int = 10000
+    notification_batch_size: int = 500
+
+    # 后台任务
+    job_workers: int = 2  # 0 表示本进程只入队、不执行
+    job_poll_interval: float = 2
+    job_lease: float = 60
+    job_timeout: float = 1800
+    job_retry_base_delay: float = 10
+    job_retry_max_delay: float = 600
+    job_delete_batch_size: int = 500
+
+    # 附件存储
+    attachment_dir: str = "data/attachments"
+    attachment_max_size: int = 200 * 1024 * 1024
+    attachment_write_buffer: int = 1024 * 1024  # 累积到该字节数后在线程池中写盘
+    attachment_accel_prefix: str = ""  # 非空时下载交给 Nginx（X-Accel-Redirect）
+
+    # 就绪探测
+    ready_probe_interval: float = 5
+    ready_probe_timeout: float = 2
+    ready_max_loop_lag_ms: int = 500
+    ready_require_redis: bool = False  # Redis 不可用时是否返回 503（默认退化运行，保持就绪）
+
+    # 响应压缩
+    compression_minimum_size: int = 1024  # 小于该字节数的响应不压缩
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    compression_offload_size: int = 256 * 1024  # 不低于该字节数时在线程池中压缩
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """加载 .env 并按字段类型解析环境变量"""
+        load_dotenv()
+        parsers = {bool: _env_bool, int: _env_int, float: _env_float}
+        values = {}
+        for name, field in cls.__dataclass_fields__.items():
+            env_name = name.upper()
+            parser = parsers.get(field.type)
+            if parser is not None:
+                values[name] = parser(env_name, field.default)
+            else:
+                values[name] = _env_str(env_name, field.default)
+        return cls(**values)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """返回进程内唯一的配置实例"""
+    return Settings.from_env()
+
+
+settings = get_settings()
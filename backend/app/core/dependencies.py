@@ -1,33 +1,35 @@
 # core/dependencies.py
 import logging
-from fastapi import Depends
+from fastapi import Depends, Request
 from fastapi.security import OAuth2PasswordBearer
 from core import exceptions
+from core.principal import Principal
 from utils.token import verify_access_token
 from models.user import User
-from schemas.User import User
+from services.activity import activity_tracker
 from services.auth import get_user_by_uuid
-from db.connector import DatabaseConnector
-from sqlalchemy.ext.asyncio import AsyncSession
+from db.connector import DatabaseConnector, LazySession
 
 logger = logging.getLogger("core.dependencies")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
-async def get_current_user(
+async def get_principal(
+    request: Request,
     token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(DatabaseConnector.get_db),
-) -> User | None:
+    db: LazySession = Depends(DatabaseConnector.get_lazy_db),
+) -> Principal:
     """
-    从请求中提取访问令牌，验证其有效性，并返回对应的用户对象。
+    从请求中提取访问令牌，验证其有效性，并返回请求级身份对象 Principal。
 
     参数说明:
+        request (Request): 当前请求，Principal 缓存在 request.state.principal 上
         token (str): 从请求头中自动注入的 Bearer Token（由 OAuth2PasswordBearer 提供）
-        db (Session): 注入的数据库会话对象（通过依赖注入提供）
+        db (LazySession): 注入的惰性数据库会话（通过依赖注入提供），加载身份后即释放连接
 
     返回值:
-        User | None: 成功验证令牌并查找到用户时返回 User 对象；验证失败则抛出异常。
+        Principal: 成功验证令牌并查找到用户时返回身份对象；验证失败则抛出异常。
 
     异常说明:
         - InvalidVerifyToken: 令牌无效、缺失或格式错误
@@ -36,25 +38,34 @@ async def get_current_user(
 
     使用场景:
         - 作为路由依赖项（Depends），用于确保当前请求用户已登录并且令牌有效。
-        - 常用于需要身份认证的接口，如获取个人资料、修改密码等。
+        - 权限依赖（core.security）与业务服务直接复用该对象中的角色与班级成员关系，
+          同一请求内用户最多只查询一次。
 
     日志行为:
         - 成功验证令牌并查询用户时记录 info 级别日志。
         - 用户不存在记录 warning。
         - 未知异常记录 error，包含完整堆栈。
     """
+    principal = getattr(request.state, "principal", None)
+    if principal is not None:
+        return principal
     try:
-        logger.info("验证访问令牌")
+        logger.debug("验证访问令牌")
         token_data = verify_access_token(token)
         if not token_data or not token_data.get("uuid"):
             raise exceptions.InvalidVerifyToken("令牌无效或缺少uuid")
         user = await get_user_by_uuid(db, token_data.get("uuid"))
-        logger.info(
+        logger.debug(
             "访问令牌验证成功: uuid: %s 用户名: %s",
             getattr(user, "uuid", None),
             getattr(user, "username", None),
         )
-        return user
+        principal = Principal(user)
+        request.state.principal = principal
+        activity_tracker.record_seen(principal.uuid)
+        # 身份加载完毕后立即归还连接，后续业务查询按需重新获取
+        await db.release()
+        return principal
     except exceptions.InvalidVerifyToken:
         raise
     except exceptions.NotExists:
@@ -63,3 +74,12 @@ async def get_current_user(
     except Exception as e:
         logger.error("未知错误: %s", e, exc_info=True)
         raise exceptions.DatabaseQueryError("数据库访问失败") from e
+
+
+async def get_current_user(principal: Principal = Depends(get_principal)) -> User:
+    """
+    返回当前请求用户的 ORM 对象（由 get_principal 加载，不会重复查询）。
+
+    适用于只需要用户基础信息的接口，如获取个人资料。
+    """
+    return principal.user
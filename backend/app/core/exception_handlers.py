@@ -15,6 +15,8 @@ from core.exceptions import (
     AlreadyExists,
     InvalidParameter,
     RateLimitExceeded,
+    ServiceUnavailable,
+    PayloadTooLarge,
 )
 
 logger = logging.getLogger("core.exception_handlers")
@@ -136,6 +138,26 @@ async def rate_limit_exceeded_handler(
     )
 
 
+async def service_unavailable_handler(
+    request: Request, exc: ServiceUnavailable
+) -> JSONResponse:
+    return build_response(
+        exc,
+        logger.warning,
+        f"依赖服务不可用: {exc.detail}",
+    )
+
+
+async def payload_too_large_handler(
+    request: Request, exc: PayloadTooLarge
+) -> JSONResponse:
+    return build_response(
+        exc,
+        logger.warning,
+        f"请求体过大: {exc.detail}",
+    )
+
+
 exception_handler_map = {
     InvalidVerifyToken: invalid_verify_token_handler,
     NotExists: user_not_exists_handler,
@@ -145,6 +167,8 @@ exception_handler_map = {
     PermissionDenied: permission_denied_handler,
     InvalidParameter: invalid_parameter_handler,
     RateLimitExceeded: rate_limit_exceeded_handler,
+    ServiceUnavailable: service_unavailable_handler,
+    PayloadTooLarge: payload_too_large_handler,
 }
 
 
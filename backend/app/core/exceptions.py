@@ -120,6 +120,26 @@ class RateLimitExceeded(BaseAppException):
     message = "Too many requests. Please try again later"
 
 
+class ServiceUnavailable(BaseAppException):
+    """依赖的外部服务（如 Redis）暂不可用"""
+
+    code = 503
+    error_status = ErrorCode.SERVICE_UNAVAILABLE
+    http_status = status.HTTP_503_SERVICE_UNAVAILABLE
+    message = "Service temporarily unavailable"
+    detail = "服务暂不可用，请稍后重试"
+
+
+class PayloadTooLarge(BaseAppException):
+    """请求体超过允许的大小（如上传的附件过大）"""
+
+    code = 413
+    error_status = ErrorCode.PARAMETER_ERROR
+    http_status = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    message = "Payload too large"
+    detail = "请求体超过允许的大小"
+
+
 class DatabaseQueryError(BaseAppException):
     pass
 
@@ -0,0 +1,95 @@
+import time
+from typing import Any, Optional
+
+"""
+core.local_store 模块
+
+进程内的简易键值存储，实现 Redis 命令的一个子集（get / set / incr / expire / delete），
+作为 Redis 不可用（降级模式）时的本地兜底：
+- 限流计数改为按 worker 进程计数（多 worker 时整体阈值会相应放宽）
+- 角色等缓存只在当前进程内有效
+
+说明:
+    - 所有方法均为 async，与 redis.asyncio 客户端签名保持一致，可直接互换。
+    - 过期键在访问时惰性删除，并在写入次数达到阈值时批量清理，避免内存无限增长。
+    - 仅在事件循环线程内使用，无需加锁。
+"""
+
+
+class LocalStore:
+    """带过期时间的进程内键值存储"""
+
+    def __init__(self, max_keys: int = 100_000, purge_every: int = 1000):
+        self._data: dict[str, Any] = {}
+        self._expires: dict[str, float] = {}
+        self.max_keys = max_keys
+        self._purge_every = purge_every
+        self._writes = 0
+
+    def _alive(self, key: str) -> bool:
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+            return False
+        return key in self._data
+
+    def _on_write(self):
+        self._writes += 1
+        if self._writes % self._purge_every == 0 or len(self._data) > self.max_keys:
+            self.purge()
+
+    def purge(self):
+        """清理已过期的键；仍超出容量时按写入顺序淘汰最早的键"""
+        now = time.monotonic()
+        for key in [k for k, t in self._expires.items() if t <= now]:
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        overflow = len(self._data) - self.max_keys
+        if overflow > 0:
+            for key in list(self._data)[:overflow]:
+                self._data.pop(key, None)
+                self._expires.pop(key, None)
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self._data.get(key) if self._alive(key) else None
+
+    async def set(self, key: str, value: Any, ex: Optional[int] = None, **kwargs):
+        self._data[key] = value
+        if ex:
+            self._expires[key] = time.monotonic() + ex
+        else:
+            self._expires.pop(key, None)
+        self._on_write()
+        return True
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        value = int(self._data.get(key, 0)) + amount if self._alive(key) else amount
+        self._data[key] = value
+        self._on_write()
+        return value
+
+    async def incr_many(self, keys: list[str], ex: int) -> list[int]:
+        values = []
+        for key in keys:
+            values.append(await self.incr(key))
+            await self.expire(key, ex)
+        return values
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        if not self._alive(key):
+            return False
+        self._expires[key] = time.monotonic() + seconds
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        removed = 0
+        for key in keys:
+            if self._alive(key):
+                removed += 1
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return removed
+
+    async def ping(self) -> bool:
+        return True
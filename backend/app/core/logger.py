@@ -1,9 +1,109 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 from logging.config import dictConfig
+from core.config import settings
+from core.log_filters import LOG_RECORDS_DROPPED, LogVolumeFilter, parse_sample_rates
+
+"""
+core.logger 模块
+
+日志系统初始化。
+
+事件循环线程上的日志调用只做过滤与入队（QueueHandler），文件写入、滚动与控制台输出
+全部由后台写线程（BatchQueueListener）完成：
+- 队列有界（LOG_QUEUE_SIZE），写满时直接丢弃新记录并计入 log_records_dropped_total，
+  不会阻塞请求；磁盘卡顿只会表现为日志丢失，而不是接口延迟。
+- 写线程每次取出一批记录（最多 LOG_BATCH_SIZE 条）依次写入，批次结束后统一 flush，
+  避免逐条 flush 带来的系统调用开销。
+- 采样与限速过滤器（见 core.log_filters）挂在队列 handler 上，被丢弃的记录不占用队列。
+"""
 
 # 获取日志级别（默认 INFO），可通过环境变量 LOG_LEVEL 覆盖
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_LEVEL = settings.log_level.upper()
+
+
+class _DeferredFlushMixin:
+    """批量写入时由写线程在批次结束后统一 flush，单条记录写入后不再立即 flush"""
+
+    defer_flush = False
+
+    def flush(self):
+        if not self.defer_flush:
+            super().flush()
+
+    def flush_batch(self):
+        self.acquire()
+        try:
+            super().flush()
+        finally:
+            self.release()
+
+
+class BatchStreamHandler(_DeferredFlushMixin, logging.StreamHandler):
+    pass
+
+
+class BatchRotatingFileHandler(
+    _DeferredFlushMixin, logging.handlers.RotatingFileHandler
+):
+    pass
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """队列满时丢弃记录并计数，保证日志调用永不阻塞"""
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.labels(record.name, "queue_full").inc()
+
+
+class BatchQueueListener(logging.handlers.QueueListener):
+    """
+    批量消费日志队列的写线程
+
+    每次阻塞取出一条记录后，再非阻塞地取出至多 batch_size - 1 条，
+    逐条交给各 handler 处理，整批结束后统一 flush。
+    """
+
+    def __init__(self, log_queue, *handlers, batch_size: int = 256):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+        for handler in handlers:
+            if isinstance(handler, _DeferredFlushMixin):
+                handler.defer_flush = True
+
+    def enqueue_sentinel(self):
+        # 停止时队列可能已满，结束标记必须等待入队，不能像普通记录一样丢弃
+        self.queue.put(self._sentinel)
+
+    def _monitor(self):
+        q = self.queue
+        stopping = False
+        while not stopping:
+            batch = [q.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            for record in batch:
+                if record is self._sentinel:
+                    stopping = True
+                    continue
+                self.handle(record)
+            for handler in self.handlers:
+                if isinstance(handler, _DeferredFlushMixin):
+                    handler.flush_batch()
+            for _ in batch:
+                q.task_done()
+
+
+_listener: BatchQueueListener | None = None
 
 # 定义日志配置字典
 LOGGING_CONFIG = {
@@ -32,13 +132,13 @@ LOGGING_CONFIG = {
     "handlers": {
         # 控制台日志输出（彩色）
         "console": {
-            "class": "logging.StreamHandler",
+            "class": "core.logger.BatchStreamHandler",
             "formatter": "detailed",
             "level": LOG_LEVEL,
         },
         # 普通日志写入文件 logs/app.log，文件最大 5MB，最多保留 5 个历史文件
         "file": {
-            "class": "logging.handlers.RotatingFileHandler",
+            "class": "core.logger.BatchRotatingFileHandler",
             "formatter": "detailed",
             "filename": "logs/app.log",
             "maxBytes": 1024 * 1024 * 5,  # 5MB
@@ -48,7 +148,7 @@ LOGGING_CONFIG = {
         },
         # 错误日志单独写入 logs/error.log，最大 5MB，最多保留 3 个历史文件
         "error_file": {
-            "class": "logging.handlers.RotatingFileHandler",
+            "class": "core.logger.BatchRotatingFileHandler",
             "formatter": "error",
             "filename": "logs/error.log",
             "maxBytes": 1024 * 1024 * 5,
@@ -57,7 +157,8 @@ LOGGING_CONFIG = {
             "encoding": "utf-8",
         },
     },
-    # 根日志器配置：将日志发送给控制台、普通文件、错误文件三个 handler
+    # 根日志器配置：dictConfig 创建控制台、普通文件、错误文件三个 handler，
+    # setup_logging 随后把它们移交给写线程，根日志器只保留队列 handler
     "root": {
         "handlers": ["console", "file", "error_file"],
         "level": LOG_LEVEL,
@@ -67,10 +168,13 @@ LOGGING_CONFIG = {
 
 def setup_logging():
     """
-    初始化日志系统，包括设置日志目录、加载配置以及为控制台输出添加彩色格式。
+    初始化日志系统，包括设置日志目录、加载配置、为控制台输出添加彩色格式，
+    并把所有 handler 移交给后台写线程。可重复调用（会先停止旧的写线程）。
     """
     import colorlog  # 引入彩色日志模块
 
+    global _listener
+    stop_logging()
     os.makedirs("logs", exist_ok=True)  # 确保 logs 目录存在
     dictConfig(LOGGING_CONFIG)  # 应用日志配置
 
@@ -87,7 +191,50 @@ def setup_logging():
         },
     )
 
-    # 获取根日志器的第一个 handler（默认是 console）
-    console_handler = logging.getLogger().handlers[0]
-    # 为控制台 handler 设置彩色格式
-    console_handler.setFormatter(formatter)
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    # 根日志器的第一个 handler 为 console，为其设置彩色格式
+    handlers[0].setFormatter(formatter)
+
+    queue_handler = DroppingQueueHandler(queue.Queue(maxsize=settings.log_queue_size))
+    # 日志量控制：按日志器采样与限速，在入队前执行；ERROR 及以上的记录不受影响
+    queue_handler.addFilter(
+        LogVolumeFilter(
+            parse_sample_rates(settings.log_sample_rates), settings.log_rate_limit
+        )
+    )
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+
+    _listener = BatchQueueListener(
+        queue_handler.queue, *handlers, batch_size=settings.log_batch_size
+    )
+    _listener.start()
+
+
+def stop_logging():
+    """
+    停止写线程：写完队列中剩余的记录，并把 handler 直接挂回根日志器，
+    之后（事件循环已结束）的日志同步写入（在 lifespan 关闭阶段调用）。
+    """
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+    root = logging.getLogger()
+    filters = []
+    for handler in list(root.handlers):
+        if isinstance(handler, DroppingQueueHandler):
+            root.removeHandler(handler)
+            filters.extend(handler.filters)
+    for handler in listener.handlers:
+        if isinstance(handler, _DeferredFlushMixin):
+            handler.defer_flush = False
+        for volume_filter in filters:
+            handler.addFilter(volume_filter)
+        root.addHandler(handler)
+
+
+atexit.register(stop_logging)
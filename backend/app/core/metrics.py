@@ -0,0 +1,262 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Iterable
+
+"""
+core.metrics 模块
+
+进程内指标注册表，以 Prometheus 文本格式（text/plain; version=0.0.4）对外暴露。
+
+提供三种指标类型：
+- Counter：单调递增计数器（如限流拒绝次数）
+- Gauge：可增可减的瞬时值（如进程启动时间）
+- Histogram：分桶直方图（如请求耗时、SQL 执行耗时）
+
+说明:
+    - 指标只在当前 worker 进程内聚合，多 worker 部署时由 Prometheus 按实例分别抓取。
+    - 所有写操作加锁，日志线程等非事件循环线程也可安全更新。
+"""
+
+# 默认耗时分桶（秒），覆盖 1ms ~ 10s
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """指标基类，负责名称、帮助信息与标签管理"""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """按标签值获取（必要时创建）子指标，用法与 prometheus_client 一致"""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} 需要标签 {self.labelnames}，实际传入 {values}")
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for key, child in list(self._children.items()):
+            lines.extend(child.render(self.name, self.labelnames, key))
+        return lines
+
+
+class _CounterChild:
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def render(self, name, labelnames, labelvalues) -> list[str]:
+        labels = _format_labels(labelnames, labelvalues)
+        return [f"{name}{labels} {_format_value(self._value)}"]
+
+
+class Counter(_Metric):
+    """单调递增计数器"""
+
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        """无标签计数器的快捷写法"""
+        self.labels().inc(amount)
+
+
+class _GaugeChild(_CounterChild):
+    def set(self, value: float):
+        with self._lock:
+            self._value = value
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+
+class Gauge(_Metric):
+    """瞬时值指标"""
+
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        """无标签 Gauge 的快捷写法"""
+        self.labels().set(value)
+
+
+class _HistogramChild:
+    def __init__(self, buckets: tuple):
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)  # 最后一个桶为 +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self._buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def render(self, name, labelnames, labelvalues) -> list[str]:
+        with self._lock:
+            counts = list(self._counts)
+            total_sum = self._sum
+        lines = []
+        cumulative = 0
+        bucket_names = tuple(labelnames) + ("le",)
+        for bound, count in zip(self._buckets + (float("inf"),), counts):
+            cumulative += count
+            labels = _format_labels(
+                bucket_names, tuple(labelvalues) + (_format_value(bound),)
+            )
+            lines.append(f"{name}_bucket{labels} {cumulative}")
+        labels = _format_labels(labelnames, labelvalues)
+        lines.append(f"{name}_sum{labels} {_format_value(total_sum)}")
+        lines.append(f"{name}_count{labels} {cumulative}")
+        return lines
+
+
+class Histogram(_Metric):
+    """分桶直方图，桶边界为上界（le）"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple = (),
+        buckets: tuple = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        """无标签直方图的快捷写法"""
+        self.labels().observe(value)
+
+
+class MetricsRegistry:
+    """指标注册表，负责创建指标并统一渲染为 Prometheus 文本格式"""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"指标重复注册: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple = (),
+        buckets: tuple = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+PROCESS_START_TIME = registry.gauge(
+    "process_start_time_seconds", "进程启动时间（Unix 时间戳）"
+)
+PROCESS_START_TIME.set(time.time())
+APP_STARTUP_DURATION = registry.gauge(
+    "app_startup_seconds", "worker 冷启动耗时（模块导入到 lifespan 初始化完成）"
+)
+
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP 请求处理耗时（按路由模板、方法与状态码）",
+    ("method", "route", "status"),
+)
+SQL_QUERY_DURATION = registry.histogram(
+    "db_query_duration_seconds", "SQL 语句执行耗时"
+)
+DB_POOL_CHECKOUT_WAIT = registry.histogram(
+    "db_pool_checkout_wait_seconds", "从连接池获取数据库连接的等待耗时"
+)
+REDIS_COMMAND_DURATION = registry.histogram(
+    "redis_command_duration_seconds", "Redis 命令执行耗时", ("command",)
+)
+RATE_LIMIT_REJECTIONS = registry.counter(
+    "rate_limit_rejections_total", "被限流器拒绝的请求数", ("path",)
+)
@@ -2,22 +2,32 @@ from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 import logging
 import time
-import traceback
+from core.config import settings
+from core.metrics import HTTP_REQUEST_DURATION
+from core.request_context import start_request_stats
 
-# 初始化中间件的专属 logger
-logger = logging.getLogger("core.middleware")
+# 访问日志单独使用 core.access，便于按需采样（LOG_SAMPLE_RATES=core.access=0.1）
+logger = logging.getLogger("core.access")
+
+# 单个请求允许的 SQL 语句数量上限，超出时记录 warning（0 表示不检查）
+QUERY_BUDGET = settings.query_budget
 
 
 class AccessLogMiddleware(BaseHTTPMiddleware):
     """
     请求访问日志中间件：
-    - 记录每一个 HTTP 请求的开始、结束、耗时、状态码。
+    - 每个请求只输出一条访问记录（客户端、方法、路径、状态码、耗时、用户、SQL / Redis 统计），
+      5xx 或 SQL 次数超出 QUERY_BUDGET 时以 warning 级别输出。
+    - 按路由模板与状态码记录请求耗时直方图（见 core.metrics）。
+    - 统计请求内的 SQL / Redis 调用次数与耗时，写入 Server-Timing 响应头，
+      便于尽早发现 N+1 查询。
     - 捕获异常时打印详细堆栈，辅助调试。
     """
 
     async def dispatch(self, request: Request, call_next):
         # 记录请求开始时间（用于计算耗时）
-        start_time = time.time()
+        start_time = time.perf_counter()
+        stats = start_request_stats()
 
         # 获取客户端 IP（支持通过反向代理获取真实 IP）
         x_forwarded_for = request.headers.get("X-Forwarded-For")
@@ -31,27 +41,55 @@ class AccessLogMiddleware(BaseHTTPMiddleware):
         method = request.method  # 请求方法（GET、POST 等）
         path = request.url.path  # 请求路径
 
-        # 打印请求开始日志
-        logger.info(f"请求开始 - {client_ip} {method} {path}")
-
         try:
             # 调用后续中间件或路由处理函数
             response = await call_next(request)
-        except Exception as exc:
+        except Exception:
             # 异常处理：打印堆栈信息以便排查问题
-            tb = traceback.format_exc()
-            logger.error(
-                f"请求异常 - {client_ip} {method} {path} 错误: {exc}\n堆栈信息:\n{tb}"
-            )
+            logger.exception("请求异常 - %s %s %s", client_ip, method, path)
+            HTTP_REQUEST_DURATION.labels(
+                method, self.route_template(request), 500
+            ).observe(time.perf_counter() - start_time)
             raise  # 将异常继续抛出，由上层处理
 
         # 请求处理完成，计算耗时（单位：毫秒）
-        process_time_ms = (time.time() - start_time) * 1000
+        elapsed = time.perf_counter() - start_time
+        process_time_ms = elapsed * 1000
         status_code = response.status_code
+        route = self.route_template(request)
+        HTTP_REQUEST_DURATION.labels(method, route, status_code).observe(elapsed)
+        response.headers["Server-Timing"] = stats.server_timing(elapsed)
 
-        # 打印请求结束日志（含状态码与耗时）
-        logger.info(
-            f"请求结束 - {client_ip} {method} {path} 状态码: {status_code} 耗时: {process_time_ms:.2f}ms"
+        # 单条访问记录（含状态码、耗时、用户与 SQL / Redis 调用统计）
+        over_budget = bool(QUERY_BUDGET) and stats.sql_count > QUERY_BUDGET
+        level = (
+            logging.WARNING if over_budget or status_code >= 500 else logging.INFO
         )
+        if logger.isEnabledFor(level):
+            principal = getattr(request.state, "principal", None)
+            logger.log(
+                level,
+                "%s %s %s %s %.2fms user=%s SQL: %d次/%.2fms Redis: %d次/%.2fms%s",
+                client_ip,
+                method,
+                path,
+                status_code,
+                process_time_ms,
+                principal.uuid if principal is not None else "-",
+                stats.sql_count,
+                stats.sql_time * 1000,
+                stats.redis_count,
+                stats.redis_time * 1000,
+                f" 超出 SQL 预算({QUERY_BUDGET})" if over_budget else "",
+            )
 
         return response  # 返回响应给客户端
+
+    @staticmethod
+    def route_template(request: Request) -> str:
+        """
+        获取请求匹配到的路由模板（如 /api/v1/classes/{class_uuid}），
+        未匹配任何路由（404）时统一归为 "unmatched"，避免指标标签基数随路径无限增长。
+        """
+        route = request.scope.get("route")
+        return getattr(route, "path", None) or "unmatched"
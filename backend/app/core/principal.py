@@ -0,0 +1,90 @@
+import logging
+from typing import Optional
+from sqlalchemy import literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from core import exceptions
+from models.class_model import ClassMemberModel, ClassModel
+from models.user import User
+
+logger = logging.getLogger("core.principal")
+
+
+class Principal:
+    """
+    请求级身份对象（每个请求只加载一次）
+
+    由 core.dependencies.get_principal 在验证令牌后创建，并缓存在 request.state 上，
+    所有权限依赖与业务服务都复用它，不再重复查询用户或角色。
+
+    属性:
+        user (User): 本次请求加载的用户 ORM 对象
+        uuid / username / role / status / profile_name: 常用身份字段的快照
+
+    班级成员关系按需加载：首次调用 memberships() 时一次性查询该用户的全部班级成员记录
+    （包括其任教的班级，创建班级时教师不会写入成员表），之后同一请求内的成员校验都直接命中内存。
+    """
+
+    def __init__(self, user: User):
+        self.user = user
+        self.uuid: str = user.uuid
+        self.username: str = user.username
+        self.role: str = user.role
+        self.status: str = user.status
+        self.profile_name: Optional[str] = user.profile_name
+        self._memberships: Optional[dict[str, str]] = None
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role == "admin"
+
+    @property
+    def is_teacher(self) -> bool:
+        return self.role == "teacher"
+
+    async def memberships(self, db: AsyncSession) -> dict[str, str]:
+        """
+        获取当前用户的班级成员关系。
+
+        任教但不在成员表中的班级角色为 teacher；既任教又是成员时以成员表中的角色为准。
+
+        返回:
+            dict[str, str]: {班级 UUID: 班级内角色}
+
+        异常:
+            DatabaseQueryError: 查询数据库失败
+        """
+        if self._memberships is None:
+            try:
+                taught = select(
+                    ClassModel.class_uuid,
+                    literal("teacher").label("role"),
+                    literal(0).label("priority"),
+                ).where(ClassModel.teacher_uuid == self.uuid)
+                joined = select(
+                    ClassMemberModel.class_uuid, ClassMemberModel.role, literal(1)
+                ).where(ClassMemberModel.user_uuid == self.uuid)
+                stmt = union_all(taught, joined).order_by("priority")
+                result = await db.execute(stmt)
+            except Exception as e:
+                logger.error("查询班级成员关系失败: %s，错误: %s", self.uuid, e)
+                raise exceptions.DatabaseQueryError("查询班级成员失败") from e
+            # 成员记录排在任教记录之后，同一班级以成员表中的角色覆盖
+            self._memberships = {row.class_uuid: row.role for row in result}
+        return self._memberships
+
+    async def require_member(self, db: AsyncSession, class_uuid: str) -> str:
+        """
+        校验当前用户属于指定班级，返回其班级内角色。
+
+        异常:
+            InvalidParameter: 用户不属于该班级
+        """
+        role = (await self.memberships(db)).get(class_uuid)
+        if role is None:
+            raise exceptions.InvalidParameter()
+        return role
+
+    def add_membership(self, class_uuid: str, role: str):
+        """加入班级后同步更新已加载的成员关系"""
+        if self._memberships is not None:
+            self._memberships[class_uuid] = role
@@ -0,0 +1,123 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import random
+import re
+import time
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from core.config import settings
+
+"""
+core.profiling 模块
+
+按需对单个请求做 cProfile 采样，结果以 pstats 格式写入 logs/profiles/，
+文件名包含时间、方法、路由模板与耗时，可直接用 snakeviz、flameprof 等工具生成火焰图。
+
+触发方式（二选一）：
+- 携带签名调试头 X-Debug-Profile: <过期时间戳>.<HMAC-SHA256 签名>（需配置 PROFILE_SECRET）
+- 按 PROFILE_SAMPLE_RATE 比例随机采样（0 ~ 1）
+
+两者都未配置时 app.py 不会注册该中间件，请求路径上没有任何额外开销。
+
+注意:
+    cProfile 按线程采集，异步场景下同一时间窗口内其他请求的协程也会被计入；
+    同一时刻只允许一个请求被采样，重叠的请求直接跳过。
+"""
+
+logger = logging.getLogger("core.profiling")
+
+PROFILE_SECRET = settings.profile_secret
+PROFILE_SAMPLE_RATE = settings.profile_sample_rate
+PROFILE_DIR = settings.profile_dir
+PROFILE_HEADER = "X-Debug-Profile"
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9]+")
+
+
+def profiling_enabled() -> bool:
+    """是否启用请求采样（配置了签名密钥或采样率大于 0）"""
+    return bool(PROFILE_SECRET) or PROFILE_SAMPLE_RATE > 0
+
+
+def _signature(expires: str) -> str:
+    return hmac.new(
+        PROFILE_SECRET.encode(), expires.encode(), hashlib.sha256
+    ).hexdigest()
+
+
+def sign_profile_token(ttl: int = 300) -> str:
+    """
+    生成调试头的值，有效期 ttl 秒。
+
+    示例:
+        python -c "from core.profiling import sign_profile_token; print(sign_profile_token())"
+    """
+    if not PROFILE_SECRET:
+        raise RuntimeError("未配置 PROFILE_SECRET，无法签发调试令牌")
+    expires = str(int(time.time()) + ttl)
+    return f"{expires}.{_signature(expires)}"
+
+
+def verify_profile_token(token: str) -> bool:
+    """校验调试头签名与有效期"""
+    if not PROFILE_SECRET or not token:
+        return False
+    expires, _, signature = token.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(signature, _signature(expires))
+
+
+class ProfilingMiddleware(BaseHTTPMiddleware):
+    """
+    请求采样中间件：
+    - 命中调试头或采样率时，用 cProfile 包裹后续处理流程。
+    - 处理结束后在线程池中写出 pstats 文件，不阻塞事件循环。
+    """
+
+    _active = False
+
+    def should_profile(self, request: Request) -> bool:
+        if ProfilingMiddleware._active:
+            return False
+        if verify_profile_token(request.headers.get(PROFILE_HEADER, "")):
+            return True
+        return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+    async def dispatch(self, request: Request, call_next):
+        if not self.should_profile(request):
+            return await call_next(request)
+
+        import cProfile  # 仅在实际采样时加载
+
+        profiler = cProfile.Profile()
+        ProfilingMiddleware._active = True
+        start_time = time.perf_counter()
+        profiler.enable()
+        try:
+            return await call_next(request)
+        finally:
+            profiler.disable()
+            ProfilingMiddleware._active = False
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+            await self.dump(profiler, request, elapsed_ms)
+
+    @staticmethod
+    async def dump(profiler, request: Request, elapsed_ms: float):
+        route = getattr(request.scope.get("route"), "path", None) or "unmatched"
+        filename = "{}_{}_{}_{:.0f}ms.prof".format(
+            time.strftime("%Y%m%d-%H%M%S"),
+            request.method,
+            _UNSAFE_CHARS.sub("_", route).strip("_") or "root",
+            elapsed_ms,
+        )
+        path = os.path.join(PROFILE_DIR, filename)
+        try:
+            await asyncio.to_thread(os.makedirs, PROFILE_DIR, exist_ok=True)
+            await asyncio.to_thread(profiler.dump_stats, path)
+            logger.info("请求性能采样已保存: %s", path)
+        except OSError as e:
+            logger.error("写入性能采样文件失败: %s, 错误: %s", path, e)
@@ -1,8 +1,9 @@
 import logging
 from typing import Callable
 from fastapi import Request
-from core.redis import redis_client  # 引入 Redis 异步客户端
+from core.redis import resilient_redis  # 带熔断降级的 Redis 访问层
 from core import exceptions
+from core.metrics import RATE_LIMIT_REJECTIONS
 
 # 设置日志记录器，用于记录限流相关事件
 logger = logging.getLogger("core.rate_limit")
@@ -18,31 +19,39 @@ def rate_limiter(limit: int = 5, windows: int = 60) -> Callable:
 
     返回:
         Callable: 可注入到路由中的异步限流函数。
+
+    说明:
+        Redis 不可用时自动降级为进程内计数（按 worker 计数），不会阻塞或拒绝请求。
     """
 
     async def _limiter(request: Request):
-        # 日志记录当前请求的限流检查信息
-        logger.info(
-            f"频率限制检查: IP: {request.client.host}, 路径: {request.url.path}, 限制: {limit}次/{windows}秒"
-        )
-
         ip = request.client.host  # 获取客户端 IP
         path = request.url.path  # 获取请求路径
         key = f"rate_limit:{ip}:{path}"  # 构造 Redis Key（以 IP+路径区分）
+        logger.debug(
+            "频率限制检查: IP: %s, 路径: %s, 限制: %d次/%d秒", ip, path, limit, windows
+        )
 
         # 对应 key 自增计数（如果 key 不存在，会自动创建，初始值为 1）
-        count = await redis_client.incr(key)
+        count = await resilient_redis.incr(key)
 
         # 如果是首次请求，设置 Redis key 的过期时间
         if count == 1:
-            await redis_client.expire(key, windows)
-            logger.debug(f"首次请求，设置过期时间: {windows}秒（Key: {key}）")
+            await resilient_redis.expire(key, windows)
+            logger.debug("首次请求，设置过期时间: %d秒（Key: %s）", windows, key)
 
         # 如果请求次数超过设定限制，则拒绝访问
         if count > limit:
             logger.warning(
-                f"请求超出频率限制: IP: {ip}, 路径: {path}, 当前计数: {count}, 限制: {limit}"
+                "请求超出频率限制: IP: %s, 路径: %s, 当前计数: %d, 限制: %d",
+                ip,
+                path,
+                count,
+                limit,
             )
+            # 指标按路由模板聚合，避免路径参数导致标签基数膨胀
+            route = request.scope.get("route")
+            RATE_LIMIT_REJECTIONS.labels(getattr(route, "path", path)).inc()
             raise exceptions.RateLimitExceeded()
 
     return _limiter
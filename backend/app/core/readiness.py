@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import time
+from sqlalchemy import text
+from core.config import settings
+from core.metrics import registry
+from core.redis import redis_client, resilient_redis
+from db.connector import DatabaseConnector
+
+"""
+core.readiness 模块
+
+就绪探测：后台任务每隔 READY_PROBE_INTERVAL 秒检查一次依赖，/ready 只读取最近一次的结果，
+负载均衡器的探测请求本身不访问数据库与 Redis。
+
+检查项:
+    - database: 从连接池取连接执行 SELECT 1，记录耗时
+    - redis: PING 耗时，以及熔断器状态
+    - db_pool: 连接池容量、已借出连接数与溢出连接数
+    - event_loop: 事件循环延迟（探测任务实际唤醒时间与预期时间之差）
+
+判定为未就绪（/ready 返回 503）的情况:
+    - 数据库检查失败 / 超时（READY_PROBE_TIMEOUT）
+    - READY_REQUIRE_REDIS 开启时 Redis 检查失败；默认关闭：Redis 不可用时各 worker 退化到本地存储
+      继续服务，若因此全部返回 503，负载均衡器会摘除所有实例，把 Redis 抖动放大为整体故障
+    - 事件循环延迟超过 READY_MAX_LOOP_LAG_MS
+    - 尚未完成首次探测，或探测结果已过期（探测任务异常停止）
+"""
+
+logger = logging.getLogger("core.readiness")
+
+READINESS_CHECK_UP = registry.gauge(
+    "readiness_check_up", "就绪检查结果（1 正常，0 失败）", ("check",)
+)
+READINESS_CHECK_LATENCY = registry.gauge(
+    "readiness_check_latency_seconds", "就绪检查耗时", ("check",)
+)
+EVENT_LOOP_LAG = registry.gauge("event_loop_lag_seconds", "事件循环延迟")
+DB_POOL_CHECKED_OUT = registry.gauge(
+    "db_pool_checked_out", "数据库连接池已借出的连接数"
+)
+
+
+async def _timed(probe, timeout: float) -> dict:
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(probe(), timeout)
+    except asyncio.TimeoutError:
+        return {"ok": False, "error": f"超时（{timeout:g}s）"}
+    except Exception as e:
+        return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+    return {"ok": True, "latency_ms": round((time.perf_counter() - start) * 1000, 2)}
+
+
+async def _ping_database():
+    async with DatabaseConnector.engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+def pool_stats() -> dict:
+    """连接池使用情况（不支持统计的连接池只返回类型）"""
+    pool = DatabaseConnector.engine.pool
+    stats = {"type": type(pool).__name__}
+    if hasattr(pool, "checkedout"):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=settings.db_max_overflow,
+        )
+        DB_POOL_CHECKED_OUT.set(stats["checked_out"])
+    return stats
+
+
+class ReadinessProber:
+    """
+    后台就绪探测器
+
+    参数:
+        interval (float): 探测间隔（秒）
+        timeout (float): 单项检查超时（秒）
+        max_loop_lag (float): 允许的最大事件循环延迟（秒）
+        require_redis (bool): Redis 检查失败时是否判定为未就绪
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        timeout: float,
+        max_loop_lag: float,
+        require_redis: bool = False,
+    ):
+        self.interval = interval
+        self.timeout = timeout
+        self.max_loop_lag = max_loop_lag
+        self.require_redis = require_redis
+        self._report: dict | None = None
+        self._checked_at = 0.0
+        self._loop_lag = 0.0
+        self._task: asyncio.Task | None = None
+
+    async def probe(self) -> dict:
+        """执行一轮检查并更新缓存的结果"""
+        database, redis = await asyncio.gather(
+            _timed(_ping_database, self.timeout),
+            _timed(redis_client.ping, self.timeout),
+        )
+        redis["circuit_open"] = resilient_redis.degraded
+        loop_ok = self._loop_lag <= self.max_loop_lag
+        checks = {
+            "database": database,
+            "redis": redis,
+            "db_pool": pool_stats(),
+            "event_loop": {"ok": loop_ok, "lag_ms": round(self._loop_lag * 1000, 2)},
+        }
+        for name in ("database", "redis"):
+            READINESS_CHECK_UP.labels(name).set(1 if checks[name]["ok"] else 0)
+            if checks[name]["ok"]:
+                READINESS_CHECK_LATENCY.labels(name).set(
+                    checks[name]["latency_ms"] / 1000
+                )
+        ready = database["ok"] and loop_ok
+        if self.require_redis:
+            ready = ready and redis["ok"]
+        if self._report is not None and ready != self._report["ready"]:
+            log = logger.info if ready else logger.warning
+            log(
+                "就绪状态变更: ready=%s database=%s redis=%s loop_lag=%.1fms",
+                ready,
+                database["ok"],
+                redis["ok"],
+                self._loop_lag * 1000,
+            )
+        self._report = {"ready": ready, "checks": checks}
+        self._checked_at = time.time()
+        return self._report
+
+    def report(self) -> dict:
+        """返回最近一次的检查结果，不触发任何 I/O"""
+        if self._report is None:
+            return {"ready": False, "reason": "探测未运行或尚未完成首次探测"}
+        age = time.time() - self._checked_at
+        report = {
+            **self._report,
+            "checked_at": self._checked_at,
+            "age_s": round(age, 3),
+        }
+        if age > self.interval * 3 + self.timeout:
+            report["ready"] = False
+            report["reason"] = "探测结果已过期"
+        return report
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await self.probe()
+            except Exception as e:
+                logger.error("就绪探测失败: %s", e)
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self._loop_lag = max(loop.time() - expected, 0.0)
+            EVENT_LOOP_LAG.set(self._loop_lag)
+
+    def start(self):
+        """启动后台探测任务（在 lifespan 中调用）"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="readiness-probe")
+
+    async def stop(self):
+        """停止探测；关闭阶段 /ready 立即返回未就绪，负载均衡器不再分配新请求"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._report = None
+
+
+readiness_prober = ReadinessProber(
+    settings.ready_probe_interval,
+    settings.ready_probe_timeout,
+    settings.ready_max_loop_lag_ms / 1000,
+    settings.ready_require_redis,
+)
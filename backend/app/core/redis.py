@@ -1,15 +1,208 @@
 # utils/redis.py
 
-import os
-from dotenv import load_dotenv
+import asyncio
+import logging
+import time
 import redis.asyncio as redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+from core.config import settings
+from core.local_store import LocalStore
+from core.metrics import REDIS_COMMAND_DURATION, registry
+from core.request_context import record_redis
 
-load_dotenv()
+"""
+core.redis 模块
 
-redis_client = redis.Redis(
-    host=os.getenv("REDIS_HOST"),
-    port=int(os.getenv("REDIS_PORT", 6379)),
-    db=int(os.getenv("REDIS_DB", 0)),
-    password=os.getenv("REDIS_PASSWORD", None),
+带连接池、超时、熔断与本地降级的 Redis 访问层。
+
+- redis_client: 底层 Redis 客户端（阻塞式连接池 + 连接/命令超时 + 健康检查），
+  适合需要完整 Redis 能力、且能自行处理失败的调用方。
+- resilient_redis: 对常用命令（get / set / incr / expire / delete）做熔断保护的门面，
+  Redis 连续失败达到阈值后进入降级模式，命令改由进程内 LocalStore 处理，
+  冷却时间过后放行一次探测请求，成功即恢复。限流与角色缓存均通过它访问 Redis。
+"""
+
+logger = logging.getLogger("core.redis")
+
+# 视为 Redis 不可用的异常；命令错误（如 WRONGTYPE）属于调用方问题，不计入熔断
+REDIS_UNAVAILABLE_ERRORS = (
+    RedisConnectionError,
+    RedisTimeoutError,
+    OSError,
+    asyncio.TimeoutError,
+)
+
+REDIS_CIRCUIT_OPEN = registry.gauge(
+    "redis_circuit_open", "Redis 熔断器状态（1 表示已熔断，处于降级模式）"
+)
+REDIS_FALLBACK_CALLS = registry.counter(
+    "redis_fallback_total", "降级到进程内存储处理的 Redis 命令数", ("command",)
+)
+
+
+class InstrumentedRedis(redis.Redis):
+    """
+    记录每条命令执行耗时的 Redis 客户端
+    所有单条命令都经由 execute_command 发出，在此统一计时即可覆盖全部调用。
+    """
+
+    async def execute_command(self, *args, **options):
+        start_time = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            elapsed = time.perf_counter() - start_time
+            REDIS_COMMAND_DURATION.labels(str(args[0]).upper()).observe(elapsed)
+            record_redis(elapsed)
+
+
+class CircuitBreaker:
+    """
+    熔断器：
+    - closed：正常放行；连续失败达到 failure_threshold 次后转为 open。
+    - open：拒绝所有请求；经过 reset_timeout 秒后放行一次探测（half-open）。
+    - 探测成功恢复 closed，失败则重新计时；探测因命令错误或取消而结束时保持 open，
+      下一次请求重新探测（不会一直停留在“探测中”）。
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if not self._probing and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self._probing = True
+            return True
+        return False
+
+    def release_probe(self):
+        """探测请求因其他原因（命令错误、取消）结束：不改变状态，允许下一次探测"""
+        self._probing = False
+
+    def record_success(self):
+        if self.opened_at is not None:
+            logger.warning("Redis 已恢复，退出降级模式")
+            REDIS_CIRCUIT_OPEN.set(0)
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.error(
+                    "Redis 连续失败 %d 次，进入降级模式（%.0f 秒后重试）",
+                    self.failures,
+                    self.reset_timeout,
+                )
+                REDIS_CIRCUIT_OPEN.set(1)
+            self.opened_at = time.monotonic()
+            self._probing = False
+
+
+class ResilientRedis:
+    """
+    带熔断与本地降级的 Redis 门面，接口与 redis.asyncio 客户端的对应命令一致。
+    """
+
+    def __init__(self, client: redis.Redis, breaker: CircuitBreaker, fallback):
+        self.client = client
+        self.breaker = breaker
+        self.fallback = fallback
+
+    @property
+    def degraded(self) -> bool:
+        """是否处于降级模式"""
+        return self.breaker.is_open
+
+    async def _call(self, command: str, *args, **kwargs):
+        if self.breaker.allow():
+            try:
+                result = await getattr(self.client, command)(*args, **kwargs)
+            except REDIS_UNAVAILABLE_ERRORS as e:
+                self.breaker.record_failure()
+                logger.warning("Redis 命令失败，使用本地存储: %s, 错误: %s", command, e)
+            except BaseException:
+                self.breaker.release_probe()
+                raise
+            else:
+                self.breaker.record_success()
+                return result
+        REDIS_FALLBACK_CALLS.labels(command).inc()
+        return await getattr(self.fallback, command)(*args, **kwargs)
+
+    async def get(self, key: str):
+        return await self._call("get", key)
+
+    async def set(self, key: str, value, ex: int | None = None):
+        return await self._call("set", key, value, ex=ex)
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        return await self._call("incr", key, amount)
+
+    async def expire(self, key: str, seconds: int):
+        return await self._call("expire", key, seconds)
+
+    async def delete(self, *keys: str):
+        return await self._call("delete", *keys)
+
+    async def incr_many(self, keys: list[str], ex: int) -> list[int]:
+        """批量 INCR 并设置过期时间，Redis 上通过一次 pipeline 往返完成"""
+        if self.breaker.allow():
+            try:
+                async with self.client.pipeline(transaction=False) as pipe:
+                    for key in keys:
+                        pipe.incr(key)
+                        pipe.expire(key, ex)
+                    results = await pipe.execute()
+            except REDIS_UNAVAILABLE_ERRORS as e:
+                self.breaker.record_failure()
+                logger.warning("Redis 命令失败，使用本地存储: incr_many, 错误: %s", e)
+            except BaseException:
+                self.breaker.release_probe()
+                raise
+            else:
+                self.breaker.record_success()
+                return results[::2]
+        REDIS_FALLBACK_CALLS.labels("incr_many").inc()
+        return await self.fallback.incr_many(keys, ex)
+
+
+connection_pool = redis.BlockingConnectionPool(
+    host=settings.redis_host,
+    port=settings.redis_port,
+    db=settings.redis_db,
+    password=settings.redis_password,
     decode_responses=True,
+    max_connections=settings.redis_max_connections,
+    timeout=settings.redis_pool_timeout,  # 等待空闲连接的最长时间
+    socket_connect_timeout=settings.redis_connect_timeout,
+    socket_timeout=settings.redis_socket_timeout,
+    health_check_interval=settings.redis_health_check_interval,
 )
+
+redis_client = InstrumentedRedis(connection_pool=connection_pool)
+
+resilient_redis = ResilientRedis(
+    redis_client,
+    CircuitBreaker(
+        settings.redis_breaker_threshold, settings.redis_breaker_reset_timeout
+    ),
+    LocalStore(),
+)
+
+
+def get_redis() -> ResilientRedis:
+    """FastAPI 依赖：获取带熔断降级的 Redis 门面"""
+    return resilient_redis
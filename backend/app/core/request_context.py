@@ -0,0 +1,69 @@
+from contextvars import ContextVar
+from typing import Optional
+
+"""
+core.request_context 模块
+
+请求级别的性能统计上下文，基于 contextvars 在同一请求内共享：
+- SQL 语句执行次数与累计耗时（由 db.connector 的游标事件写入）
+- Redis 命令调用次数与累计耗时（由 core.redis 的客户端写入）
+
+AccessLogMiddleware 在请求开始时创建统计对象，结束时输出到 Server-Timing 响应头与访问日志。
+请求之外（如启动阶段、后台任务）没有统计对象，记录函数直接忽略。
+"""
+
+
+class RequestStats:
+    """单个请求的 SQL / Redis 调用统计"""
+
+    __slots__ = ("sql_count", "sql_time", "redis_count", "redis_time")
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_time = 0.0  # 秒
+        self.redis_count = 0
+        self.redis_time = 0.0  # 秒
+
+    def server_timing(self, total_time: float) -> str:
+        """
+        生成 Server-Timing 响应头的值（耗时单位为毫秒）。
+
+        示例:
+            db;dur=3.21;desc="5 queries", redis;dur=0.84;desc="2 calls", app;dur=12.50
+        """
+        return (
+            f'db;dur={self.sql_time * 1000:.2f};desc="{self.sql_count} queries", '
+            f'redis;dur={self.redis_time * 1000:.2f};desc="{self.redis_count} calls", '
+            f"app;dur={total_time * 1000:.2f}"
+        )
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def start_request_stats() -> RequestStats:
+    """为当前请求创建并绑定新的统计对象"""
+    stats = RequestStats()
+    _request_stats.set(stats)
+    return stats
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """获取当前请求的统计对象，不在请求上下文中时返回 None"""
+    return _request_stats.get()
+
+
+def record_sql(elapsed: float):
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.sql_count += 1
+        stats.sql_time += elapsed
+
+
+def record_redis(elapsed: float):
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.redis_count += 1
+        stats.redis_time += elapsed
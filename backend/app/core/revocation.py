@@ -0,0 +1,199 @@
+import asyncio
+import logging
+import time
+from core.config import settings
+from core.metrics import registry
+from core.redis import REDIS_UNAVAILABLE_ERRORS, redis_client
+
+"""
+core.revocation 模块
+
+访问令牌吊销列表。
+
+访问令牌是无状态 JWT，签发后在 exp 之前一直有效。为了在退出登录、禁用账户后
+尽快让令牌失效、又不给每个请求增加一次 Redis 往返，吊销状态在每个 worker 内存中保存一份：
+
+- 单个令牌吊销：记录 jti → exp，令牌过期后自动清理。
+- 用户级吊销：记录 uid → revoked_before，iat 早于该时间的令牌全部失效（退出全部设备、禁用账户）。
+- verify_access_token 只查内存（两次字典查找），没有任何网络开销。
+
+同步方式:
+    - 吊销时写入 Redis（revoked:jti 有序集合、revoked:users 哈希）并 PUBLISH 到 revocation 频道，
+      各 worker 订阅该频道，通常在毫秒级（最迟约 1 秒）内生效。
+    - pub/sub 不保证送达，后台任务每 REVOCATION_RESYNC_INTERVAL 秒从 Redis 全量合并一次，
+      断线重连后也会立即合并。
+
+说明:
+    条目在对应访问令牌的最长有效期（ACCESS_TOKEN_EXPIRE_MINUTES）之后即可丢弃，
+    内存中的集合规模只与“有效期内被吊销的令牌数”相关，使用精确集合即可，无需布隆过滤器。
+"""
+
+logger = logging.getLogger("core.revocation")
+
+REVOKED_JTI_KEY = "revoked:jti"
+REVOKED_USERS_KEY = "revoked:users"
+REVOCATION_CHANNEL = "revocation"
+
+REVOKED_TOKENS = registry.gauge(
+    "auth_revoked_tokens", "当前 worker 内存中的吊销条目数", ("kind",)
+)
+
+
+class RevocationList:
+    """
+    进程内的访问令牌吊销列表
+
+    参数:
+        client: redis.asyncio 客户端
+        token_ttl (int): 访问令牌最长有效期（秒），用于清理过期的用户级吊销记录
+        resync_interval (float): 从 Redis 全量合并的间隔（秒）
+    """
+
+    def __init__(self, client, token_ttl: int, resync_interval: float):
+        self.client = client
+        self.token_ttl = token_ttl
+        self.resync_interval = resync_interval
+        self._jtis: dict[str, float] = {}
+        self._users: dict[str, float] = {}
+        self._task: asyncio.Task | None = None
+
+    # ---- 查询（请求热路径，纯内存） ----
+
+    def is_revoked(self, payload: dict) -> bool:
+        """判断已解码的访问令牌是否被吊销"""
+        jti = payload.get("jti")
+        if jti is not None and jti in self._jtis:
+            return True
+        revoked_before = self._users.get(payload.get("uuid"))
+        if revoked_before is not None and payload.get("iat", 0) < revoked_before:
+            return True
+        return False
+
+    # ---- 本地状态 ----
+
+    def _add_jti(self, jti: str, exp: float):
+        if exp > time.time():
+            self._jtis[jti] = exp
+
+    def _add_user(self, user_uuid: str, revoked_before: float):
+        if revoked_before > self._users.get(user_uuid, 0):
+            self._users[user_uuid] = revoked_before
+
+    def prune(self):
+        """清理已过期的条目"""
+        now = time.time()
+        self._jtis = {jti: exp for jti, exp in self._jtis.items() if exp > now}
+        horizon = now - self.token_ttl
+        self._users = {uid: ts for uid, ts in self._users.items() if ts > horizon}
+        REVOKED_TOKENS.labels("jti").set(len(self._jtis))
+        REVOKED_TOKENS.labels("user").set(len(self._users))
+
+    def _apply(self, message: str):
+        kind, key, value = message.split(" ", 2)
+        if kind == "jti":
+            self._add_jti(key, float(value))
+        elif kind == "user":
+            self._add_user(key, float(value))
+
+    # ---- 吊销（写 Redis 并广播） ----
+
+    async def _publish(self, write, message: str):
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                write(pipe)
+                pipe.publish(REVOCATION_CHANNEL, message)
+                await pipe.execute()
+        except REDIS_UNAVAILABLE_ERRORS as e:
+            # 本 worker 已生效；其他 worker 要等 Redis 恢复、本进程重新写入后才能同步
+            logger.error("吊销记录写入 Redis 失败，仅在当前进程生效: %s", e)
+
+    async def revoke_token(self, jti: str, exp: float):
+        """吊销单个访问令牌"""
+        self._add_jti(jti, exp)
+        await self._publish(
+            lambda pipe: pipe.zadd(REVOKED_JTI_KEY, {jti: exp}), f"jti {jti} {exp}"
+        )
+
+    async def revoke_user(self, user_uuid: str):
+        """吊销用户在此刻之前签发的全部访问令牌"""
+        revoked_before = time.time()
+        self._add_user(user_uuid, revoked_before)
+        await self._publish(
+            lambda pipe: pipe.hset(REVOKED_USERS_KEY, user_uuid, revoked_before),
+            f"user {user_uuid} {revoked_before}",
+        )
+        logger.info("已吊销用户全部访问令牌: %s", user_uuid)
+
+    # ---- 同步 ----
+
+    async def resync(self):
+        """从 Redis 全量合并吊销记录，并清理 Redis 与本地的过期条目"""
+        now = time.time()
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.zremrangebyscore(REVOKED_JTI_KEY, "-inf", now)
+            pipe.zrangebyscore(REVOKED_JTI_KEY, now, "+inf", withscores=True)
+            pipe.hgetall(REVOKED_USERS_KEY)
+            _, jtis, users = await pipe.execute()
+        for jti, exp in jtis:
+            self._add_jti(jti, exp)
+        horizon = now - self.token_ttl
+        stale = []
+        for user_uuid, revoked_before in users.items():
+            revoked_before = float(revoked_before)
+            if revoked_before > horizon:
+                self._add_user(user_uuid, revoked_before)
+            else:
+                stale.append(user_uuid)
+        if stale:
+            await self.client.hdel(REVOKED_USERS_KEY, *stale)
+        self.prune()
+
+    async def _run(self):
+        backoff = 1
+        while True:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(REVOCATION_CHANNEL)
+                # 订阅建立后再全量合并，避免两者之间的消息丢失
+                await self.resync()
+                backoff = 1
+                next_resync = time.monotonic() + self.resync_interval
+                while True:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self._apply(message["data"])
+                    if time.monotonic() >= next_resync:
+                        await self.resync()
+                        next_resync = time.monotonic() + self.resync_interval
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("吊销列表同步中断，%d 秒后重连: %s", backoff, e)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    def start(self):
+        """启动订阅与定期合并任务（在 lifespan 中调用）"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="revocation-sync")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+revocation_list = RevocationList(
+    redis_client,
+    settings.access_token_expire_minutes * 60,
+    settings.revocation_resync_interval,
+)
@@ -0,0 +1,171 @@
+import asyncio
+import importlib.util
+import logging
+import os
+import random
+import sys
+from uvicorn import Config, Server
+from uvicorn.main import STARTUP_FAILURE
+from uvicorn.supervisors import ChangeReload, Multiprocess
+from core.config import Settings, settings
+
+"""
+core.server 模块
+
+生产环境启动器：基于 uvicorn 的多进程部署。
+
+- worker 数量由 APP_WORKERS 指定，0 表示按 CPU 核数启动，充分利用多核。
+- 事件循环与 HTTP 解析器：auto 时优先选用 uvloop / httptools（需安装可选依赖
+  `pip install edupilot[speed]`），未安装或平台不支持（uvloop 不支持 Windows）时回退到
+  asyncio / h11；显式指定但未安装时直接报错，避免静默降级。
+- APP_MAX_REQUESTS > 0 时 worker 处理完 N 个请求后平滑退出，由主进程自动拉起新 worker，
+  用于回收长期运行积累的内存碎片；每个 worker 的阈值额外加上 [0, APP_MAX_REQUESTS_JITTER]
+  内的随机数，避免负载均匀时所有 worker 同时重启。
+- APP_RELOAD 开启时为开发模式，强制单进程（uvicorn 不支持 reload 与多 worker 同时使用）。
+- DB_AUTO_MIGRATE 开启时，在拉起 worker 之前于主进程执行一次表结构迁移（db.migrate），
+  worker 自身不做任何建表或结构变更。
+
+用法:
+    python app.py
+"""
+
+logger = logging.getLogger("core.server")
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def resolve_loop(choice: str) -> str:
+    """解析事件循环实现：auto / uvloop / asyncio"""
+    choice = choice.lower()
+    uvloop_supported = sys.platform != "win32" and _installed("uvloop")
+    if choice == "auto":
+        return "uvloop" if uvloop_supported else "asyncio"
+    if choice == "uvloop" and not uvloop_supported:
+        raise RuntimeError("APP_LOOP=uvloop 但当前环境未安装 uvloop 或平台不支持")
+    if choice not in ("uvloop", "asyncio"):
+        raise ValueError(f"不支持的 APP_LOOP: {choice}")
+    return choice
+
+
+def resolve_http(choice: str) -> str:
+    """解析 HTTP 协议解析器实现：auto / httptools / h11"""
+    choice = choice.lower()
+    if choice == "auto":
+        return "httptools" if _installed("httptools") else "h11"
+    if choice == "httptools" and not _installed("httptools"):
+        raise RuntimeError("APP_HTTP=httptools 但当前环境未安装 httptools")
+    if choice not in ("httptools", "h11"):
+        raise ValueError(f"不支持的 APP_HTTP: {choice}")
+    return choice
+
+
+def resolve_workers(config: Settings) -> int:
+    """解析 worker 数量，reload 模式下固定为 1"""
+    if config.app_reload:
+        return 1
+    if config.app_workers > 0:
+        return config.app_workers
+    return os.cpu_count() or 1
+
+
+class JitteredConfig(Config):
+    """
+    worker 回收阈值带随机抖动的 uvicorn 配置（uvicorn 本身不支持 max-requests jitter）
+
+    多 worker 时配置随子进程一起序列化，每个 worker 进程（包括被回收后重新拉起的）
+    首次读取 limit_max_requests 时各自取一次 [0, max_requests_jitter] 内的随机偏移。
+    """
+
+    def __init__(self, app, max_requests_jitter: int = 0, **kwargs):
+        self.max_requests_jitter = max_requests_jitter
+        self._jitter_pid: int | None = None
+        self._jitter = 0
+        super().__init__(app, **kwargs)
+
+    @property
+    def limit_max_requests(self) -> int | None:
+        if self._limit_max_requests is None:
+            return None
+        if self._jitter_pid != os.getpid():
+            self._jitter_pid = os.getpid()
+            self._jitter = random.randint(0, self.max_requests_jitter)
+        return self._limit_max_requests + self._jitter
+
+    @limit_max_requests.setter
+    def limit_max_requests(self, value: int | None):
+        self._limit_max_requests = value
+
+
+def build_options(config: Settings = settings) -> dict:
+    """根据配置生成 uvicorn.run 的参数"""
+    options = {
+        "host": config.app_host,
+        "port": config.app_port,
+        "loop": resolve_loop(config.app_loop),
+        "http": resolve_http(config.app_http),
+        "timeout_keep_alive": config.app_keepalive,
+        "backlog": config.app_backlog,
+        "timeout_graceful_shutdown": config.app_graceful_timeout,
+        "proxy_headers": config.app_proxy_headers,
+        "server_header": False,
+        "log_level": config.log_level.lower(),
+    }
+    if config.app_max_requests > 0:
+        options["limit_max_requests"] = config.app_max_requests
+        options["max_requests_jitter"] = config.app_max_requests_jitter
+    if config.app_reload:
+        options["reload"] = True
+        options["reload_excludes"] = ["**/logs/*", "**/*.log"]
+    else:
+        options["workers"] = resolve_workers(config)
+    return options
+
+
+def serve(app: str, options: dict):
+    """
+    按 uvicorn.run 的流程启动服务，区别只在于使用 JitteredConfig
+
+    异常:
+        SystemExit: 单进程模式下服务未能启动
+    """
+    config = JitteredConfig(app, **options)
+    server = Server(config=config)
+    try:
+        if config.should_reload:
+            sock = config.bind_socket()
+            ChangeReload(config, target=server.run, sockets=[sock]).run()
+        elif config.workers > 1:
+            sock = config.bind_socket()
+            Multiprocess(config, target=server.run, sockets=[sock]).run()
+        else:
+            server.run()
+    except KeyboardInterrupt:
+        pass
+    if not server.started and not config.should_reload and config.workers == 1:
+        sys.exit(STARTUP_FAILURE)
+
+
+def run(app: str = "app:app", config: Settings = settings):
+    """启动 uvicorn（多 worker 时由 uvicorn 主进程负责拉起与回收子进程）"""
+    from core.logger import setup_logging
+
+    options = build_options(config)
+    setup_logging()
+    if config.db_auto_migrate:
+        from db.migrate import run_migrations
+
+        asyncio.run(run_migrations(config.database_url))
+    logger.info(
+        "启动服务 %s:%s workers=%s loop=%s http=%s reload=%s max_requests=%s(+%s)",
+        options["host"],
+        options["port"],
+        options.get("workers", 1),
+        options["loop"],
+        options["http"],
+        options.get("reload", False),
+        options.get("limit_max_requests", 0),
+        options.get("max_requests_jitter", 0),
+    )
+    serve(app, options)
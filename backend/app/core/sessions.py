@@ -0,0 +1,282 @@
+import logging
+import secrets
+import time
+from typing import Optional
+from core import exceptions
+from core.redis import REDIS_UNAVAILABLE_ERRORS, redis_client
+
+"""
+core.sessions 模块
+
+基于 Redis 的刷新令牌会话存储。
+
+每次登录创建一个会话（sid），刷新令牌中携带 sid 与本次令牌的 jti：
+- 轮换：每次刷新都签发新的 jti，旧 jti 立即作废（Lua 脚本内比较并替换，原子执行）。
+- 重用检测：已作废的 jti 再次出现说明刷新令牌可能被盗用，整个会话立即吊销。
+  轮换后 REFRESH_REUSE_GRACE 秒内的旧 jti 视为客户端并发刷新，只拒绝、不吊销。
+- 全部下线：每个用户有一个代数计数器（generation），会话记录创建时的代数，
+  INCR 代数即可让该用户的全部会话失效，无需逐个删除，复杂度 O(1)。
+- 元数据缓存：用户的基础信息（登录响应中的 user 字段）缓存在 sess:meta:{uid}，
+  刷新时与会话校验在同一个脚本中读取，常规情况下一次 Redis 往返即可完成刷新。
+
+键结构:
+    sess:{sid}          hash   uid / jti / prev / gen / created / last_used / rotated_at / ip / ua
+    sess:user:{uid}     set    用户的会话 sid 列表（用于会话管理页面）
+    sess:gen:{uid}      string 用户当前代数
+    sess:meta:{uid}     string 用户信息 JSON
+
+Redis 不可用时抛出 ServiceUnavailable，不做本地降级（会话状态必须全局一致）。
+"""
+
+logger = logging.getLogger("core.sessions")
+
+# 轮换后旧 jti 的并发容忍窗口（秒）
+REFRESH_REUSE_GRACE = 10
+
+_CREATE_SCRIPT = """
+local gen = redis.call('GET', KEYS[2]) or '0'
+redis.call('HSET', KEYS[1],
+    'uid', ARGV[1], 'jti', ARGV[2], 'gen', gen,
+    'created', ARGV[3], 'last_used', ARGV[3], 'ip', ARGV[5], 'ua', ARGV[6])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('SADD', KEYS[3], ARGV[7])
+redis.call('EXPIRE', KEYS[3], ARGV[4])
+if ARGV[8] ~= '' then
+    redis.call('SET', KEYS[4], ARGV[8], 'EX', ARGV[4])
+end
+return gen
+"""
+
+_ROTATE_SCRIPT = """
+local s = redis.call('HMGET', KEYS[1], 'uid', 'jti', 'gen', 'prev', 'rotated_at')
+if not s[1] or s[1] ~= ARGV[1] then
+    return {'missing'}
+end
+local gen = tonumber(redis.call('GET', KEYS[2]) or '0')
+if tonumber(s[3]) < gen then
+    redis.call('DEL', KEYS[1])
+    return {'revoked'}
+end
+if s[2] ~= ARGV[2] then
+    if s[4] == ARGV[2] and tonumber(ARGV[4]) - tonumber(s[5]) <= tonumber(ARGV[6]) then
+        return {'race'}
+    end
+    redis.call('DEL', KEYS[1])
+    redis.call('SREM', KEYS[3], ARGV[7])
+    return {'reuse'}
+end
+redis.call('HSET', KEYS[1], 'jti', ARGV[3], 'prev', ARGV[2],
+    'rotated_at', ARGV[4], 'last_used', ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+redis.call('EXPIRE', KEYS[3], ARGV[5])
+local meta = redis.call('GET', KEYS[4])
+if meta then
+    redis.call('EXPIRE', KEYS[4], ARGV[5])
+end
+return {'ok', meta}
+"""
+
+_REVOKE_SCRIPT = """
+redis.call('SREM', KEYS[2], ARGV[2])
+if redis.call('HGET', KEYS[1], 'uid') == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _session_key(sid: str) -> str:
+    return f"sess:{sid}"
+
+
+def _user_key(user_uuid: str) -> str:
+    return f"sess:user:{user_uuid}"
+
+
+def _gen_key(user_uuid: str) -> str:
+    return f"sess:gen:{user_uuid}"
+
+
+def _meta_key(user_uuid: str) -> str:
+    return f"sess:meta:{user_uuid}"
+
+
+def new_token_id() -> str:
+    """生成会话 ID / 令牌 ID"""
+    return secrets.token_urlsafe(16)
+
+
+class SessionStore:
+    """
+    刷新令牌会话存储
+
+    参数:
+        client: redis.asyncio 客户端（需支持 Lua 脚本与 pipeline）
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self._create = client.register_script(_CREATE_SCRIPT)
+        self._rotate = client.register_script(_ROTATE_SCRIPT)
+        self._revoke = client.register_script(_REVOKE_SCRIPT)
+
+    async def create(
+        self,
+        user_uuid: str,
+        ttl: int,
+        user_meta: str = "",
+        ip: str = "",
+        user_agent: str = "",
+    ) -> tuple[str, str]:
+        """
+        创建会话，返回 (sid, jti)。
+
+        参数:
+            user_uuid (str): 用户 UUID
+            ttl (int): 会话有效期（秒），与刷新令牌一致
+            user_meta (str): 缓存的用户信息 JSON，为空则不缓存
+            ip / user_agent (str): 会话来源，用于会话列表展示
+
+        异常:
+            ServiceUnavailable: Redis 不可用
+        """
+        sid, jti = new_token_id(), new_token_id()
+        try:
+            await self._create(
+                keys=[
+                    _session_key(sid),
+                    _gen_key(user_uuid),
+                    _user_key(user_uuid),
+                    _meta_key(user_uuid),
+                ],
+                args=[
+                    user_uuid,
+                    jti,
+                    int(time.time()),
+                    ttl,
+                    ip,
+                    user_agent[:200],
+                    sid,
+                    user_meta,
+                ],
+            )
+        except REDIS_UNAVAILABLE_ERRORS as e:
+            logger.error("创建会话失败，Redis 不可用: %s", e)
+            raise exceptions.ServiceUnavailable("会话服务暂不可用") from e
+        return sid, jti
+
+    async def rotate(
+        self, user_uuid: str, sid: str, jti: str, ttl: int
+    ) -> tuple[str, Optional[str]]:
+        """
+        校验并轮换刷新令牌，返回 (新 jti, 缓存的用户信息 JSON 或 None)。
+
+        异常:
+            InvalidVerifyToken: 会话不存在、已吊销、或检测到令牌重用
+            ServiceUnavailable: Redis 不可用
+        """
+        new_jti = new_token_id()
+        try:
+            result = await self._rotate(
+                keys=[
+                    _session_key(sid),
+                    _gen_key(user_uuid),
+                    _user_key(user_uuid),
+                    _meta_key(user_uuid),
+                ],
+                args=[
+                    user_uuid,
+                    jti,
+                    new_jti,
+                    int(time.time()),
+                    ttl,
+                    REFRESH_REUSE_GRACE,
+                    sid,
+                ],
+            )
+        except REDIS_UNAVAILABLE_ERRORS as e:
+            logger.error("刷新会话失败，Redis 不可用: %s", e)
+            raise exceptions.ServiceUnavailable("会话服务暂不可用") from e
+
+        status = result[0]
+        if status == "ok":
+            return new_jti, result[1] if len(result) > 1 else None
+        if status == "reuse":
+            logger.warning("检测到刷新令牌重用，已吊销会话: uuid=%s sid=%s", user_uuid, sid)
+            raise exceptions.InvalidVerifyToken("刷新令牌已失效")
+        if status == "race":
+            raise exceptions.InvalidVerifyToken("刷新令牌已轮换")
+        raise exceptions.InvalidVerifyToken("会话不存在或已吊销")
+
+    async def cache_user(self, user_uuid: str, user_meta: str, ttl: int):
+        """更新缓存的用户信息（刷新时缓存未命中后回填）"""
+        try:
+            await self.client.set(_meta_key(user_uuid), user_meta, ex=ttl)
+        except REDIS_UNAVAILABLE_ERRORS as e:
+            logger.warning("缓存用户信息失败: %s", e)
+
+    async def invalidate_user(self, user_uuid: str):
+        """用户信息变更后清除缓存，下次刷新时从数据库重新加载"""
+        try:
+            await self.client.delete(_meta_key(user_uuid))
+        except REDIS_UNAVAILABLE_ERRORS as e:
+            logger.warning("清除用户信息缓存失败: %s", e)
+
+    async def revoke(self, user_uuid: str, sid: str):
+        """吊销单个会话（只能吊销属于该用户的会话）"""
+        try:
+            await self._revoke(
+                keys=[_session_key(sid), _user_key(user_uuid)], args=[user_uuid, sid]
+            )
+        except REDIS_UNAVAILABLE_ERRORS as e:
+            logger.error("吊销会话失败: %s", e)
+            raise exceptions.ServiceUnavailable("会话服务暂不可用") from e
+
+    async def revoke_all(self, user_uuid: str):
+        """吊销用户的全部会话：代数加一，旧代数的会话在下次使用时被判定失效"""
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.incr(_gen_key(user_uuid))
+                pipe.delete(_user_key(user_uuid), _meta_key(user_uuid))
+                await pipe.execute()
+        except REDIS_UNAVAILABLE_ERRORS as e:
+            logger.error("吊销全部会话失败: %s", e)
+            raise exceptions.ServiceUnavailable("会话服务暂不可用") from e
+        logger.info("已吊销用户全部会话: %s", user_uuid)
+
+    async def list(self, user_uuid: str) -> list[dict]:
+        """列出用户当前有效的会话（顺带清理已过期或已吊销的 sid）"""
+        try:
+            sids = await self.client.smembers(_user_key(user_uuid))
+            if not sids:
+                return []
+            sids = sorted(sids)
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.get(_gen_key(user_uuid))
+                for sid in sids:
+                    pipe.hgetall(_session_key(sid))
+                gen, *records = await pipe.execute()
+            gen = int(gen or 0)
+            sessions, stale = [], []
+            for sid, record in zip(sids, records):
+                if not record or int(record.get("gen", 0)) < gen:
+                    stale.append(sid)
+                    continue
+                sessions.append(
+                    {
+                        "sid": sid,
+                        "created": int(record["created"]),
+                        "last_used": int(record["last_used"]),
+                        "ip": record.get("ip") or None,
+                        "user_agent": record.get("ua") or None,
+                    }
+                )
+            if stale:
+                await self.client.srem(_user_key(user_uuid), *stale)
+        except REDIS_UNAVAILABLE_ERRORS as e:
+            logger.error("查询会话列表失败: %s", e)
+            raise exceptions.ServiceUnavailable("会话服务暂不可用") from e
+        return sorted(sessions, key=lambda s: s["last_used"], reverse=True)
+
+
+session_store = SessionStore(redis_client)
@@ -18,3 +18,4 @@ class ErrorCode(int, Enum):
     RESOURCE_NOT_FOUND = 1004  # 资源不存在
     INTERNAL_SERVER_ERROR = 1005  # 系统内部错误
     TOO_MANY_REQUESTS = 1006  # 请求次数过多
+    SERVICE_UNAVAILABLE = 1007  # 依赖服务暂不可用
@@ -1,16 +1,23 @@
 import logging
-import os
 import time
 from typing import AsyncGenerator
-from dotenv import load_dotenv
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy import event, text
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from core.config import settings
+from core.metrics import DB_POOL_CHECKOUT_WAIT, SQL_QUERY_DURATION
+from core.request_context import record_sql
+from db.slow_query import slow_query_log
 
 logger = logging.getLogger("db.connector")
 Base = declarative_base()
-load_dotenv()
 
 
 # SQL 执行前事件
@@ -23,29 +30,163 @@ def before_cursor_execute(conn, cursor, statement, parameters, context, executem
 @event.listens_for(Engine, "after_cursor_execute")
 def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
     start_time = conn.info["query_start_time"].pop(-1)
-    total = (time.time() - start_time) * 1000
-    logger.debug("SQL 执行时间: %.2fms", total)
+    elapsed = time.time() - start_time
+    SQL_QUERY_DURATION.observe(elapsed)
+    record_sql(elapsed)
+    slow_query_log.record(statement, elapsed)
+    logger.debug("SQL 执行时间: %.2fms", elapsed * 1000)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    记录连接获取等待耗时的连接池
+    SQLAlchemy 只提供获取成功后的 checkout 事件，无法得知等待时间，因此在 _do_get 外层计时。
+    """
+
+    def _do_get(self):
+        start_time = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start_time)
+
+
+# 连接池日志器名称取自子类所在模块，不再受 sqlalchemy 根日志器的 WARN 级别约束，这里保持一致
+logging.getLogger(f"{__name__}.{InstrumentedQueuePool.__name__}").setLevel(
+    logging.WARNING
+)
+
+
+class LazySession:
+    """
+    按需创建 AsyncSession 的会话代理
+
+    - 首次访问任意会话属性（execute / add / commit 等）时才创建底层 AsyncSession，
+      被限流、令牌校验失败或命中缓存的请求不会创建会话，也不会占用连接池。
+    - release() 关闭当前会话并归还连接，之后再次使用会自动创建新会话，
+      适合在身份加载完成、进入下一段数据库操作之前尽早释放连接。
+    - 其余属性与方法全部透传给底层 AsyncSession，服务层无需任何改动。
+    """
+
+    def __init__(self, factory: async_sessionmaker):
+        self._factory = factory
+        self._session: AsyncSession | None = None
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._factory()
+        return self._session
+
+    @property
+    def active(self) -> bool:
+        """是否已创建底层会话"""
+        return self._session is not None
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+    async def release(self):
+        """关闭底层会话并归还连接（会话中的对象变为 detached，已加载的属性仍可读取）"""
+        if self._session is not None:
+            session, self._session = self._session, None
+            await session.close()
+
+
+def _pool_options() -> dict:
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+
+
+def sqlite_profile(url: URL) -> tuple[URL, dict]:
+    """SQLite（aiosqlite）：默认后端，适合开发与单机部署"""
+    options = {"connect_args": {"check_same_thread": False}}
+    # 内存数据库使用 StaticPool，仅文件数据库替换为可统计等待耗时的连接池
+    if url.database not in (None, "", ":memory:"):
+        options.update(_pool_options())
+    return url, options
+
+
+def postgresql_profile(url: URL) -> tuple[URL, dict]:
+    """
+    PostgreSQL（asyncpg）：多 worker / 多实例部署
+
+    - postgresql:// 与 postgresql+asyncpg:// 均可，统一使用 asyncpg 驱动
+    - 连接池预检（pool_pre_ping）与定期回收，避免使用已被服务端断开的连接
+    - 预编译语句缓存（prepared_statement_cache_size），URL 中已指定时以 URL 为准
+    """
+    url = url.set(drivername="postgresql+asyncpg")
+    if "prepared_statement_cache_size" not in url.query:
+        url = url.update_query_dict(
+            {"prepared_statement_cache_size": str(settings.db_statement_cache_size)}
+        )
+    connect_args = {
+        "timeout": settings.db_connect_timeout,
+        "command_timeout": settings.db_command_timeout,
+        "server_settings": {"application_name": "edupilot"},
+    }
+    if settings.db_statement_cache_size == 0:
+        # pgbouncer 事务池模式下同时关闭 asyncpg 自身的语句缓存
+        connect_args["statement_cache_size"] = 0
+    options = {
+        "connect_args": connect_args,
+        "pool_pre_ping": True,
+        **_pool_options(),
+    }
+    return url, options
+
+
+def generic_profile(url: URL) -> tuple[URL, dict]:
+    """其他后端：只使用统一的连接池配置"""
+    return url, _pool_options()
+
+
+BACKEND_PROFILES = {
+    "sqlite": sqlite_profile,
+    "postgresql": postgresql_profile,
+}
+
+
+def build_engine(database_url: str) -> tuple[str, AsyncEngine]:
+    """按 BACKEND_PROFILES 创建异步引擎，返回 (后端名称, 引擎)"""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    profile = BACKEND_PROFILES.get(backend, generic_profile)
+    url, engine_options = profile(url)
+    logger.info("数据库后端: %s（驱动 %s）", backend, url.get_driver_name())
+    return backend, create_async_engine(url, **engine_options)
 
 
 class DatabaseConnector:
     """
     数据库连接器类
     用于创建异步数据库引擎和会话工厂，并提供数据库连接和会话管理功能。
+
+    后端由 DATABASE_URL 决定（默认 SQLite + aiosqlite），
+    各后端的驱动参数与连接池配置见 BACKEND_PROFILES。
     """
 
-    DATABASE_URL = os.getenv("DATABASE_URL")  # 使用 aiosqlite 作为异步 SQLite 驱动
+    DATABASE_URL = settings.database_url
 
     @classmethod
     async def initialize(cls):
-        """初始化数据库引擎和会话工厂"""
-        cls.engine = create_async_engine(
-            cls.DATABASE_URL, connect_args={"check_same_thread": False}  # SQLite 特性
-        )
+        """
+        初始化数据库引擎和会话工厂
+
+        每个 worker 都会执行，因此这里不做任何建表或结构变更；
+        表结构由 db.migrate 在启动 worker 之前执行一次（见 core.server）。
+        """
+        cls.backend, cls.engine = build_engine(cls.DATABASE_URL)
         cls.async_session = async_sessionmaker(
             autocommit=False, autoflush=False, bind=cls.engine
         )
-        # 设置 WAL 模式
-        await cls.set_wal_mode()
+        if cls.backend == "sqlite":
+            await cls.set_wal_mode()
 
     @classmethod
     async def set_wal_mode(cls):
@@ -62,3 +203,15 @@ class DatabaseConnector:
         """
         async with cls.async_session() as session:
             yield session
+
+    @classmethod
+    async def get_lazy_db(cls) -> AsyncGenerator[LazySession, None]:
+        """
+        惰性数据库会话获取函数
+        只有真正执行数据库操作时才创建会话、从连接池获取连接，请求结束时释放。
+        """
+        db = LazySession(cls.async_session)
+        try:
+            yield db
+        finally:
+            await db.release()
@@ -0,0 +1,45 @@
+from sqlalchemy.exc import IntegrityError
+
+"""
+db.errors 模块
+
+与数据库后端无关的错误识别。
+
+不同驱动对同一类约束错误的描述各不相同（SQLite 为 "UNIQUE constraint failed: ..."，
+PostgreSQL 为 SQLSTATE 23505），服务层统一通过这里的函数判断，不再匹配错误信息字符串。
+"""
+
+# PostgreSQL SQLSTATE（asyncpg 适配层会把它放在异常的 sqlstate / pgcode 属性上）
+PG_UNIQUE_VIOLATION = "23505"
+PG_FOREIGN_KEY_VIOLATION = "23503"
+
+# SQLite 扩展错误码名称（Python 3.11+ 的 sqlite3 异常提供 sqlite_errorname）
+SQLITE_UNIQUE_ERRORS = ("SQLITE_CONSTRAINT_UNIQUE", "SQLITE_CONSTRAINT_PRIMARYKEY")
+SQLITE_FOREIGN_KEY_ERRORS = ("SQLITE_CONSTRAINT_FOREIGNKEY",)
+
+
+def _sqlstate(orig) -> str | None:
+    return getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+
+
+def is_unique_violation(error: IntegrityError) -> bool:
+    """是否为唯一约束（含主键）冲突"""
+    orig = error.orig
+    if _sqlstate(orig) == PG_UNIQUE_VIOLATION:
+        return True
+    errorname = getattr(orig, "sqlite_errorname", None)
+    if errorname is not None:
+        return errorname in SQLITE_UNIQUE_ERRORS
+    # 旧版本 sqlite3 没有错误码名称，只能退回到错误信息匹配
+    return "UNIQUE constraint failed" in str(orig)
+
+
+def is_foreign_key_violation(error: IntegrityError) -> bool:
+    """是否为外键约束冲突"""
+    orig = error.orig
+    if _sqlstate(orig) == PG_FOREIGN_KEY_VIOLATION:
+        return True
+    errorname = getattr(orig, "sqlite_errorname", None)
+    if errorname is not None:
+        return errorname in SQLITE_FOREIGN_KEY_ERRORS
+    return "FOREIGN KEY constraint failed" in str(orig)
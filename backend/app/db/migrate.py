@@ -0,0 +1,139 @@
+import asyncio
+import logging
+from sqlalchemy import DateTime, inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.schema import CreateColumn
+from core.config import settings
+from db.connector import Base, build_engine
+import models.attachment  # noqa: F401  导入全部模型，注册到 Base.metadata
+import models.class_model  # noqa: F401
+import models.job  # noqa: F401
+import models.notification  # noqa: F401
+import models.user  # noqa: F401
+
+"""
+db.migrate 模块
+
+表结构迁移：把数据库升级到当前模型定义，可重复执行（已是最新结构时不做任何修改）。
+
+- 新增的表（连同索引）直接创建；
+- 已有表中缺少的列以 ALTER TABLE ADD COLUMN 补齐（只支持可为空或带 server_default 的列，
+  其余情况报错，需要手动迁移）；
+- 已有表中缺少的索引按模型定义创建；
+- PostgreSQL 上把模型声明为 DateTime(timezone=True)、库中仍是 timestamp 的列转换为
+  timestamptz，原有值按 UTC 解释（SQLite 不保存时区，无需转换）。
+
+执行时机:
+    不在 worker 中执行（多个 worker 并发建表、建索引会相互冲突）。
+    core.server 在启动 worker 之前于主进程执行一次（DB_AUTO_MIGRATE 控制），
+    也可以作为独立的部署步骤执行：python -m db.migrate
+    PostgreSQL 上迁移在事务内持有 advisory lock，多个实例同时启动时依次执行。
+"""
+
+logger = logging.getLogger("db.migrate")
+
+# pg_advisory_xact_lock 的锁 ID（任意固定值，只需在本应用内唯一）
+PG_MIGRATION_LOCK_ID = 7_340_021
+
+
+def _add_column(conn: Connection, table, column) -> None:
+    if not column.nullable and column.server_default is None:
+        raise RuntimeError(
+            f"{table.name}.{column.name} 为非空列且没有 server_default，"
+            "无法自动添加，请手动迁移"
+        )
+    preparer = conn.dialect.identifier_preparer
+    ddl = CreateColumn(column).compile(dialect=conn.dialect)
+    conn.execute(text(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {ddl}"))
+    logger.info("已添加列: %s.%s", table.name, column.name)
+
+
+def _convert_to_timestamptz(conn: Connection, table, column) -> None:
+    preparer = conn.dialect.identifier_preparer
+    name = preparer.quote(column.name)
+    conn.execute(
+        text(
+            f"ALTER TABLE {preparer.format_table(table)} ALTER COLUMN {name} "
+            f"TYPE TIMESTAMP WITH TIME ZONE USING {name} AT TIME ZONE 'UTC'"
+        )
+    )
+    logger.info("已转换为 timestamptz: %s.%s", table.name, column.name)
+
+
+def _upgrade(conn: Connection) -> int:
+    """在同一个事务内完成全部结构变更，返回执行的变更数"""
+    inspector = inspect(conn)
+    existing = set(inspector.get_table_names())
+    changes = 0
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing:
+            table.create(conn)
+            logger.info("已创建表: %s", table.name)
+            changes += 1
+            continue
+
+        columns = {c["name"]: c for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            current = columns.get(column.name)
+            if current is None:
+                _add_column(conn, table, column)
+                changes += 1
+            elif (
+                conn.dialect.name == "postgresql"
+                and isinstance(column.type, DateTime)
+                and column.type.timezone
+                and not getattr(current["type"], "timezone", False)
+            ):
+                _convert_to_timestamptz(conn, table, column)
+                changes += 1
+
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in indexes:
+                index.create(conn)
+                logger.info("已创建索引: %s", index.name)
+                changes += 1
+    return changes
+
+
+async def migrate(engine: AsyncEngine) -> int:
+    """
+    把数据库结构升级到当前模型定义
+
+    返回:
+        int: 执行的结构变更数，0 表示已是最新
+
+    异常:
+        RuntimeError: 存在无法自动迁移的变更（如新增的非空列）
+    """
+    async with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            await conn.execute(
+                text("SELECT pg_advisory_xact_lock(:id)"), {"id": PG_MIGRATION_LOCK_ID}
+            )
+        changes = await conn.run_sync(_upgrade)
+    if changes:
+        logger.info("数据库迁移完成，共 %d 项变更", changes)
+    else:
+        logger.info("数据库结构已是最新")
+    return changes
+
+
+async def run_migrations(database_url: str | None = None) -> int:
+    """使用独立的引擎执行迁移（用完即释放，不影响 worker 的连接池）"""
+    _, engine = build_engine(database_url or settings.database_url)
+    try:
+        return await migrate(engine)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    from core.logger import setup_logging, stop_logging
+
+    setup_logging()
+    try:
+        asyncio.run(run_migrations())
+    finally:
+        stop_logging()
@@ -0,0 +1,140 @@
+import logging
+import re
+import threading
+import time
+from functools import lru_cache
+from core.config import settings
+
+"""
+db.slow_query 模块
+
+慢查询日志与 SQL 指纹聚合：
+- 对每条执行过的 SQL 计算指纹（去除参数、字面量，折叠 IN 列表与空白），
+  按指纹聚合执行次数、总耗时、最大耗时与慢查询次数。
+- 单条语句耗时超过 SLOW_QUERY_MS 时以 warning 记录指纹（不含参数，避免敏感数据进入日志）。
+- 通过管理员接口 GET /api/v1/admin/slow-queries 查看耗时 Top-N。
+
+用于定位 ILIKE 模糊搜索、未建索引的成员关系检查等导致的全表扫描。
+"""
+
+logger = logging.getLogger("db.slow_query")
+
+# 慢查询阈值（毫秒）
+SLOW_QUERY_MS = settings.slow_query_ms
+# 最多保留的指纹数量，超出时淘汰总耗时最小的指纹，防止内存无限增长
+SLOW_QUERY_MAX_FINGERPRINTS = settings.slow_query_max_fingerprints
+
+_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_PARAM_RE = re.compile(
+    r"\?|%\(\w+\)s|%s|\$\d+|(?<!:):\w+|__\[POSTCOMPILE_\w+\]"
+)  # 各驱动的占位符风格：qmark / pyformat / format / numeric / named
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.I)
+_VALUES_RE = re.compile(r"\bVALUES\s*\(.*?\)(?:\s*,\s*\(.*?\))*", re.I | re.S)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """
+    计算 SQL 语句指纹。
+
+    示例:
+        SELECT * FROM users WHERE uuid = ? AND id IN (?, ?, ?) LIMIT 10
+        -> SELECT * FROM users WHERE uuid = ? AND id IN (...) LIMIT ?
+
+    说明:
+        同一语句文本会被反复执行，结果做 LRU 缓存，热路径上只有一次字典查找。
+    """
+    sql = _COMMENT_RE.sub(" ", statement)
+    sql = _STRING_RE.sub("?", sql)
+    sql = _PARAM_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("IN (...)", sql)
+    sql = _VALUES_RE.sub("VALUES (...)", sql)
+    return _WHITESPACE_RE.sub(" ", sql).strip()
+
+
+class QueryStats:
+    """单个指纹的聚合统计"""
+
+    __slots__ = ("count", "total_time", "max_time", "slow_count", "last_seen")
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0  # 秒
+        self.max_time = 0.0  # 秒
+        self.slow_count = 0
+        self.last_seen = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "slow_count": self.slow_count,
+            "total_ms": round(self.total_time * 1000, 3),
+            "avg_ms": round(self.total_time / self.count * 1000, 3) if self.count else 0,
+            "max_ms": round(self.max_time * 1000, 3),
+            "last_seen": self.last_seen,
+        }
+
+
+class SlowQueryLog:
+    """按指纹聚合的 SQL 执行统计"""
+
+    ORDER_KEYS = {
+        "total": lambda s: s.total_time,
+        "max": lambda s: s.max_time,
+        "count": lambda s: s.count,
+        "slow": lambda s: s.slow_count,
+    }
+
+    def __init__(
+        self,
+        threshold_ms: float = SLOW_QUERY_MS,
+        max_fingerprints: int = SLOW_QUERY_MAX_FINGERPRINTS,
+    ):
+        self.threshold = threshold_ms / 1000
+        self.max_fingerprints = max_fingerprints
+        self._stats: dict[str, QueryStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, elapsed: float):
+        """记录一次 SQL 执行（elapsed 单位为秒）"""
+        key = fingerprint(statement)
+        slow = elapsed >= self.threshold
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    self._evict()
+                stats = self._stats[key] = QueryStats()
+            stats.count += 1
+            stats.total_time += elapsed
+            if elapsed > stats.max_time:
+                stats.max_time = elapsed
+            stats.last_seen = time.time()
+            if slow:
+                stats.slow_count += 1
+        if slow:
+            logger.warning("慢查询: %.2fms - %s", elapsed * 1000, key)
+
+    def _evict(self):
+        victim = min(self._stats, key=lambda k: self._stats[k].total_time)
+        del self._stats[victim]
+
+    def top(self, limit: int = 20, order_by: str = "total") -> list[dict]:
+        """按指定维度（total / max / count / slow）返回 Top-N 指纹统计"""
+        sort_key = self.ORDER_KEYS.get(order_by, self.ORDER_KEYS["total"])
+        with self._lock:
+            items = sorted(
+                self._stats.items(), key=lambda kv: sort_key(kv[1]), reverse=True
+            )[:limit]
+            return [{"fingerprint": key, **stats.to_dict()} for key, stats in items]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+slow_query_log = SlowQueryLog()
@@ -0,0 +1,27 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, String
+from db.connector import Base
+from utils import random
+
+
+class AttachmentModel(Base):
+    __tablename__ = "attachments"
+
+    id = Column(
+        String(36),
+        primary_key=True,
+        default=lambda: str(random.generate_uuid()),
+        comment="附件 UUID",
+    )
+    sha256 = Column(
+        String(64), nullable=False, index=True, comment="文件内容 SHA-256（存储路径）"
+    )
+    size = Column(BigInteger, nullable=False, comment="文件大小（字节）")
+    filename = Column(String(255), nullable=False, comment="原始文件名")
+    content_type = Column(String(100), nullable=False, comment="MIME 类型")
+    uploaded_by = Column(
+        String(36),
+        ForeignKey("users.uuid", ondelete="SET NULL"),
+        nullable=True,
+        comment="上传者 UUID",
+    )
+    created_at = Column(DateTime(timezone=True), nullable=False, comment="上传时间")
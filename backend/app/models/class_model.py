@@ -3,6 +3,7 @@ from sqlalchemy import (
     Boolean,
     Column,
     DateTime,
+    Index,
     Integer,
     String,
     Text,
@@ -43,6 +44,10 @@ class ClassModel(Base):
 
 class AssignmentModel(Base):
     __tablename__ = "assignments"
+    __table_args__ = (
+        # 截止时间查询（班级看板、跨班级截止提醒）按班级 + 截止时间走索引
+        Index("ix_assignments_class_deadline", "class_uuid", "deadline"),
+    )
 
     uuid = Column(
         String(36),
@@ -63,20 +68,24 @@ class AssignmentModel(Base):
     description = Column(Text, nullable=True, comment="作业描述")
     content = Column(Text, nullable=True, comment="作业正文")
     status = Column(String(50), nullable=False, comment="作业状态")
-    deadline = Column(DateTime, nullable=False, comment="截止时间")
+    deadline = Column(DateTime(timezone=True), nullable=False, comment="截止时间")
     max_score = Column(Integer, nullable=False, default=100, comment="满分")
     allow_late_submission = Column(Boolean, default=False, comment="允许迟交")
     attachments = Column(JSON, nullable=True, comment="附件列表（JSON数组）")
     submission_count = Column(Integer, default=0, comment="提交次数")
-    updated_at = Column(DateTime, nullable=True, comment="更新时间")
+    updated_at = Column(DateTime(timezone=True), nullable=True, comment="更新时间")
     created_by = Column(String(100), nullable=True, comment="创建者信息")
-    created_at = Column(DateTime, nullable=True, comment="创建时间")
+    created_at = Column(DateTime(timezone=True), nullable=True, comment="创建时间")
 
     class_ = relationship("ClassModel", back_populates="assignments")
 
 
 class ClassMemberModel(Base):
     __tablename__ = "class_members"
+    __table_args__ = (
+        # 按用户查询所在班级（成员关系校验、我的班级、截止提醒）
+        Index("ix_class_members_user_class", "user_uuid", "class_uuid"),
+    )
     id = Column(Integer, primary_key=True, autoincrement=True, comment="主键ID")
     class_uuid = Column(
         String(36),
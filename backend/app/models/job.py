@@ -0,0 +1,44 @@
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String, Text
+from db.connector import Base
+from utils import random
+
+
+class JobModel(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # worker 领取任务：按状态 + 可执行时间走索引
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+    )
+
+    id = Column(
+        String(36),
+        primary_key=True,
+        default=lambda: str(random.generate_uuid()),
+        comment="任务 UUID",
+    )
+    type = Column(String(50), nullable=False, comment="任务类型（如 class.delete）")
+    status = Column(
+        String(20),
+        nullable=False,
+        default="queued",
+        comment="任务状态（queued / running / succeeded / failed）",
+    )
+    payload = Column(JSON, nullable=True, comment="任务参数（JSON）")
+    result = Column(JSON, nullable=True, comment="执行结果（JSON）")
+    error = Column(Text, nullable=True, comment="最近一次失败的错误信息")
+    progress = Column(Integer, nullable=False, default=0, comment="进度（0 ~ 100）")
+    progress_message = Column(String(200), nullable=True, comment="进度说明")
+    attempts = Column(Integer, nullable=False, default=0, comment="已执行次数")
+    max_attempts = Column(Integer, nullable=False, default=3, comment="最大执行次数")
+    created_by = Column(String(36), nullable=True, comment="创建者 UUID")
+    created_at = Column(DateTime(timezone=True), nullable=False, comment="创建时间")
+    run_at = Column(
+        DateTime(timezone=True), nullable=False, comment="最早可执行时间（重试退避）"
+    )
+    lease_until = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="执行租约到期时间，过期未续约的任务可被重新领取",
+    )
+    started_at = Column(DateTime(timezone=True), nullable=True, comment="最近开始时间")
+    finished_at = Column(DateTime(timezone=True), nullable=True, comment="结束时间")
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
+from db.connector import Base
+
+
+class NotificationModel(Base):
+    __tablename__ = "notifications"
+    __table_args__ = (
+        # 收件箱分页（按 id 倒序）与未读计数
+        Index("ix_notifications_user_id", "user_uuid", "id"),
+        Index("ix_notifications_user_read", "user_uuid", "read_at"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True, comment="主键ID")
+    user_uuid = Column(
+        String(36),
+        ForeignKey("users.uuid", ondelete="CASCADE"),
+        nullable=False,
+        comment="接收用户 UUID",
+    )
+    kind = Column(
+        String(50), nullable=False, comment="通知类型（如 assignment_published）"
+    )
+    title = Column(String(200), nullable=False, comment="通知标题")
+    body = Column(Text, nullable=True, comment="通知正文")
+    class_uuid = Column(String(36), nullable=True, comment="关联班级 UUID")
+    assignment_uuid = Column(String(36), nullable=True, comment="关联作业 UUID")
+    created_at = Column(DateTime(timezone=True), nullable=False, comment="创建时间")
+    read_at = Column(DateTime(timezone=True), nullable=True, comment="已读时间")
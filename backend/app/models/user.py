@@ -14,6 +14,7 @@ class User(Base):
     status = Column(String(20), nullable=False, default="active")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     last_login = Column(DateTime(timezone=True), nullable=True)
+    last_seen = Column(DateTime(timezone=True), nullable=True)
     hashed_password = Column(String(255), nullable=False)
 
     profile_name = Column(String(100), nullable=True)
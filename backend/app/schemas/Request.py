@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel, Field, HttpUrl
 from schemas.User import UserProfile
 
@@ -39,6 +39,10 @@ class CreateAssignmentRequest(BaseModel):
     attachments: List[Attachment]
 
 
+class MarkNotificationsReadRequest(BaseModel):
+    ids: Optional[List[int]] = None  # 不传（null）时标记全部未读通知，空列表不做任何更新
+
+
 class JoinClassRequest(BaseModel):
     invite_code: str
 
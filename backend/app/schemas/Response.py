@@ -29,6 +29,15 @@ class LoginData(BaseModel):
     user: User
 
 
+class SessionData(BaseModel):
+    sid: StrictStr = Field(..., description="会话 ID")
+    created_at: datetime = Field(..., description="登录时间")
+    last_used_at: datetime = Field(..., description="最近一次刷新时间")
+    ip: Optional[StrictStr] = Field(None, description="登录 IP")
+    user_agent: Optional[StrictStr] = Field(None, description="登录客户端")
+    current: bool = Field(False, description="是否为当前会话")
+
+
 class LoginResponse(ApiResponse):
     data: LoginData
 
@@ -42,6 +51,19 @@ class Attachment(BaseModel):
     url: StrictStr
 
 
+class UploadedAttachmentData(BaseModel):
+    id: StrictStr = Field(..., description="附件ID")
+    filename: StrictStr = Field(..., description="原始文件名")
+    content_type: StrictStr = Field(..., description="MIME 类型")
+    size: int = Field(..., description="文件大小（字节）")
+    sha256: StrictStr = Field(..., description="文件内容 SHA-256")
+    created_at: datetime = Field(..., description="上传时间")
+    url: Optional[StrictStr] = Field(
+        None, description="下载地址，可直接用作作业附件的 url"
+    )
+    model_config = {"from_attributes": True}
+
+
 class AssignmentData(BaseModel):
     uuid: StrictStr = Field(..., description="作业ID")
     title: StrictStr = Field(..., description="作业标题")
@@ -75,7 +97,7 @@ class AssignmentData(BaseModel):
                 import logging
 
                 logger = logging.getLogger("schemas.response")
-                logger.warning(f"无法解析 attachments 字段为 JSON 列表: {v}, 错误: {e}")
+                logger.warning("无法解析 attachments 字段为 JSON 列表: %s, 错误: %s", v, e)
                 return []
         if v is None:
             return []
@@ -116,6 +138,90 @@ class ClassData(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class MyClassData(BaseModel):
+    class_uuid: StrictStr = Field(..., description="班级唯一标识符")
+    class_name: StrictStr = Field(..., description="班级名称")
+    description: Optional[StrictStr] = Field(None, description="班级描述")
+    teacher_uuid: StrictStr = Field(..., description="班主任唯一标识符")
+    role: StrictStr = Field(..., description="当前用户在班级中的角色")
+    joined_at: Optional[datetime] = Field(None, description="加入时间")
+    member_count: int = Field(0, description="成员数")
+    assignment_count: int = Field(0, description="作业数")
+
+
+class NotificationData(BaseModel):
+    id: int = Field(..., description="通知ID")
+    kind: StrictStr = Field(..., description="通知类型")
+    title: StrictStr = Field(..., description="通知标题")
+    body: Optional[StrictStr] = Field(None, description="通知正文")
+    class_uuid: Optional[StrictStr] = Field(None, description="关联班级 UUID")
+    assignment_uuid: Optional[StrictStr] = Field(None, description="关联作业 UUID")
+    created_at: datetime = Field(..., description="创建时间")
+    read_at: Optional[datetime] = Field(None, description="已读时间，未读为空")
+    model_config = {"from_attributes": True}
+
+
+class JobData(BaseModel):
+    id: StrictStr = Field(..., description="任务ID")
+    type: StrictStr = Field(..., description="任务类型")
+    status: StrictStr = Field(
+        ..., description="任务状态（queued / running / succeeded / failed）"
+    )
+    progress: int = Field(0, description="进度（0 ~ 100）")
+    progress_message: Optional[StrictStr] = Field(None, description="进度说明")
+    attempts: int = Field(0, description="已执行次数")
+    max_attempts: int = Field(..., description="最大执行次数")
+    result: Optional[Dict[str, Any]] = Field(None, description="执行结果")
+    error: Optional[StrictStr] = Field(None, description="最近一次失败的错误信息")
+    created_at: datetime = Field(..., description="创建时间")
+    run_at: Optional[datetime] = Field(None, description="下一次可执行时间（重试退避）")
+    started_at: Optional[datetime] = Field(None, description="最近开始时间")
+    finished_at: Optional[datetime] = Field(None, description="结束时间")
+    model_config = {"from_attributes": True}
+
+
+class UpcomingAssignmentData(BaseModel):
+    uuid: StrictStr = Field(..., description="作业ID")
+    title: StrictStr = Field(..., description="作业标题")
+    status: StrictStr = Field(..., description="作业状态")
+    deadline: datetime = Field(..., description="截止时间")
+    model_config = {"from_attributes": True}
+
+
+class DeadlineItemData(UpcomingAssignmentData):
+    class_uuid: StrictStr = Field(..., description="班级唯一标识符")
+    class_name: StrictStr = Field(..., description="班级名称")
+
+
+class DeadlineFeedData(BaseModel):
+    items: List[DeadlineItemData] = Field(default_factory=list, description="作业列表")
+    next_cursor: Optional[StrictStr] = Field(
+        None, description="下一页游标，为空表示没有更多数据"
+    )
+
+
+class ClassDashboardData(BaseModel):
+    class_uuid: StrictStr = Field(..., description="班级唯一标识符")
+    class_name: StrictStr = Field(..., description="班级名称")
+    description: Optional[StrictStr] = Field(None, description="班级描述")
+    teacher_uuid: StrictStr = Field(..., description="班主任唯一标识符")
+    invite_code: Optional[StrictStr] = Field(
+        None, description="班级邀请码（仅教师与管理员可见）"
+    )
+    member_counts: Dict[str, int] = Field(
+        default_factory=dict, description="各角色成员数"
+    )
+    member_total: int = Field(0, description="成员总数")
+    assignment_counts: Dict[str, int] = Field(
+        default_factory=dict, description="各状态作业数"
+    )
+    assignment_total: int = Field(0, description="作业总数")
+    upcoming_deadlines: List[UpcomingAssignmentData] = Field(
+        default_factory=list, description="即将截止的作业（按截止时间升序）"
+    )
+    version: int = Field(0, description="班级数据版本号，班级、成员或作业变更后递增")
+
+
 class UpdateUserData(BaseModel):
     username: Optional[StrictStr] = Field(None, description="新的用户名")
     email: Optional[StrictStr] = Field(None, description="新的邮箱")
@@ -1,5 +1,6 @@
 # schema/User.py
 from datetime import datetime
+from typing import Optional
 from pydantic import BaseModel, StrictStr, Field
 from sqlalchemy.orm import relationship
 
@@ -12,6 +13,7 @@ class User(BaseModel):
     status: StrictStr = Field(..., description="用户状态")
     created_at: datetime = Field(..., alias="created_at", description="创建时间")
     last_login: datetime = Field(..., alias="last_login", description="最后登录时间")
+    last_seen: Optional[datetime] = Field(None, description="最后访问时间")
     model_config = {"populate_by_name": True, "from_attributes": True}
 
 
@@ -0,0 +1,147 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from sqlalchemy import bindparam, or_
+from core.config import settings
+from db.connector import DatabaseConnector
+from models.user import User
+
+"""
+services.activity 模块
+
+用户活跃时间的写回缓冲（write-behind）：
+- 登录时记录 last_login，每次携带有效令牌的请求记录 last_seen，只写进程内字典，不访问数据库。
+- 后台任务每隔 ACTIVITY_FLUSH_INTERVAL 秒把缓冲区中的变更批量 UPDATE 到 users 表，
+  同一用户在一个周期内无论访问多少次都只写一行。
+- 多 worker 各自缓冲、各自写回：UPDATE 只在新值更晚时生效，写回顺序不影响结果。
+- 应用关闭时（lifespan）停止后台任务并做最后一次写回；写回失败的记录会合并回缓冲区等待下次重试。
+"""
+
+logger = logging.getLogger("services.activity")
+
+users_table = User.__table__
+
+# 只在新时间晚于库中已有值时更新，保证多 worker 乱序写回时时间单调递增
+_UPDATE_LAST_SEEN = (
+    users_table.update()
+    .where(users_table.c.uuid == bindparam("b_uuid"))
+    .where(
+        or_(
+            users_table.c.last_seen.is_(None),
+            users_table.c.last_seen < bindparam("b_time"),
+        )
+    )
+    .values(last_seen=bindparam("b_time"))
+)
+_UPDATE_LAST_LOGIN = (
+    users_table.update()
+    .where(users_table.c.uuid == bindparam("b_uuid"))
+    .where(
+        or_(
+            users_table.c.last_login.is_(None),
+            users_table.c.last_login < bindparam("b_time"),
+        )
+    )
+    .values(last_login=bindparam("b_time"))
+)
+
+
+class ActivityTracker:
+    """
+    活跃时间缓冲区
+
+    参数:
+        interval (float): 写回间隔（秒）
+        batch_size (int): 单条 executemany 语句包含的最大行数
+    """
+
+    def __init__(self, interval: float, batch_size: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self._last_seen: dict[str, datetime] = {}
+        self._last_login: dict[str, datetime] = {}
+        self._task: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+
+    @property
+    def pending(self) -> int:
+        """等待写回的记录数"""
+        return len(self._last_seen) + len(self._last_login)
+
+    def record_seen(self, user_uuid: str, at: datetime | None = None):
+        """记录用户最近一次访问时间"""
+        self._last_seen[user_uuid] = at or datetime.now(timezone.utc)
+
+    def record_login(self, user_uuid: str, at: datetime | None = None):
+        """记录用户登录时间（同时视为一次访问）"""
+        at = at or datetime.now(timezone.utc)
+        self._last_login[user_uuid] = at
+        self._last_seen[user_uuid] = at
+
+    @staticmethod
+    def _merge(target: dict[str, datetime], entries: dict[str, datetime]):
+        for user_uuid, at in entries.items():
+            current = target.get(user_uuid)
+            if current is None or current < at:
+                target[user_uuid] = at
+
+    def _chunks(self, entries: dict[str, datetime]):
+        rows = [{"b_uuid": uuid, "b_time": at} for uuid, at in entries.items()]
+        for start in range(0, len(rows), self.batch_size):
+            yield rows[start : start + self.batch_size]
+
+    async def flush(self) -> int:
+        """
+        把缓冲区写回数据库，返回写回的记录数。
+        失败时记录错误日志并把本批记录合并回缓冲区，不向调用方抛出异常。
+        """
+        async with self._flush_lock:
+            if not self._last_seen and not self._last_login:
+                return 0
+            last_seen, self._last_seen = self._last_seen, {}
+            last_login, self._last_login = self._last_login, {}
+            try:
+                async with DatabaseConnector.engine.begin() as conn:
+                    for rows in self._chunks(last_seen):
+                        await conn.execute(_UPDATE_LAST_SEEN, rows)
+                    for rows in self._chunks(last_login):
+                        await conn.execute(_UPDATE_LAST_LOGIN, rows)
+            except Exception as e:
+                logger.error("写回用户活跃时间失败，将在下次重试: %s", e)
+                self._merge(self._last_seen, last_seen)
+                self._merge(self._last_login, last_login)
+                return 0
+            count = len(last_seen) + len(last_login)
+            logger.debug(
+                "写回用户活跃时间: last_seen %d 条, last_login %d 条",
+                len(last_seen),
+                len(last_login),
+            )
+            return count
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            # shield：关闭时取消后台任务不会打断进行中的写回
+            await asyncio.shield(self.flush())
+
+    def start(self):
+        """启动后台写回任务（在 lifespan 中调用）"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="activity-flush")
+
+    async def stop(self):
+        """停止后台任务并做最后一次写回（在 lifespan 关闭阶段、释放数据库引擎之前调用）"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+activity_tracker = ActivityTracker(
+    settings.activity_flush_interval, settings.activity_batch_size
+)
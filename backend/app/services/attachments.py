@@ -0,0 +1,179 @@
+import hashlib
+import logging
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Optional
+import anyio
+from sqlalchemy.ext.asyncio import AsyncSession
+from core import exceptions
+from core.config import settings
+from core.metrics import registry
+from models.attachment import AttachmentModel
+
+"""
+services.attachments 模块
+
+作业附件的上传与存储。
+
+- 上传：请求体按块读取（request.stream()），累积到 ATTACHMENT_WRITE_BUFFER 后
+  在线程池中一边计算 SHA-256 一边写入临时文件，内存占用与文件大小无关。
+- 存储：按内容寻址，文件保存在 {ATTACHMENT_DIR}/{sha[0:2]}/{sha[2:4]}/{sha}，
+  写完后原子重命名到位；相同内容只保存一份，每次上传各自生成一条 attachments 记录（文件名可不同）。
+- 大小限制：Content-Length 超过 ATTACHMENT_MAX_SIZE 时直接拒绝，
+  未声明长度（分块传输）时在读取过程中超限即中止，临时文件随即删除。
+- 文件内容写入后不再变化，下载接口以 SHA-256 作为强 ETag 并设置 immutable 缓存头。
+"""
+
+logger = logging.getLogger("services.attachments")
+
+ATTACHMENT_UPLOAD_BYTES = registry.counter(
+    "attachment_upload_bytes_total", "上传的附件字节数"
+)
+ATTACHMENTS_DEDUPLICATED = registry.counter(
+    "attachments_deduplicated_total", "内容已存在、未重复写盘的附件上传数"
+)
+
+STORAGE_ROOT = Path(settings.attachment_dir)
+TMP_DIR = STORAGE_ROOT / "tmp"
+
+
+def blob_path(sha256: str) -> Path:
+    """附件内容在存储目录中的路径"""
+    return STORAGE_ROOT / sha256[:2] / sha256[2:4] / sha256
+
+
+def _open_temp():
+    TMP_DIR.mkdir(parents=True, exist_ok=True)
+    fd, path = tempfile.mkstemp(dir=TMP_DIR, prefix="upload-")
+    return os.fdopen(fd, "wb"), path
+
+
+def _write(file, digest, data: bytes):
+    digest.update(data)
+    file.write(data)
+
+
+def _commit_blob(temp_path: str, sha256: str) -> bool:
+    """把临时文件移动到内容地址，内容已存在时删除临时文件并返回 False"""
+    target = blob_path(sha256)
+    if target.exists():
+        os.unlink(temp_path)
+        return False
+    target.parent.mkdir(parents=True, exist_ok=True)
+    os.chmod(temp_path, 0o644)
+    os.replace(temp_path, target)
+    return True
+
+
+def _discard(temp_path: str):
+    try:
+        os.unlink(temp_path)
+    except FileNotFoundError:
+        pass
+
+
+async def save_attachment(
+    db: AsyncSession,
+    stream: AsyncIterator[bytes],
+    filename: str,
+    content_type: str,
+    declared_size: Optional[int],
+    uploaded_by: str,
+) -> AttachmentModel:
+    """
+    把请求体流式写入存储并创建附件记录。
+
+    参数:
+        db (AsyncSession): 异步数据库会话
+        stream: 请求体字节块的异步迭代器（request.stream()）
+        filename (str): 原始文件名
+        content_type (str): MIME 类型
+        declared_size (int | None): Content-Length，未声明时为 None
+        uploaded_by (str): 上传者 UUID
+
+    返回:
+        AttachmentModel: 新建的附件记录
+
+    异常:
+        PayloadTooLarge: 文件超过 ATTACHMENT_MAX_SIZE
+        InvalidParameter: 文件为空
+        DatabaseQueryError: 写入数据库失败
+    """
+    max_size = settings.attachment_max_size
+    if declared_size is not None and declared_size > max_size:
+        raise exceptions.PayloadTooLarge(f"附件不能超过 {max_size} 字节")
+
+    digest = hashlib.sha256()
+    file, temp_path = await anyio.to_thread.run_sync(_open_temp)
+    size = 0
+    buffer = bytearray()
+    try:
+        try:
+            async for chunk in stream:
+                size += len(chunk)
+                if size > max_size:
+                    raise exceptions.PayloadTooLarge(f"附件不能超过 {max_size} 字节")
+                buffer += chunk
+                if len(buffer) >= settings.attachment_write_buffer:
+                    await anyio.to_thread.run_sync(_write, file, digest, bytes(buffer))
+                    buffer.clear()
+            if buffer:
+                await anyio.to_thread.run_sync(_write, file, digest, bytes(buffer))
+        finally:
+            await anyio.to_thread.run_sync(file.close)
+        if size == 0:
+            raise exceptions.InvalidParameter("附件内容为空")
+        sha256 = digest.hexdigest()
+        stored = await anyio.to_thread.run_sync(_commit_blob, temp_path, sha256)
+    except BaseException:
+        await anyio.to_thread.run_sync(_discard, temp_path)
+        raise
+
+    ATTACHMENT_UPLOAD_BYTES.inc(size)
+    if not stored:
+        ATTACHMENTS_DEDUPLICATED.inc()
+    attachment = AttachmentModel(
+        sha256=sha256,
+        size=size,
+        filename=filename,
+        content_type=content_type,
+        uploaded_by=uploaded_by,
+        created_at=datetime.now(timezone.utc),
+    )
+    db.add(attachment)
+    try:
+        await db.commit()
+        await db.refresh(attachment)
+    except Exception as e:
+        await db.rollback()
+        logger.error("保存附件记录失败: %s, 错误: %s", filename, e)
+        raise exceptions.DatabaseQueryError("保存附件失败") from e
+    logger.info(
+        "附件已上传: %s (%s, %d 字节, sha256=%s, 新文件=%s)",
+        attachment.id,
+        filename,
+        size,
+        sha256,
+        stored,
+    )
+    return attachment
+
+
+async def get_attachment(db: AsyncSession, attachment_id: str) -> AttachmentModel:
+    """
+    查询附件记录
+
+    异常:
+        NotExists: 附件不存在
+        DatabaseQueryError: 数据库查询失败
+    """
+    try:
+        attachment = await db.get(AttachmentModel, attachment_id)
+    except Exception as e:
+        logger.error("查询附件失败: %s, 错误: %s", attachment_id, e)
+        raise exceptions.DatabaseQueryError("查询附件失败") from e
+    if attachment is None:
+        raise exceptions.NotExists(uuid=attachment_id)
+    return attachment
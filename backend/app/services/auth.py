@@ -4,9 +4,12 @@ import logging
 from typing import Optional
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
+from db.errors import is_unique_violation
 from sqlalchemy.ext.asyncio import AsyncSession
 from schemas.Response import UpdateUserData
 from core import exceptions
+from core.revocation import revocation_list
+from core.sessions import session_store
 from models.user import User
 from utils.auth_utils import hash_password, verify_password
 from utils.random import generate_uuid
@@ -14,6 +17,20 @@ from utils.random import generate_uuid
 logger = logging.getLogger("services.auth")
 
 
+async def _revoke_user_access(user_uuid: str):
+    """
+    用户删除或禁用（已提交）后吊销其访问令牌与全部会话。
+
+    访问令牌先在当前进程的吊销列表中生效（Redis 不可用时只记录日志、不抛异常）；
+    会话吊销失败同样只记录日志，不能让已经成功的变更返回错误。
+    """
+    await revocation_list.revoke_user(user_uuid)
+    try:
+        await session_store.revoke_all(user_uuid)
+    except Exception as e:
+        logger.error("用户变更已提交，但吊销会话失败: %s, 错误: %s", user_uuid, e)
+
+
 async def get_user_by_username(db: AsyncSession, username: str) -> User:
     """
     根据用户名查询用户信息。
@@ -32,7 +49,7 @@ async def get_user_by_username(db: AsyncSession, username: str) -> User:
     其他说明:
         查询失败将统一抛出封装异常，供上层逻辑处理。
     """
-    logger.info("使用 用户名 查询用户: %s", username)
+    logger.debug("使用 用户名 查询用户: %s", username)
     try:
         stmt = select(User).where(User.username == username)
         result = await db.execute(stmt)
@@ -60,7 +77,7 @@ async def get_user_by_uuid(db: AsyncSession, uuid: str) -> User | None:
         - NotExists: 用户不存在
         - DatabaseQueryError: 数据库执行失败
     """
-    logger.info("使用 UUID 查询用户 %s", uuid)
+    logger.debug("使用 UUID 查询用户 %s", uuid)
     try:
         stmt = select(User).filter(User.uuid == uuid)
         result = await db.execute(stmt)
@@ -87,7 +104,7 @@ async def get_user_role_by_uuid(db: AsyncSession, uuid: str) -> str | None:
     异常说明:
     -  数据库错误时抛出 DatabaseQueryError，调用者需捕获
     """
-    logger.info("使用 UUID 查询用户角色: UUID: %s", uuid)
+    logger.debug("使用 UUID 查询用户角色: UUID: %s", uuid)
     try:
         stmt = select(User).filter(User.uuid == uuid)
         result = await db.execute(stmt)
@@ -155,7 +172,7 @@ async def create_user(
         return user
     except IntegrityError as e:
         await db.rollback()
-        if "UNIQUE constraint failed" in str(e.orig):
+        if is_unique_violation(e):
             raise exceptions.AlreadyExists()
     except Exception as e:
         logger.error("添加用户到数据库失败: 用户名: %s, 错误: %s", username, e)
@@ -176,7 +193,7 @@ async def delete_user(
         exceptions.InvalidParameter: HTTP 400, 用户不存在
         exceptions.NotExists: HTTP 404, 记录不存在
     """
-    logger.info(f"删除用户请求: 用户UUID: {user_uuid}")
+    logger.info("删除用户请求: 用户UUID: %s", user_uuid)
     user = await get_user_by_uuid(db, user_uuid)
     try:
         await db.delete(user)
@@ -184,7 +201,8 @@ async def delete_user(
     except Exception as e:
         logger.error("删除用户到数据库失败: 用户名: %s, 错误: %s", user.username, e)
         raise exceptions.InvalidParameter()
-    logger.info(f"用户删除成功: 用户UUID: {user_uuid}")
+    await _revoke_user_access(user_uuid)
+    logger.info("用户删除成功: 用户UUID: %s", user_uuid)
 
 
 async def authenticate_user(
@@ -206,13 +224,13 @@ async def authenticate_user(
         - AuthenticationFailed: 密码验证失败
         - DatabaseQueryError: 查询过程中发生数据库错误
     """
-    logger.info(f"尝试登录: 用户名: {username}")
+    logger.debug("尝试登录: 用户名: %s", username)
     try:
         user = await get_user_by_username(db, username)
     except exceptions.BaseAppException as e:
         raise e
     except Exception as e:
-        logger.error(f"数据库查询异常，登录失败: 用户名: {username} 错误: {e}")
+        logger.error("数据库查询异常，登录失败: 用户名: %s 错误: %s", username, e)
         raise exceptions.DatabaseQueryError() from e
     if not verify_password(password, user.hashed_password):
         raise exceptions.AuthenticationFailed(username)
@@ -279,7 +297,7 @@ async def update_user(
                 user_obj.status = status
         await db.commit()
         await db.refresh(user_obj)
-        return UpdateUserData(
+        updated = UpdateUserData(
             username=user_obj.username,
             email=user_obj.email,
             profile_name=user_obj.profile_name,
@@ -289,9 +307,16 @@ async def update_user(
         )
     except IntegrityError as e:
         await db.rollback()
-        if "UNIQUE constraint failed" in str(e.orig):
+        if is_unique_violation(e):
             raise exceptions.AlreadyExists()
     except Exception as e:
         await db.rollback()
         logger.error("添加新用户信息到数据库失败, 错误: %s", e)
         raise exceptions.InvalidParameter()
+    else:
+        # 账户被禁用时吊销全部会话；其余变更只需让会话中缓存的用户信息失效
+        if updated.status != "active":
+            await _revoke_user_access(user_uuid)
+        else:
+            await session_store.invalidate_user(user_uuid)
+        return updated
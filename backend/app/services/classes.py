@@ -1,20 +1,80 @@
 from datetime import datetime, timezone
+import base64
+import binascii
 import json
 import logging
 from typing import Optional
-from sqlalchemy import asc, desc, func, or_, select
+from sqlalchemy import asc, delete, desc, func, literal, or_, select, tuple_, union_all
 from sqlalchemy.exc import IntegrityError
+from db.errors import is_unique_violation
 from fastapi import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 from models.user import User
-from schemas.Response import ClassUserData
+from schemas.Response import (
+    ClassDashboardData,
+    ClassUserData,
+    DeadlineFeedData,
+    DeadlineItemData,
+    MyClassData,
+    UpcomingAssignmentData,
+)
 from core import exceptions
+from core.cache import VersionedCache
+from core.config import settings
+from core.principal import Principal
+from core.redis import resilient_redis
+from db.connector import DatabaseConnector
+from services.deadlines import deadline_scheduler
+from services.jobs import JobContext, job_runner, job_type
+from services.notifications import NotificationEvent, notification_dispatcher
 from models.class_model import AssignmentModel, ClassMemberModel, ClassModel
+from models.job import JobModel
 from utils import random
+from utils.dates import to_utc
 
 
 logger = logging.getLogger("services.classes")
 
+# 班级聚合数据缓存：班级信息、成员或作业变更后通过 invalidate_class_cache 使其失效
+class_cache = VersionedCache(resilient_redis, "class", settings.class_cache_ttl)
+# “我的班级”列表缓存（按用户，各分页共享版本号）：创建或加入班级、班级信息变更或删除时失效；
+# 列表中的成员数与作业数允许最多 CLASS_CACHE_TTL 秒的延迟
+user_classes_cache = VersionedCache(
+    resilient_redis, "user_classes", settings.class_cache_ttl
+)
+# 跨班级截止提醒缓存（按用户）：所在班级发布新作业、加入或删除班级时失效
+deadline_feed_cache = VersionedCache(
+    resilient_redis, "deadline_feed", settings.class_cache_ttl
+)
+
+# 出现在截止提醒与班级看板“即将截止”中的作业状态（草稿对学生不可见，已关闭的作业无需提醒）
+FEED_ASSIGNMENT_STATUS = "published"
+
+# 后台删除班级的任务类型
+CLASS_DELETE_JOB = "class.delete"
+
+
+async def invalidate_class_cache(class_uuid: str):
+    """班级相关数据变更（提交事务）后调用，使该班级的聚合缓存失效"""
+    await class_cache.bump(class_uuid)
+
+
+async def _class_member_uuids(db: AsyncSession, class_uuid: str) -> list[str]:
+    stmt = select(ClassMemberModel.user_uuid).where(
+        ClassMemberModel.class_uuid == class_uuid
+    )
+    return list((await db.execute(stmt)).scalars())
+
+
+async def invalidate_user_classes(*user_uuids: str):
+    """使指定用户的“我的班级”列表缓存失效（批量，一次往返）"""
+    await user_classes_cache.bump_many(list(user_uuids))
+
+
+async def invalidate_deadline_feed(*user_uuids: str):
+    """使指定用户的截止提醒缓存失效（批量，一次往返）"""
+    await deadline_feed_cache.bump_many(list(user_uuids))
+
 
 async def get_class_by_uuid(db: AsyncSession, class_uuid: str) -> ClassModel:
     """
@@ -72,42 +132,162 @@ async def create_class(
         db.add(new_class)
         await db.commit()
         await db.refresh(new_class)
-        return new_class
     except IntegrityError as e:
         await db.rollback()
-        if "UNIQUE constraint failed" in str(e.orig):
+        if is_unique_violation(e):
             raise exceptions.AlreadyExists()
+        logger.error("添加新班级到数据库失败, 错误: %s", e)
+        raise exceptions.InvalidParameter()
     except Exception as e:
         logger.error("添加新班级到数据库失败, 错误: %s", e)
         raise exceptions.InvalidParameter()
+    # 任教的班级会出现在教师的“我的班级”列表中
+    await invalidate_user_classes(teacher_uuid)
+    return new_class
 
 
-async def delete_class(
-    db: AsyncSession, class_uuid: str, user_uuid: str, user_role: str
-) -> None:
+async def delete_class(db: AsyncSession, class_uuid: str, principal: Principal) -> None:
     """
     删除指定班级（支持管理员或班主任操作）
 
     参数:
         db (AsyncSession): 异步数据库会话
         class_uuid (str): 班级唯一标识符
-        user_uuid (str): 请求用户的 UUID
-        user_role (str): 请求用户的角色（admin 或 teacher）
+        principal (Principal): 请求用户的身份对象（admin 或 teacher）
 
     异常:
         - 如果用户无权限，将抛出 NotFound 或 InvalidParameter 异常
         - 发生数据库错误时抛出 InvalidParameter 异常
     """
-    if not user_role == "admin":
-        get_class_member_by_uuid(db, class_uuid, user_uuid)
+    if not principal.is_admin:
+        await principal.require_member(db, class_uuid)
     try:
         class_to_delete = await get_class_by_uuid(db, class_uuid)
+        member_uuids = await _class_member_uuids(db, class_uuid)
+        teacher_uuid = class_to_delete.teacher_uuid
         await db.delete(class_to_delete)
         await db.commit()
     except Exception as e:
         logger.error("删除班级到数据库失败: 班级ID: %s, 错误: %s", class_uuid, e)
         raise exceptions.InvalidParameter()
-    logger.info(f"用户删除成功: 班级UUID: {class_uuid}")
+    await invalidate_class_cache(class_uuid)
+    await invalidate_user_classes(teacher_uuid, *member_uuids)
+    await invalidate_deadline_feed(*member_uuids)
+    logger.info("班级删除成功: 班级UUID: %s", class_uuid)
+
+
+async def enqueue_class_deletion(
+    db: AsyncSession, class_uuid: str, principal: Principal
+) -> JobModel:
+    """
+    校验权限后把班级删除放入后台任务（适用于作业或成员很多的班级），返回任务记录
+
+    异常:
+        - 无权限或班级不存在时抛出 InvalidParameter 异常
+        - 创建任务失败时抛出 DatabaseQueryError 异常
+    """
+    if not principal.is_admin:
+        await principal.require_member(db, class_uuid)
+    await get_class_by_uuid(db, class_uuid)
+    return await job_runner.enqueue(
+        db, CLASS_DELETE_JOB, {"class_uuid": class_uuid}, created_by=principal.uuid
+    )
+
+
+@job_type(CLASS_DELETE_JOB, concurrency=1)
+async def _delete_class_job(ctx: JobContext, payload: dict) -> dict:
+    """
+    分批删除班级的作业与成员，最后删除班级本身。
+
+    每批一个事务（JOB_DELETE_BATCH_SIZE 行），不会长时间持有写锁；
+    重试时从剩余的数据继续，已删除的批次不会重复处理。
+    """
+    class_uuid = payload["class_uuid"]
+    batch_size = settings.job_delete_batch_size
+    engine = DatabaseConnector.engine
+    async with engine.connect() as conn:
+        total = (
+            await conn.execute(
+                select(
+                    select(func.count())
+                    .select_from(AssignmentModel)
+                    .where(AssignmentModel.class_uuid == class_uuid)
+                    .scalar_subquery(),
+                    select(func.count())
+                    .select_from(ClassMemberModel)
+                    .where(ClassMemberModel.class_uuid == class_uuid)
+                    .scalar_subquery(),
+                )
+            )
+        ).one()
+    total = max(sum(total), 1)
+    deleted = {"assignments": 0, "members": 0}
+
+    while True:
+        async with engine.begin() as conn:
+            ids = (
+                await conn.execute(
+                    select(AssignmentModel.uuid)
+                    .where(AssignmentModel.class_uuid == class_uuid)
+                    .limit(batch_size)
+                )
+            ).scalars().all()
+            if ids:
+                await conn.execute(
+                    delete(AssignmentModel).where(AssignmentModel.uuid.in_(ids))
+                )
+        if not ids:
+            break
+        deleted["assignments"] += len(ids)
+        await ctx.progress(
+            sum(deleted.values()) * 99 // total, f"已删除作业 {deleted['assignments']}"
+        )
+
+    while True:
+        async with engine.begin() as conn:
+            rows = (
+                await conn.execute(
+                    select(ClassMemberModel.id, ClassMemberModel.user_uuid)
+                    .where(ClassMemberModel.class_uuid == class_uuid)
+                    .limit(batch_size)
+                )
+            ).all()
+            if rows:
+                await conn.execute(
+                    delete(ClassMemberModel).where(
+                        ClassMemberModel.id.in_([row.id for row in rows])
+                    )
+                )
+        if not rows:
+            break
+        # 按批失效成员缓存：重试时已删除的成员不会再被查到
+        member_uuids = [row.user_uuid for row in rows]
+        await invalidate_user_classes(*member_uuids)
+        await invalidate_deadline_feed(*member_uuids)
+        deleted["members"] += len(rows)
+        await ctx.progress(
+            sum(deleted.values()) * 99 // total, f"已移除成员 {deleted['members']}"
+        )
+
+    async with engine.begin() as conn:
+        teacher_uuid = (
+            await conn.execute(
+                select(ClassModel.teacher_uuid).where(
+                    ClassModel.class_uuid == class_uuid
+                )
+            )
+        ).scalar_one_or_none()
+        await conn.execute(delete(ClassModel).where(ClassModel.class_uuid == class_uuid))
+    await invalidate_class_cache(class_uuid)
+    if teacher_uuid is not None:
+        await invalidate_user_classes(teacher_uuid)
+    logger.info(
+        "班级删除成功（后台任务）: 班级UUID: %s, 作业 %d, 成员 %d",
+        class_uuid,
+        deleted["assignments"],
+        deleted["members"],
+    )
+    return deleted
 
 
 async def create_assignment(
@@ -117,7 +297,7 @@ async def create_assignment(
     description: str,
     content: str,
     status: str,
-    deadline: str,
+    deadline: datetime,
     max_score: int,
     allow_late_submission: bool,
     attachments: list[str],
@@ -137,7 +317,7 @@ async def create_assignment(
         description (str): 作业摘要，用于简要说明内容。
         content (str): 作业正文，支持富文本或 markdown。
         status (str): 作业状态，推荐使用枚举值（如 "draft", "published"）。
-        deadline (str): 截止日期，建议传入 ISO 8601 格式的字符串。
+        deadline (datetime): 截止时间，写入前转换为 UTC。
         max_score (int): 作业满分，必须为非负整数。
         allow_late_submission (bool): 是否允许迟交。为 True 表示过期仍可提交。
         attachments (list[str]): 附件列表，格式为 URL 或文件名数组。
@@ -159,6 +339,8 @@ async def create_assignment(
     attachments = json.dumps(
         [{**a.dict(), "url": str(a.url)} for a in attachments], separators=(",", ":")
     )
+    # 截止时间统一按 UTC 存储（SQLite 不保存时区偏移），不带时区的值按 UTC 处理
+    deadline = to_utc(deadline)
     await get_class_by_uuid(db, class_uuid)
     new_assignment = AssignmentModel(
         uuid=random.generate_uuid(),
@@ -181,19 +363,44 @@ async def create_assignment(
         db.add(new_assignment)
         await db.commit()
         await db.refresh(new_assignment)
-        return new_assignment
     except IntegrityError as e:
         await db.rollback()
-        if "UNIQUE constraint failed" in str(e.orig):
+        if is_unique_violation(e):
             raise exceptions.AlreadyExists()
+        logger.error("添加新作业到数据库失败, 错误: %s", e)
+        raise exceptions.InvalidParameter()
     except Exception as e:
+        await db.rollback()
         logger.error("添加新作业到数据库失败, 错误: %s", e)
         raise exceptions.InvalidParameter()
-    pass
+
+    # 以下为提交成功后的附带操作：作业已经创建，这里的失败只记录日志，不能让请求返回错误，
+    # 否则客户端重试会得到 AlreadyExists 或重复的作业
+    try:
+        await invalidate_class_cache(class_uuid)
+        if status == FEED_ASSIGNMENT_STATUS and not allow_late_submission:
+            deadline_scheduler.schedule(new_assignment.uuid, class_uuid, deadline)
+        if status == FEED_ASSIGNMENT_STATUS:
+            await invalidate_deadline_feed(*await _class_member_uuids(db, class_uuid))
+            # 通知班级学生：只入队，扇出由后台任务完成，耗时与班级人数无关
+            notification_dispatcher.publish(
+                NotificationEvent(
+                    kind="assignment_published",
+                    class_uuid=class_uuid,
+                    assignment_uuid=new_assignment.uuid,
+                    title=f"新作业：{title}",
+                    body=description,
+                )
+            )
+    except Exception as e:
+        logger.error(
+            "作业已创建，但缓存失效或通知入队失败: %s, 错误: %s", new_assignment.uuid, e
+        )
+    return new_assignment
 
 
 async def get_assignment(
-    db: AsyncSession, assignment_uuid: str, class_uuid: str, user_uuid: str
+    db: AsyncSession, assignment_uuid: str, class_uuid: str, principal: Principal
 ):
     """
     获取指定班级内的单个作业详情。
@@ -205,7 +412,7 @@ async def get_assignment(
         db (AsyncSession): 异步数据库会话。
         assignment_uuid (str): 要查询的作业唯一标识符（UUID）。
         class_uuid (str): 作业所属班级的 UUID。
-        user_uuid (str): 当前请求用户的 UUID，用于验证是否属于该班级。
+        principal (Principal): 当前请求用户的身份对象，用于验证是否属于该班级。
 
     返回:
         AssignmentModel: 作业对象，若存在并查询成功。
@@ -213,9 +420,9 @@ async def get_assignment(
     异常:
         NotExists: 若作业不存在或不属于该班级。
         DatabaseQueryError: 数据库查询过程中发生未知错误。
-        NotClassMember: 若用户不是该班级成员（由 get_class_member_by_uuid 抛出）。
+        InvalidParameter: 若用户不是该班级成员（由 Principal.require_member 抛出）。
     """
-    await get_class_member_by_uuid(db, class_uuid, user_uuid)
+    await principal.require_member(db, class_uuid)
 
     logger.debug("正在查询作业: uuid: %s, class: %s", assignment_uuid, class_uuid)
 
@@ -289,20 +496,20 @@ async def get_class_by_invite_code(db: AsyncSession, invite_code: str):
     return class_obj
 
 
-async def join_class(db: AsyncSession, invite_code: str, current_user: User):
+async def join_class(db: AsyncSession, invite_code: str, principal: Principal):
     """
     用户通过邀请码加入班级。
 
     流程说明：
     1. 通过邀请码查找对应班级。
-    2. 检查用户是否已经是该班级成员，防止重复加入。
+    2. 检查用户是否已经是该班级成员（复用 Principal 中的成员关系），防止重复加入。
     3. 若未加入，则创建新的班级成员记录，默认角色为学生。
     4. 提交数据库事务并刷新对象状态，返回成员信息。
 
     参数：
         db (AsyncSession): 异步数据库会话。
         invite_code (str): 班级邀请码，用于查找对应班级。
-        current_user (User): 当前请求的用户对象。
+        principal (Principal): 当前请求用户的身份对象。
 
     返回：
         ClassUserData: 新加入的班级成员数据，包含角色、班级ID、用户ID、用户昵称和加入时间。
@@ -315,43 +522,41 @@ async def join_class(db: AsyncSession, invite_code: str, current_user: User):
     try:
         class_obj = await get_class_by_invite_code(db, invite_code)
         class_uuid = str(class_obj.class_uuid)
-        stmt = select(ClassMemberModel).where(
-            ClassMemberModel.class_uuid == class_uuid,
-            ClassMemberModel.user_uuid == current_user.uuid,
-        )
-        result = await db.execute(stmt)
-        existing = result.scalar_one_or_none()
-        if existing:
+        if class_uuid in await principal.memberships(db):
             raise exceptions.AlreadyExists("您已经加入该班级")
+        joined_at = datetime.now(timezone.utc)
         new_member = ClassMemberModel(
-            created_at=datetime.now(timezone.utc),
+            created_at=joined_at,
             role="student",
             class_uuid=class_uuid,
-            user_uuid=current_user.uuid,
+            user_uuid=principal.uuid,
         )
         db.add(new_member)
         await db.commit()
-        # NOTE:根据SQL库源码显示，commit后所有会话将会标为已过期，这将无法再操作sql对象。所以需要refresh重新刷新
-        await db.refresh(new_member)
-        await db.refresh(current_user)
+        principal.add_membership(class_uuid, "student")
+        await invalidate_class_cache(class_uuid)
+        await invalidate_user_classes(principal.uuid)
+        await invalidate_deadline_feed(principal.uuid)
+        # NOTE: commit 后 ORM 对象会被标记为过期，这里直接使用本地值与 Principal 快照构造返回数据，
+        # 省去 refresh 成员与用户对象的两次查询
         return ClassUserData(
-            role=new_member.role,
-            class_uuid=new_member.class_uuid,
-            user_uuid=current_user.uuid,
-            profile_name=current_user.profile_name,
-            created_at=new_member.created_at,
+            role="student",
+            class_uuid=class_uuid,
+            user_uuid=principal.uuid,
+            profile_name=principal.profile_name,
+            created_at=joined_at,
         )
 
     except exceptions.AlreadyExists as e:
-        logger.warning(f"加入班级失败: {e}")
+        logger.warning("加入班级失败: %s", e)
         raise e
     except IntegrityError as e:
         await db.rollback()
-        if "UNIQUE constraint failed" in str(e.orig):
+        if is_unique_violation(e):
             raise exceptions.AlreadyExists("您已经加入该班级")
         logger.error(
             "数据库完整性错误: user=%s, invite_code=%s, 错误=%s",
-            current_user.uuid,
+            principal.uuid,
             invite_code,
             e,
         )
@@ -359,7 +564,7 @@ async def join_class(db: AsyncSession, invite_code: str, current_user: User):
     except exceptions.InvalidParameter as e:
         logger.warning(
             "加入班级失败: user=%s, invite_code=%s",
-            current_user.uuid,
+            principal.uuid,
             invite_code,
         )
         raise exceptions.InvalidParameter("无效的邀请码")
@@ -369,7 +574,7 @@ async def join_class(db: AsyncSession, invite_code: str, current_user: User):
 
 
 async def get_assignments(
-    user_uuid: str,
+    principal: Principal,
     db: AsyncSession,
     class_uuid: str,
     page: int,
@@ -391,7 +596,7 @@ async def get_assignments(
     6. 查询满足条件的作业总数，用于前端分页展示。
 
     参数：
-        user_uuid (str): 当前请求用户的 UUID。
+        principal (Principal): 当前请求用户的身份对象。
         db (AsyncSession): 异步数据库会话。
         class_uuid (str): 目标班级 UUID。
         page (int): 页码，从 1 开始。
@@ -407,10 +612,10 @@ async def get_assignments(
             - total (int): 满足条件的作业总数，用于分页计算。
 
     异常：
-        - 若用户非班级成员，将由 get_class_member_by_uuid 抛出异常。
+        - 若用户非班级成员，将由 Principal.require_member 抛出异常。
         - 查询过程中可能抛出数据库异常。
     """
-    await get_class_member_by_uuid(db, class_uuid, user_uuid)
+    await principal.require_member(db, class_uuid)
     # 偏移量
     offset = (page - 1) * size
     stmt = select(AssignmentModel).where(AssignmentModel.class_uuid == class_uuid)
@@ -543,8 +748,7 @@ async def update_class(
     class_uuid: str,
     class_name: str,
     description: str,
-    user_uuid: str,
-    user_role: str,
+    principal: Principal,
 ):
     """
     更新班级信息，仅允许管理员或该班级成员执行此操作。
@@ -561,8 +765,7 @@ async def update_class(
         class_uuid (str): 要更新的班级的唯一标识符。
         class_name (str): 新的班级名称。
         description (str): 新的班级描述。
-        user_uuid (str): 当前执行操作的用户 UUID。
-        user_role (str): 当前用户的角色（如 "admin"）。
+        principal (Principal): 当前执行操作的用户身份对象。
 
     返回：
         None
@@ -573,8 +776,8 @@ async def update_class(
         - InvalidParameter: 其他参数错误或未处理异常。
     """
     logger.debug("更新班级信息: %s", class_uuid)
-    if not user_role == "admin":
-        await get_class_member_by_uuid(db, class_uuid, user_uuid)
+    if not principal.is_admin:
+        await principal.require_member(db, class_uuid)
     try:
         class_obj = await get_class_by_uuid(db, class_uuid)
         class_obj.class_name = class_name
@@ -583,16 +786,20 @@ async def update_class(
         await db.refresh(class_obj)
     except IntegrityError as e:
         await db.rollback()
-        if "UNIQUE constraint failed" in str(e.orig):
+        if is_unique_violation(e):
             raise exceptions.AlreadyExists()
     except Exception as e:
         await db.rollback()
         logger.error("添加新班级信息到数据库失败, 错误: %s", e)
         raise exceptions.InvalidParameter()
+    await invalidate_class_cache(class_uuid)
+    await invalidate_user_classes(
+        class_obj.teacher_uuid, *await _class_member_uuids(db, class_uuid)
+    )
     return class_obj
 
 
-async def get_class(db: AsyncSession, class_uuid: str, user_role: str):
+async def get_class(db: AsyncSession, class_uuid: str, principal: Principal):
     """
     根据班级 UUID 获取班级信息。
 
@@ -606,8 +813,7 @@ async def get_class(db: AsyncSession, class_uuid: str, user_role: str):
     参数：
         db (AsyncSession): 异步数据库会话，用于执行查询。
         class_uuid (str): 要查询的班级的唯一标识符。
-        user_role (str): 当前用户的角色。
-        user_uuid (str): 当前用户的唯一标识符，用于权限校验。
+        principal (Principal): 当前用户的身份对象，用于权限校验。
 
     返回：
         class_obj: 查询到的班级对象。
@@ -616,8 +822,8 @@ async def get_class(db: AsyncSession, class_uuid: str, user_role: str):
         - NotFoundException: 如果班级或班级成员不存在。
         - DatabaseQueryError: 如果数据库查询失败。
     """
-    if user_role == "teacher":
-        await get_class_member_by_uuid(class_uuid)
+    if principal.is_teacher:
+        await principal.require_member(db, class_uuid)
     try:
         class_obj = await get_class_by_uuid(db, class_uuid)
     except Exception as e:
@@ -626,3 +832,383 @@ async def get_class(db: AsyncSession, class_uuid: str, user_role: str):
     if class_obj is None:
         raise exceptions.NotExists()
     return class_obj
+
+
+def _as_utc(value: datetime | str) -> datetime:
+    """缓存中的时间为 ISO 字符串；SQLite 返回的时间不带时区，按 UTC 处理；其他时区转换为 UTC"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return to_utc(value)
+
+
+async def _build_class_dashboard(db: AsyncSession, class_uuid: str) -> dict:
+    """
+    从数据库构建班级看板数据：
+    - 班级信息
+    - 一条 UNION ALL 聚合查询同时得到按角色的成员数与按状态的作业数
+    - 截止时间最近的未截止、已发布作业（最多 DASHBOARD_UPCOMING_LIMIT 条）
+    """
+    class_obj = await get_class_by_uuid(db, class_uuid)
+    member_counts = (
+        select(
+            literal("member").label("kind"),
+            ClassMemberModel.role.label("key"),
+            func.count().label("total"),
+        )
+        .where(ClassMemberModel.class_uuid == class_uuid)
+        .group_by(ClassMemberModel.role)
+    )
+    assignment_counts = (
+        select(literal("assignment"), AssignmentModel.status, func.count())
+        .where(AssignmentModel.class_uuid == class_uuid)
+        .group_by(AssignmentModel.status)
+    )
+    upcoming_stmt = (
+        select(
+            AssignmentModel.uuid,
+            AssignmentModel.title,
+            AssignmentModel.status,
+            AssignmentModel.deadline,
+        )
+        .where(
+            AssignmentModel.class_uuid == class_uuid,
+            AssignmentModel.status == FEED_ASSIGNMENT_STATUS,
+            # deadline 按 UTC 存储（见 create_assignment），与 UTC 当前时间直接比较
+            AssignmentModel.deadline >= datetime.now(timezone.utc),
+        )
+        .order_by(AssignmentModel.deadline)
+        .limit(settings.dashboard_upcoming_limit)
+    )
+    try:
+        counts = (await db.execute(union_all(member_counts, assignment_counts))).all()
+        upcoming = (await db.execute(upcoming_stmt)).all()
+    except Exception as e:
+        logger.error("查询班级看板数据失败: %s, 错误: %s", class_uuid, e)
+        raise exceptions.DatabaseQueryError("查询班级看板数据失败") from e
+
+    members = {key: total for kind, key, total in counts if kind == "member"}
+    assignments = {key: total for kind, key, total in counts if kind == "assignment"}
+    return ClassDashboardData(
+        class_uuid=class_obj.class_uuid,
+        class_name=class_obj.class_name,
+        description=class_obj.description,
+        teacher_uuid=class_obj.teacher_uuid,
+        invite_code=class_obj.invite_code,
+        member_counts=members,
+        member_total=sum(members.values()),
+        assignment_counts=assignments,
+        assignment_total=sum(assignments.values()),
+        upcoming_deadlines=[
+            UpcomingAssignmentData(
+                uuid=row.uuid,
+                title=row.title,
+                status=row.status,
+                deadline=_as_utc(row.deadline),
+            )
+            for row in upcoming
+        ],
+    ).model_dump(mode="json")
+
+
+async def get_class_dashboard(
+    db: AsyncSession, class_uuid: str, principal: Principal
+) -> dict:
+    """
+    获取班级看板数据（班级信息、成员与作业统计、即将截止的作业），按班级版本缓存。
+
+    主要流程：
+    1. 非管理员需为该班级成员（成员关系由 Principal 按需加载并在请求内复用）。
+    2. 读取当前版本的缓存，未命中时查询数据库并按读取时的版本写回。
+    3. 命中缓存时剔除缓存期间已经截止的作业。
+    4. 邀请码仅对管理员与班级内的教师返回。
+
+    参数：
+        db (AsyncSession): 异步数据库会话。
+        class_uuid (str): 班级唯一标识符。
+        principal (Principal): 当前用户的身份对象，用于权限校验。
+
+    返回：
+        dict: ClassDashboardData 的 JSON 形式。
+
+    异常：
+        - InvalidParameter: 班级不存在或用户不是班级成员。
+        - DatabaseQueryError: 数据库查询失败。
+    """
+    member_role = None
+    if not principal.is_admin:
+        member_role = await principal.require_member(db, class_uuid)
+
+    version, dashboard = await class_cache.get(class_uuid)
+    if dashboard is None:
+        dashboard = await _build_class_dashboard(db, class_uuid)
+        dashboard["version"] = version
+        await class_cache.set(class_uuid, version, dashboard)
+    else:
+        now = datetime.now(timezone.utc)
+        dashboard["upcoming_deadlines"] = [
+            item
+            for item in dashboard["upcoming_deadlines"]
+            if _as_utc(item["deadline"]) >= now
+        ]
+
+    if not (principal.is_admin or principal.is_teacher or member_role == "teacher"):
+        dashboard["invite_code"] = None
+    return dashboard
+
+
+async def _load_my_classes(
+    db: AsyncSession, user_uuid: str, page: int, size: int
+) -> dict:
+    """
+    查询用户所在（加入或任教）班级的一页数据，查询次数与班级数量无关：
+    1. 成员关系与任教班级 UNION ALL 后分页（窗口函数同时返回总数），同一条查询 JOIN 出班级信息；
+       任教但不是成员的班级角色为 teacher、加入时间为空，排在最后
+    2. 一条 UNION ALL + IN 查询统计本页各班级的成员数与作业数
+    """
+    joined = select(
+        ClassMemberModel.class_uuid.label("class_uuid"),
+        ClassMemberModel.role.label("role"),
+        ClassMemberModel.created_at.label("joined_at"),
+    ).where(ClassMemberModel.user_uuid == user_uuid)
+    taught = select(
+        ClassModel.class_uuid,
+        literal("teacher"),
+        literal(None, ClassMemberModel.created_at.type),
+    ).where(
+        ClassModel.teacher_uuid == user_uuid,
+        ~select(ClassMemberModel.id)
+        .where(
+            ClassMemberModel.class_uuid == ClassModel.class_uuid,
+            ClassMemberModel.user_uuid == user_uuid,
+        )
+        .exists(),
+    )
+    mine = union_all(joined, taught).subquery()
+    stmt = (
+        select(
+            mine.c.class_uuid,
+            mine.c.role,
+            mine.c.joined_at,
+            ClassModel.class_name,
+            ClassModel.description,
+            ClassModel.teacher_uuid,
+            func.count().over().label("total"),
+        )
+        .join(ClassModel, ClassModel.class_uuid == mine.c.class_uuid)
+        .order_by(desc(mine.c.joined_at).nulls_last(), mine.c.class_uuid)
+        .offset((page - 1) * size)
+        .limit(size)
+    )
+    try:
+        rows = (await db.execute(stmt)).all()
+        if rows:
+            total = rows[0].total
+        elif page > 1:
+            # 页码超出范围时窗口函数没有返回行，单独查询总数
+            total = (
+                await db.execute(select(func.count()).select_from(mine))
+            ).scalar_one()
+        else:
+            total = 0
+
+        class_uuids = [row.class_uuid for row in rows]
+        member_counts, assignment_counts = {}, {}
+        if class_uuids:
+            counts_stmt = union_all(
+                select(
+                    literal("member").label("kind"),
+                    ClassMemberModel.class_uuid.label("class_uuid"),
+                    func.count().label("total"),
+                )
+                .where(ClassMemberModel.class_uuid.in_(class_uuids))
+                .group_by(ClassMemberModel.class_uuid),
+                select(
+                    literal("assignment"), AssignmentModel.class_uuid, func.count()
+                )
+                .where(AssignmentModel.class_uuid.in_(class_uuids))
+                .group_by(AssignmentModel.class_uuid),
+            )
+            for kind, class_uuid, count in (await db.execute(counts_stmt)).all():
+                target = member_counts if kind == "member" else assignment_counts
+                target[class_uuid] = count
+    except Exception as e:
+        logger.error("查询用户班级列表失败: %s, 错误: %s", user_uuid, e)
+        raise exceptions.DatabaseQueryError("查询班级列表失败") from e
+
+    items = [
+        MyClassData(
+            class_uuid=row.class_uuid,
+            class_name=row.class_name,
+            description=row.description,
+            teacher_uuid=row.teacher_uuid,
+            role=row.role,
+            joined_at=_as_utc(row.joined_at) if row.joined_at else None,
+            member_count=member_counts.get(row.class_uuid, 0),
+            assignment_count=assignment_counts.get(row.class_uuid, 0),
+        ).model_dump(mode="json")
+        for row in rows
+    ]
+    return {
+        "items": items,
+        "pagination": {
+            "page": page,
+            "size": size,
+            "total": total,
+            "pages": (total + size - 1) // size,
+        },
+    }
+
+
+async def get_my_classes(
+    db: AsyncSession, principal: Principal, page: int, size: int
+) -> dict:
+    """
+    获取当前用户所在（加入或任教）的班级列表，按加入时间倒序分页。
+
+    主要流程：
+    1. 读取该用户当前版本的列表缓存（按页缓存，各页共享版本号）。
+    2. 未命中时分批查询成员关系、班级与计数（见 _load_my_classes），并按读取时的版本写回。
+
+    参数：
+        db (AsyncSession): 异步数据库会话。
+        principal (Principal): 当前用户的身份对象。
+        page (int): 页码，从 1 开始。
+        size (int): 每页条数。
+
+    返回：
+        dict: PageData 的 JSON 形式，items 为 MyClassData 列表。
+
+    异常：
+        - DatabaseQueryError: 数据库查询失败。
+    """
+    variant = f"{page}:{size}"
+    version, data = await user_classes_cache.get(principal.uuid, variant)
+    if data is None:
+        data = await _load_my_classes(db, principal.uuid, page, size)
+        await user_classes_cache.set(principal.uuid, version, data, variant)
+    return data
+
+
+def encode_deadline_cursor(deadline: datetime, assignment_uuid: str) -> str:
+    """把 (截止时间, 作业 UUID) 编码为不透明的分页游标（截止时间统一为 UTC）"""
+    raw = f"{to_utc(deadline).isoformat()}|{assignment_uuid}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_deadline_cursor(cursor: str) -> tuple[datetime, str]:
+    """
+    解析分页游标
+
+    异常:
+        InvalidParameter: 游标格式错误
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        deadline, _, assignment_uuid = raw.partition("|")
+        if not assignment_uuid:
+            raise ValueError(raw)
+        # 数据库中的 deadline 为 UTC，键集比较前游标也必须转换为 UTC，否则跨时区偏移时会跳页或重复
+        return to_utc(datetime.fromisoformat(deadline)), assignment_uuid
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise exceptions.InvalidParameter("无效的分页游标") from e
+
+
+async def _load_deadline_feed(
+    db: AsyncSession, user_uuid: str, cursor: Optional[str], size: int
+) -> dict:
+    """
+    单条查询：成员关系 JOIN 作业（走 (class_uuid, deadline) 索引）JOIN 班级，
+    按 (deadline, uuid) 做键集分页，多取一条用于判断是否还有下一页。
+    """
+    stmt = (
+        select(
+            AssignmentModel.uuid,
+            AssignmentModel.title,
+            AssignmentModel.status,
+            AssignmentModel.deadline,
+            AssignmentModel.class_uuid,
+            ClassModel.class_name,
+        )
+        .join(
+            ClassMemberModel,
+            ClassMemberModel.class_uuid == AssignmentModel.class_uuid,
+        )
+        .join(ClassModel, ClassModel.class_uuid == AssignmentModel.class_uuid)
+        .where(
+            ClassMemberModel.user_uuid == user_uuid,
+            AssignmentModel.status == FEED_ASSIGNMENT_STATUS,
+            # deadline 按 UTC 存储（见 create_assignment）
+            AssignmentModel.deadline >= datetime.now(timezone.utc),
+        )
+        .order_by(AssignmentModel.deadline, AssignmentModel.uuid)
+        .limit(size + 1)
+    )
+    if cursor:
+        deadline, assignment_uuid = decode_deadline_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(AssignmentModel.deadline, AssignmentModel.uuid)
+            > tuple_(deadline, assignment_uuid)
+        )
+    try:
+        rows = (await db.execute(stmt)).all()
+    except Exception as e:
+        logger.error("查询截止提醒失败: %s, 错误: %s", user_uuid, e)
+        raise exceptions.DatabaseQueryError("查询截止提醒失败") from e
+
+    page, has_more = rows[:size], len(rows) > size
+    next_cursor = None
+    if has_more:
+        last = page[-1]
+        next_cursor = encode_deadline_cursor(last.deadline, last.uuid)
+    return DeadlineFeedData(
+        items=[
+            DeadlineItemData(
+                uuid=row.uuid,
+                title=row.title,
+                status=row.status,
+                deadline=_as_utc(row.deadline),
+                class_uuid=row.class_uuid,
+                class_name=row.class_name,
+            )
+            for row in page
+        ],
+        next_cursor=next_cursor,
+    ).model_dump(mode="json")
+
+
+async def get_deadline_feed(
+    db: AsyncSession, principal: Principal, cursor: Optional[str], size: int
+) -> dict:
+    """
+    获取当前用户所在全部班级中即将截止的已发布作业，按截止时间升序，键集分页。
+
+    主要流程：
+    1. 读取该用户当前版本的缓存（按游标与页大小区分）。
+    2. 未命中时执行单条 JOIN 查询（见 _load_deadline_feed），并按读取时的版本写回。
+    3. 命中缓存时剔除缓存期间已经截止的作业。
+
+    参数：
+        db (AsyncSession): 异步数据库会话。
+        principal (Principal): 当前用户的身份对象。
+        cursor (Optional[str]): 上一页返回的 next_cursor，首页为空。
+        size (int): 每页条数。
+
+    返回：
+        dict: DeadlineFeedData 的 JSON 形式。
+
+    异常：
+        - InvalidParameter: 游标格式错误。
+        - DatabaseQueryError: 数据库查询失败。
+    """
+    variant = f"{cursor or ''}:{size}"
+    version, feed = await deadline_feed_cache.get(principal.uuid, variant)
+    if feed is None:
+        feed = await _load_deadline_feed(db, principal.uuid, cursor, size)
+        await deadline_feed_cache.set(principal.uuid, version, feed, variant)
+    else:
+        now = datetime.now(timezone.utc)
+        feed["items"] = [
+            item for item in feed["items"] if _as_utc(item["deadline"]) >= now
+        ]
+    return feed
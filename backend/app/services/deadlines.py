@@ -0,0 +1,258 @@
+import asyncio
+import heapq
+import logging
+import secrets
+import time
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+from core.config import settings
+from core.metrics import registry
+from core.redis import REDIS_UNAVAILABLE_ERRORS, redis_client
+from db.connector import DatabaseConnector
+from models.class_model import AssignmentModel
+from utils.dates import to_utc
+
+"""
+services.deadlines 模块
+
+作业截止调度：已发布且不允许迟交的作业在截止时间到达后自动变为 closed。
+
+- 启动时（lifespan）从数据库加载 DEADLINE_RELOAD_INTERVAL * 2 时间窗口内（以及已经逾期）
+  需要关闭的作业，按截止时间放入最小堆；之后每个周期重新加载一次，
+  其他 worker 创建的作业最迟在一个周期内被纳入调度。
+- 本进程创建的作业通过 schedule() 立即加入堆，早于当前最近截止时间时唤醒调度任务。
+- 到期时把同一时刻到期的作业合并，按 DEADLINE_BATCH_SIZE 分批执行
+  UPDATE ... WHERE uuid IN (...) AND status = 'published' AND deadline <= now，
+  条件更新保证重复执行不会产生副作用。
+- 多 worker 通过 Redis 锁（SET NX PX）协调，同一时刻只有一个 worker 执行关闭；
+  未拿到锁的 worker 稍后重试（届时通常已被关闭，UPDATE 影响 0 行）。
+  Redis 不可用时不加锁直接执行，依赖条件更新保证正确性。
+- 关闭后使对应班级的聚合缓存失效（看板中的按状态计数）。
+"""
+
+logger = logging.getLogger("services.deadlines")
+
+PUBLISHED_STATUS = "published"
+CLOSED_STATUS = "closed"
+
+LOCK_KEY = "lock:deadline-scheduler"
+# 未拿到锁时的重试间隔（秒）
+LOCK_RETRY_DELAY = 1.0
+
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+ASSIGNMENTS_CLOSED = registry.counter(
+    "assignments_closed_total", "截止调度自动关闭的作业数"
+)
+DEADLINES_PENDING = registry.gauge(
+    "deadline_scheduler_pending", "调度堆中等待截止的作业数"
+)
+
+_table = AssignmentModel.__table__
+
+
+def _timestamp(value: datetime) -> float:
+    # SQLite 返回的时间不带时区，按 UTC 处理
+    return to_utc(value).timestamp()
+
+
+class DeadlineScheduler:
+    """
+    作业截止调度器
+
+    参数:
+        reload_interval (float): 从数据库重新加载的间隔（秒），加载窗口为其两倍
+        batch_size (int): 单条 UPDATE 包含的最大作业数
+        lock_ttl (int): Redis 锁的有效期（秒），需大于单次关闭的耗时
+    """
+
+    def __init__(self, reload_interval: float, batch_size: int, lock_ttl: int):
+        self.reload_interval = reload_interval
+        self.batch_size = batch_size
+        self.lock_ttl = lock_ttl
+        self._heap: list[tuple[float, str, str]] = []
+        # 作业 UUID -> 当前有效的截止时间戳；堆中过时的条目在弹出时跳过
+        self._deadlines: dict[str, float] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._release = redis_client.register_script(_RELEASE_SCRIPT)
+
+    @property
+    def pending(self) -> int:
+        return len(self._deadlines)
+
+    def _push(self, deadline: float, assignment_uuid: str, class_uuid: str):
+        if self._deadlines.get(assignment_uuid) == deadline:
+            return
+        self._deadlines[assignment_uuid] = deadline
+        heapq.heappush(self._heap, (deadline, assignment_uuid, class_uuid))
+
+    def schedule(self, assignment_uuid: str, class_uuid: str, deadline: datetime):
+        """
+        把新发布的作业加入调度（创建作业提交事务后调用）
+
+        deadline 应与写入数据库的值一致（UTC，不带时区按 UTC 处理）：到期后的
+        UPDATE ... deadline <= now 以数据库中的值为准，存储为非 UTC 墙上时间时会关闭不到。
+        """
+        timestamp = _timestamp(deadline)
+        if time.time() + self.reload_interval * 2 < timestamp:
+            return  # 超出加载窗口，由之后的周期加载负责
+        earliest = self._heap[0][0] if self._heap else None
+        self._push(timestamp, assignment_uuid, class_uuid)
+        DEADLINES_PENDING.set(self.pending)
+        if earliest is None or timestamp < earliest:
+            self._wakeup.set()
+
+    async def load(self):
+        """从数据库加载加载窗口内需要关闭的作业，重建调度堆"""
+        horizon = datetime.now(timezone.utc) + timedelta(
+            seconds=self.reload_interval * 2
+        )
+        stmt = select(
+            AssignmentModel.uuid, AssignmentModel.class_uuid, AssignmentModel.deadline
+        ).where(
+            AssignmentModel.status == PUBLISHED_STATUS,
+            AssignmentModel.allow_late_submission.is_not(True),
+            AssignmentModel.deadline <= horizon,
+        )
+        async with DatabaseConnector.engine.connect() as conn:
+            rows = (await conn.execute(stmt)).all()
+        self._heap, self._deadlines = [], {}
+        for row in rows:
+            self._push(_timestamp(row.deadline), row.uuid, row.class_uuid)
+        DEADLINES_PENDING.set(self.pending)
+        logger.debug("截止调度已加载 %d 个作业", len(rows))
+
+    def _pop_due(self, now: float) -> list[tuple[str, str]]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, assignment_uuid, class_uuid = heapq.heappop(self._heap)
+            if self._deadlines.get(assignment_uuid) != deadline:
+                continue  # 已被更新的截止时间取代
+            del self._deadlines[assignment_uuid]
+            due.append((assignment_uuid, class_uuid))
+        DEADLINES_PENDING.set(self.pending)
+        return due
+
+    async def _acquire_lock(self) -> str | None:
+        """获取 Redis 锁，返回锁令牌；被其他 worker 持有时返回 None"""
+        token = secrets.token_hex(8)
+        try:
+            acquired = await redis_client.set(
+                LOCK_KEY, token, nx=True, px=self.lock_ttl * 1000
+            )
+        except REDIS_UNAVAILABLE_ERRORS as e:
+            logger.warning("截止调度锁不可用，直接执行关闭: %s", e)
+            return ""
+        return token if acquired else None
+
+    async def _release_lock(self, token: str):
+        if not token:
+            return
+        try:
+            await self._release(keys=[LOCK_KEY], args=[token])
+        except REDIS_UNAVAILABLE_ERRORS as e:
+            logger.warning(
+                "释放截止调度锁失败，将在 %d 秒后自动过期: %s", self.lock_ttl, e
+            )
+
+    async def close_due(self, due: list[tuple[str, str]]) -> int:
+        """批量关闭到期作业，返回实际关闭的数量"""
+        now = datetime.now(timezone.utc)
+        closed_classes: set[str] = set()
+        closed = 0
+        async with DatabaseConnector.engine.begin() as conn:
+            for start in range(0, len(due), self.batch_size):
+                batch = due[start : start + self.batch_size]
+                stmt = (
+                    _table.update()
+                    .where(
+                        _table.c.uuid.in_([uuid for uuid, _ in batch]),
+                        _table.c.status == PUBLISHED_STATUS,
+                        _table.c.deadline <= now,
+                    )
+                    .values(status=CLOSED_STATUS, updated_at=now)
+                    .returning(_table.c.class_uuid)
+                )
+                class_uuids = (await conn.execute(stmt)).scalars().all()
+                closed += len(class_uuids)
+                closed_classes.update(class_uuids)
+        if closed:
+            ASSIGNMENTS_CLOSED.inc(closed)
+            logger.info("已自动关闭 %d 个到期作业", closed)
+            # 延迟导入：services.classes 在创建作业时依赖本模块
+            from services.classes import invalidate_class_cache
+
+            for class_uuid in closed_classes:
+                await invalidate_class_cache(class_uuid)
+        return closed
+
+    async def _fire(self, due: list[tuple[str, str]]):
+        token = await self._acquire_lock()
+        if token is None:
+            # 其他 worker 正在关闭：稍后重试，届时条件更新通常影响 0 行
+            retry_at = time.time() + LOCK_RETRY_DELAY
+            for assignment_uuid, class_uuid in due:
+                self._push(retry_at, assignment_uuid, class_uuid)
+            return
+        try:
+            await self.close_due(due)
+        except Exception as e:
+            logger.error("关闭到期作业失败，稍后重试: %s", e)
+            retry_at = time.time() + LOCK_RETRY_DELAY * 5
+            for assignment_uuid, class_uuid in due:
+                self._push(retry_at, assignment_uuid, class_uuid)
+        finally:
+            await self._release_lock(token)
+
+    async def _run(self):
+        next_reload = time.monotonic() + self.reload_interval
+        while True:
+            timeout = next_reload - time.monotonic()
+            if self._heap:
+                timeout = min(timeout, self._heap[0][0] - time.time())
+            if timeout > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            due = self._pop_due(time.time())
+            if due:
+                await asyncio.shield(self._fire(due))
+            if time.monotonic() >= next_reload:
+                try:
+                    await self.load()
+                except Exception as e:
+                    logger.error("重新加载截止调度失败: %s", e)
+                next_reload = time.monotonic() + self.reload_interval
+
+    async def start(self):
+        """加载调度堆并启动后台任务（在 lifespan 中、数据库初始化之后调用）"""
+        if self._task is None:
+            try:
+                await self.load()
+            except Exception as e:
+                logger.error("加载截止调度失败，将在下个周期重试: %s", e)
+            self._task = asyncio.create_task(self._run(), name="deadline-scheduler")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+deadline_scheduler = DeadlineScheduler(
+    settings.deadline_reload_interval,
+    settings.deadline_batch_size,
+    settings.deadline_lock_ttl,
+)
@@ -0,0 +1,526 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional
+from sqlalchemy import and_, desc, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core import exceptions
+from core.config import settings
+from core.metrics import registry
+from core.principal import Principal
+from db.connector import DatabaseConnector
+from models.job import JobModel
+
+"""
+services.jobs 模块
+
+后台任务：批量导入导出、级联删除等耗时操作由请求入队（jobs 表），立即返回任务 ID，
+客户端通过 GET /jobs/{job_id} 轮询状态与进度。
+
+- 任务类型用 @job_type(name, concurrency=..., max_attempts=...) 注册处理函数，
+  处理函数签名为 async (ctx: JobContext, payload: dict) -> dict | None，返回值作为任务结果保存。
+- 每个进程在 lifespan 中启动 JOB_WORKERS 个 worker 协程，空闲时按 JOB_POLL_INTERVAL 轮询，
+  本进程入队时立即唤醒。JOB_WORKERS=0 时本进程只入队、不执行。
+- 领取任务为条件 UPDATE（status = 'queued' 且已到 run_at，或执行租约已过期），
+  多进程同时领取时只有一个成功；执行期间定期续约（JOB_LEASE 的三分之一），
+  进程崩溃后租约过期，任务由其他 worker 重新领取。
+- 每种任务类型有独立的信号量限制本进程内的并发数，某类任务占满时不影响其他类型的领取。
+- 失败后按 JOB_RETRY_BASE_DELAY * 2^(n-1) 退避重试（不超过 JOB_RETRY_MAX_DELAY），
+  达到 max_attempts 后标记为 failed；单次执行超过 timeout 按失败处理。
+- 状态更新都带上 attempts 条件：租约丢失后旧的执行者写不回结果，不会覆盖新一次执行。
+- 应用关闭时等待进行中的任务完成（最多 timeout 秒），超时则取消并放回队列，不计入重试次数。
+
+说明:
+    任务可能被执行多次（重试、租约过期后重新领取），处理函数需要保证幂等。
+"""
+
+logger = logging.getLogger("services.jobs")
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# 单次领取时查看的候选任务数
+CLAIM_CANDIDATES = 20
+# 错误信息最大保存长度
+MAX_ERROR_LENGTH = 1000
+
+JOBS_FINISHED = registry.counter(
+    "jobs_finished_total",
+    "后台任务执行结束次数（按类型与结果：succeeded / failed / retried / requeued）",
+    ("type", "result"),
+)
+JOB_DURATION = registry.histogram(
+    "job_duration_seconds", "后台任务单次执行耗时", ("type",)
+)
+JOBS_RUNNING = registry.gauge(
+    "jobs_running", "当前进程中正在执行的后台任务数", ("type",)
+)
+
+_table = JobModel.__table__
+
+JobHandler = Callable[["JobContext", dict], Awaitable[Optional[dict]]]
+
+
+@dataclass
+class JobType:
+    """已注册的任务类型"""
+
+    name: str
+    handler: JobHandler
+    concurrency: int
+    max_attempts: int
+    timeout: float
+    semaphore: asyncio.Semaphore
+
+
+_job_types: dict[str, JobType] = {}
+
+
+def job_type(
+    name: str,
+    *,
+    concurrency: int = 1,
+    max_attempts: int = 3,
+    timeout: Optional[float] = None,
+):
+    """
+    注册任务处理函数的装饰器
+
+    参数:
+        name (str): 任务类型名称（如 "class.delete"）
+        concurrency (int): 本进程内该类型的最大并发数
+        max_attempts (int): 最大执行次数（含首次）
+        timeout (float): 单次执行超时（秒），默认 JOB_TIMEOUT
+    """
+
+    def decorator(handler: JobHandler) -> JobHandler:
+        if name in _job_types:
+            raise ValueError(f"任务类型重复注册: {name}")
+        _job_types[name] = JobType(
+            name=name,
+            handler=handler,
+            concurrency=concurrency,
+            max_attempts=max_attempts,
+            timeout=timeout or settings.job_timeout,
+            semaphore=asyncio.Semaphore(concurrency),
+        )
+        return handler
+
+    return decorator
+
+
+class JobLeaseLost(Exception):
+    """任务租约已过期并被其他 worker 重新领取，当前执行应当停止"""
+
+
+class JobContext:
+    """
+    任务执行上下文，传给处理函数
+
+    属性:
+        job_id (str): 任务 UUID
+        attempt (int): 当前是第几次执行（从 1 开始）
+        created_by (str | None): 创建者 UUID
+    """
+
+    def __init__(self, runner: "JobRunner", job_id: str, attempt: int, created_by):
+        self._runner = runner
+        self.job_id = job_id
+        self.attempt = attempt
+        self.created_by = created_by
+        self.lease_lost = False
+
+    async def progress(self, value: int, message: Optional[str] = None):
+        """
+        更新任务进度（0 ~ 100）并续约
+
+        异常:
+            JobLeaseLost: 任务已被其他 worker 接管
+        """
+        updated = await self._runner._update(
+            self,
+            progress=max(0, min(int(value), 100)),
+            progress_message=message[:200] if message else message,
+            lease_until=self._runner._lease_deadline(),
+        )
+        if not updated:
+            self.lease_lost = True
+            raise JobLeaseLost(self.job_id)
+
+
+def _claimable(now: datetime):
+    return or_(
+        and_(_table.c.status == QUEUED, _table.c.run_at <= now),
+        and_(_table.c.status == RUNNING, _table.c.lease_until < now),
+    )
+
+
+def _error_text(error: BaseException) -> str:
+    return f"{type(error).__name__}: {error}"[:MAX_ERROR_LENGTH]
+
+
+class JobRunner:
+    """
+    后台任务 worker 池
+
+    参数:
+        workers (int): 本进程的 worker 协程数，0 表示只入队不执行
+        poll_interval (float): 空闲时轮询数据库的间隔（秒）
+        lease (float): 执行租约时长（秒）
+        retry_base_delay (float): 首次重试的退避时间（秒），之后每次翻倍
+        retry_max_delay (float): 退避时间上限（秒）
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        poll_interval: float,
+        lease: float,
+        retry_base_delay: float,
+        retry_max_delay: float,
+    ):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        self._stopping = False
+
+    def _lease_deadline(self) -> datetime:
+        return datetime.now(timezone.utc) + timedelta(seconds=self.lease)
+
+    def retry_delay(self, attempt: int) -> float:
+        """第 attempt 次执行失败后的退避时间（秒）"""
+        return min(self.retry_base_delay * 2 ** (attempt - 1), self.retry_max_delay)
+
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        type_name: str,
+        payload: Optional[dict] = None,
+        created_by: Optional[str] = None,
+    ) -> JobModel:
+        """
+        创建任务并唤醒本进程的 worker
+
+        异常:
+            ValueError: 任务类型未注册
+            DatabaseQueryError: 写入数据库失败
+        """
+        spec = _job_types.get(type_name)
+        if spec is None:
+            raise ValueError(f"未注册的任务类型: {type_name}")
+        now = datetime.now(timezone.utc)
+        job = JobModel(
+            type=type_name,
+            status=QUEUED,
+            payload=payload or {},
+            progress=0,
+            attempts=0,
+            max_attempts=spec.max_attempts,
+            created_by=created_by,
+            created_at=now,
+            run_at=now,
+        )
+        db.add(job)
+        try:
+            await db.commit()
+            await db.refresh(job)
+        except Exception as e:
+            await db.rollback()
+            logger.error("创建后台任务失败: type=%s, 错误: %s", type_name, e)
+            raise exceptions.DatabaseQueryError("创建任务失败") from e
+        self._wakeup.set()
+        logger.info("后台任务已入队: %s type=%s", job.id, type_name)
+        return job
+
+    async def _update(self, ctx: JobContext, **values) -> bool:
+        """更新本次执行的任务记录；任务已被接管时不更新，返回 False"""
+        stmt = (
+            _table.update()
+            .where(
+                _table.c.id == ctx.job_id,
+                _table.c.status == RUNNING,
+                _table.c.attempts == ctx.attempt,
+            )
+            .values(**values)
+        )
+        async with DatabaseConnector.engine.begin() as conn:
+            result = await conn.execute(stmt)
+        return result.rowcount == 1
+
+    async def _claim(self):
+        """领取一个可执行的任务，返回 (任务行, 任务类型)；成功时已占用该类型的信号量"""
+        available = [
+            name for name, spec in _job_types.items() if not spec.semaphore.locked()
+        ]
+        if not available:
+            return None
+        now = datetime.now(timezone.utc)
+        stmt = (
+            select(_table.c.id, _table.c.type)
+            .where(_claimable(now), _table.c.type.in_(available))
+            .order_by(_table.c.run_at)
+            .limit(CLAIM_CANDIDATES)
+        )
+        async with DatabaseConnector.engine.connect() as conn:
+            candidates = (await conn.execute(stmt)).all()
+        for candidate in candidates:
+            spec = _job_types[candidate.type]
+            if spec.semaphore.locked():
+                continue
+            await spec.semaphore.acquire()
+            stmt = (
+                _table.update()
+                .where(_table.c.id == candidate.id, _claimable(now))
+                .values(
+                    status=RUNNING,
+                    attempts=_table.c.attempts + 1,
+                    started_at=now,
+                    lease_until=self._lease_deadline(),
+                )
+                .returning(
+                    _table.c.id,
+                    _table.c.payload,
+                    _table.c.attempts,
+                    _table.c.max_attempts,
+                    _table.c.created_by,
+                )
+            )
+            try:
+                async with DatabaseConnector.engine.begin() as conn:
+                    row = (await conn.execute(stmt)).first()
+            except BaseException:
+                spec.semaphore.release()
+                raise
+            if row is not None:
+                return row, spec
+            spec.semaphore.release()  # 已被其他 worker 领取
+        return None
+
+    async def _heartbeat(self, ctx: JobContext, handler: asyncio.Task):
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            try:
+                alive = await self._update(ctx, lease_until=self._lease_deadline())
+            except Exception as e:
+                logger.warning("任务续约失败: %s, 错误: %s", ctx.job_id, e)
+                continue
+            if not alive:
+                logger.warning("任务租约已丢失，停止本次执行: %s", ctx.job_id)
+                ctx.lease_lost = True
+                handler.cancel()
+                return
+
+    async def _fail(self, ctx: JobContext, max_attempts: int, spec: JobType, error: str):
+        now = datetime.now(timezone.utc)
+        if ctx.attempt < max_attempts:
+            delay = self.retry_delay(ctx.attempt)
+            updated = await self._update(
+                ctx,
+                status=QUEUED,
+                run_at=now + timedelta(seconds=delay),
+                lease_until=None,
+                error=error,
+            )
+            result = "retried"
+            logger.warning(
+                "后台任务失败，%.1f 秒后重试（第 %d/%d 次）: %s type=%s 错误: %s",
+                delay,
+                ctx.attempt,
+                max_attempts,
+                ctx.job_id,
+                spec.name,
+                error,
+            )
+        else:
+            updated = await self._update(
+                ctx, status=FAILED, finished_at=now, lease_until=None, error=error
+            )
+            result = "failed"
+            logger.error(
+                "后台任务失败，已达到最大执行次数: %s type=%s 错误: %s",
+                ctx.job_id,
+                spec.name,
+                error,
+            )
+        if updated:
+            JOBS_FINISHED.labels(spec.name, result).inc()
+
+    async def _requeue(self, ctx: JobContext, spec: JobType):
+        """关闭时取消的任务放回队列，不计入执行次数"""
+        updated = await self._update(
+            ctx,
+            status=QUEUED,
+            attempts=ctx.attempt - 1,
+            run_at=datetime.now(timezone.utc),
+            lease_until=None,
+        )
+        if updated:
+            JOBS_FINISHED.labels(spec.name, "requeued").inc()
+            logger.warning("应用关闭，任务已放回队列: %s type=%s", ctx.job_id, spec.name)
+
+    async def _execute(self, row, spec: JobType):
+        ctx = JobContext(self, row.id, row.attempts, row.created_by)
+        logger.info(
+            "开始执行后台任务: %s type=%s 第 %d 次", ctx.job_id, spec.name, ctx.attempt
+        )
+        JOBS_RUNNING.labels(spec.name).inc()
+        start = time.perf_counter()
+        handler = asyncio.create_task(spec.handler(ctx, row.payload or {}))
+        heartbeat = asyncio.create_task(self._heartbeat(ctx, handler))
+        try:
+            result = await asyncio.wait_for(handler, spec.timeout)
+        except asyncio.CancelledError:
+            if not ctx.lease_lost:
+                await asyncio.shield(self._requeue(ctx, spec))
+                raise
+        except asyncio.TimeoutError:
+            await self._fail(
+                ctx, row.max_attempts, spec, f"执行超时（{spec.timeout:g}s）"
+            )
+        except Exception as e:
+            if not ctx.lease_lost:
+                await self._fail(ctx, row.max_attempts, spec, _error_text(e))
+        else:
+            updated = await self._update(
+                ctx,
+                status=SUCCEEDED,
+                progress=100,
+                result=result,
+                error=None,
+                finished_at=datetime.now(timezone.utc),
+                lease_until=None,
+            )
+            if updated:
+                JOBS_FINISHED.labels(spec.name, SUCCEEDED).inc()
+                logger.info(
+                    "后台任务完成: %s type=%s 耗时 %.2fs",
+                    ctx.job_id,
+                    spec.name,
+                    time.perf_counter() - start,
+                )
+        finally:
+            heartbeat.cancel()
+            JOBS_RUNNING.labels(spec.name).dec()
+            JOB_DURATION.labels(spec.name).observe(time.perf_counter() - start)
+
+    async def _worker(self):
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                claimed = await self._claim()
+            except Exception as e:
+                logger.error("领取后台任务失败: %s", e)
+                claimed = None
+            if claimed is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            row, spec = claimed
+            try:
+                await self._execute(row, spec)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("更新后台任务状态失败: %s, 错误: %s", row.id, e)
+            finally:
+                spec.semaphore.release()
+                self._wakeup.set()  # 释放了并发名额，其他 worker 可以继续领取同类任务
+
+    def start(self):
+        """启动 worker 协程（在 lifespan 中、数据库初始化之后调用）"""
+        if not self._tasks and self.workers > 0:
+            self._stopping = False
+            self._tasks = [
+                asyncio.create_task(self._worker(), name=f"job-worker-{i}")
+                for i in range(self.workers)
+            ]
+
+    async def stop(self, timeout: float = 10):
+        """等待进行中的任务完成（最多 timeout 秒），超时的任务取消并放回队列"""
+        if not self._tasks:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+
+
+job_runner = JobRunner(
+    settings.job_workers,
+    settings.job_poll_interval,
+    settings.job_lease,
+    settings.job_retry_base_delay,
+    settings.job_retry_max_delay,
+)
+
+
+async def get_job(db: AsyncSession, job_id: str, principal: Principal) -> JobModel:
+    """
+    查询任务（管理员可查看全部任务，其他用户只能查看自己创建的任务）
+
+    异常:
+        NotExists: 任务不存在或无权查看
+        DatabaseQueryError: 数据库查询失败
+    """
+    try:
+        job = await db.get(JobModel, job_id)
+    except Exception as e:
+        logger.error("查询后台任务失败: %s, 错误: %s", job_id, e)
+        raise exceptions.DatabaseQueryError("查询任务失败") from e
+    if job is None or (not principal.is_admin and job.created_by != principal.uuid):
+        raise exceptions.NotExists(uuid=job_id)
+    return job
+
+
+async def list_jobs(
+    db: AsyncSession,
+    principal: Principal,
+    status: Optional[str],
+    type_name: Optional[str],
+    page: int,
+    size: int,
+) -> tuple[list[JobModel], int]:
+    """
+    分页查询任务（按创建时间倒序），非管理员只返回自己创建的任务
+
+    返回:
+        tuple: (items, total)
+
+    异常:
+        DatabaseQueryError: 数据库查询失败
+    """
+    conditions = []
+    if not principal.is_admin:
+        conditions.append(JobModel.created_by == principal.uuid)
+    if status:
+        conditions.append(JobModel.status == status)
+    if type_name:
+        conditions.append(JobModel.type == type_name)
+    stmt = (
+        select(JobModel)
+        .where(*conditions)
+        .order_by(desc(JobModel.created_at))
+        .offset((page - 1) * size)
+        .limit(size)
+    )
+    count_stmt = select(func.count()).select_from(JobModel).where(*conditions)
+    try:
+        items = (await db.execute(stmt)).scalars().all()
+        total = (await db.execute(count_stmt)).scalar_one()
+    except Exception as e:
+        logger.error("查询后台任务列表失败: %s", e)
+        raise exceptions.DatabaseQueryError("查询任务失败") from e
+    return items, total
@@ -0,0 +1,246 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import desc, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from core import exceptions
+from core.config import settings
+from core.metrics import registry
+from db.connector import DatabaseConnector
+from models.class_model import ClassMemberModel
+from models.notification import NotificationModel
+
+"""
+services.notifications 模块
+
+站内通知：事件入队，后台任务批量扇出到每个用户的收件箱（notifications 表）。
+
+- 发布作业等操作只调用 publish()，把事件放入进程内有界队列后立即返回，
+  请求耗时与班级人数无关。
+- 后台任务逐个取出事件，查询接收人（班级内的学生），按 NOTIFICATION_BATCH_SIZE
+  分批 executemany INSERT，每批一个事务，避免长时间占用 SQLite 写锁。
+- 队列满时丢弃新事件并记录错误日志与 notifications_dropped_total 指标，不阻塞请求。
+- 应用关闭时（lifespan）等待队列中剩余的事件处理完成，再释放数据库引擎。
+
+说明:
+    队列在进程内存中，worker 异常退出时未处理的事件会丢失；通知属于尽力送达的数据，
+    不影响作业本身的创建。
+"""
+
+logger = logging.getLogger("services.notifications")
+
+NOTIFICATIONS_CREATED = registry.counter(
+    "notifications_created_total", "写入收件箱的通知数", ("kind",)
+)
+NOTIFICATIONS_DROPPED = registry.counter(
+    "notifications_dropped_total", "因队列已满被丢弃的通知事件数", ("kind",)
+)
+NOTIFICATION_QUEUE_SIZE = registry.gauge(
+    "notification_queue_size", "等待扇出的通知事件数"
+)
+
+_table = NotificationModel.__table__
+
+
+@dataclass
+class NotificationEvent:
+    """待扇出的通知事件：发送给 class_uuid 班级中角色为 recipient_role 的成员"""
+
+    kind: str
+    class_uuid: str
+    title: str
+    body: Optional[str] = None
+    assignment_uuid: Optional[str] = None
+    recipient_role: str = "student"
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class NotificationDispatcher:
+    """
+    通知扇出器
+
+    参数:
+        queue_size (int): 事件队列容量
+        batch_size (int): 单条 INSERT 包含的最大通知数
+    """
+
+    def __init__(self, queue_size: int, batch_size: int):
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self._queue: asyncio.Queue[NotificationEvent] | None = None
+        self._task: asyncio.Task | None = None
+
+    def publish(self, event: NotificationEvent) -> bool:
+        """事件入队，立即返回；未启动或队列已满时丢弃并返回 False"""
+        if self._queue is None:
+            logger.warning("通知服务未启动，丢弃事件: %s", event.kind)
+            NOTIFICATIONS_DROPPED.labels(event.kind).inc()
+            return False
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.error(
+                "通知队列已满，丢弃事件: kind=%s class=%s", event.kind, event.class_uuid
+            )
+            NOTIFICATIONS_DROPPED.labels(event.kind).inc()
+            return False
+        NOTIFICATION_QUEUE_SIZE.set(self._queue.qsize())
+        return True
+
+    async def _recipients(self, event: NotificationEvent) -> list[str]:
+        stmt = select(ClassMemberModel.user_uuid).where(
+            ClassMemberModel.class_uuid == event.class_uuid,
+            ClassMemberModel.role == event.recipient_role,
+        )
+        async with DatabaseConnector.engine.connect() as conn:
+            return list((await conn.execute(stmt)).scalars())
+
+    async def deliver(self, event: NotificationEvent) -> int:
+        """把一个事件扇出到接收人的收件箱，返回写入的通知数"""
+        recipients = await self._recipients(event)
+        for start in range(0, len(recipients), self.batch_size):
+            rows = [
+                {
+                    "user_uuid": user_uuid,
+                    "kind": event.kind,
+                    "title": event.title,
+                    "body": event.body,
+                    "class_uuid": event.class_uuid,
+                    "assignment_uuid": event.assignment_uuid,
+                    "created_at": event.created_at,
+                }
+                for user_uuid in recipients[start : start + self.batch_size]
+            ]
+            async with DatabaseConnector.engine.begin() as conn:
+                await conn.execute(_table.insert(), rows)
+        NOTIFICATIONS_CREATED.labels(event.kind).inc(len(recipients))
+        logger.debug(
+            "通知已扇出: kind=%s class=%s 接收人 %d",
+            event.kind,
+            event.class_uuid,
+            len(recipients),
+        )
+        return len(recipients)
+
+    async def _run(self):
+        while True:
+            event = await self._queue.get()
+            try:
+                # shield：关闭时取消任务不会打断进行中的写入
+                await asyncio.shield(self.deliver(event))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("通知扇出失败: kind=%s 错误: %s", event.kind, e)
+            finally:
+                self._queue.task_done()
+                NOTIFICATION_QUEUE_SIZE.set(self._queue.qsize())
+
+    def start(self):
+        """启动后台扇出任务（在 lifespan 中调用）"""
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._task = asyncio.create_task(self._run(), name="notification-fanout")
+
+    async def stop(self, timeout: float = 10):
+        """等待队列中剩余的事件处理完成（最多 timeout 秒）后停止，在释放数据库引擎之前调用"""
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.error("关闭前仍有 %d 个通知事件未处理，已丢弃", self._queue.qsize())
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._queue = None
+
+
+notification_dispatcher = NotificationDispatcher(
+    settings.notification_queue_size, settings.notification_batch_size
+)
+
+
+async def list_notifications(
+    db: AsyncSession, user_uuid: str, unread_only: bool, page: int, size: int
+) -> tuple[list[NotificationModel], int, int]:
+    """
+    分页查询用户的通知（按时间倒序）。
+
+    返回:
+        tuple: (items, total, unread)
+            - items: 当前页的通知
+            - total: 满足筛选条件的通知总数
+            - unread: 未读通知数
+
+    异常:
+        DatabaseQueryError: 数据库查询失败
+    """
+    stmt = select(NotificationModel).where(NotificationModel.user_uuid == user_uuid)
+    count_stmt = select(
+        func.count().label("total"),
+        func.count().filter(NotificationModel.read_at.is_(None)).label("unread"),
+    ).where(NotificationModel.user_uuid == user_uuid)
+    if unread_only:
+        stmt = stmt.where(NotificationModel.read_at.is_(None))
+    stmt = (
+        stmt.order_by(desc(NotificationModel.id))
+        .offset((page - 1) * size)
+        .limit(size)
+    )
+    try:
+        items = (await db.execute(stmt)).scalars().all()
+        counts = (await db.execute(count_stmt)).one()
+    except Exception as e:
+        logger.error("查询通知失败: %s, 错误: %s", user_uuid, e)
+        raise exceptions.DatabaseQueryError("查询通知失败") from e
+    total = counts.unread if unread_only else counts.total
+    return items, total, counts.unread
+
+
+async def count_unread(db: AsyncSession, user_uuid: str) -> int:
+    """未读通知数（走 (user_uuid, read_at) 索引）"""
+    stmt = (
+        select(func.count())
+        .select_from(NotificationModel)
+        .where(
+            NotificationModel.user_uuid == user_uuid,
+            NotificationModel.read_at.is_(None),
+        )
+    )
+    try:
+        return (await db.execute(stmt)).scalar_one()
+    except Exception as e:
+        logger.error("查询未读通知数失败: %s, 错误: %s", user_uuid, e)
+        raise exceptions.DatabaseQueryError("查询通知失败") from e
+
+
+async def mark_read(
+    db: AsyncSession, user_uuid: str, ids: Optional[list[int]] = None
+) -> int:
+    """把指定的未读通知标记为已读（ids 为 None 时标记全部，空列表不更新），返回更新的条数"""
+    stmt = (
+        update(NotificationModel)
+        .where(
+            NotificationModel.user_uuid == user_uuid,
+            NotificationModel.read_at.is_(None),
+        )
+        .values(read_at=datetime.now(timezone.utc))
+    )
+    if ids is not None:
+        if not ids:
+            return 0
+        stmt = stmt.where(NotificationModel.id.in_(ids))
+    try:
+        result = await db.execute(stmt)
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.error("标记通知已读失败: %s, 错误: %s", user_uuid, e)
+        raise exceptions.DatabaseQueryError("更新通知失败") from e
+    return result.rowcount
@@ -0,0 +1,82 @@
+from datetime import datetime, timezone
+import pytest
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+import models.attachment  # noqa: F401  注册全部表到 Base.metadata
+import models.job  # noqa: F401
+import models.notification  # noqa: F401
+from core.principal import Principal
+from core.redis import resilient_redis
+from db.connector import Base, DatabaseConnector
+from models.user import User
+
+
+@pytest.fixture
+def anyio_backend():
+    """异步测试统一使用 asyncio（anyio 自带的 pytest 插件）"""
+    return "asyncio"
+
+
+@pytest.fixture
+def redis_server():
+    """每个测试独立的 fakeredis 服务端，设置 connected = False 可模拟 Redis 不可用"""
+    return FakeServer()
+
+
+@pytest.fixture
+def redis(redis_server):
+    """连接到 redis_server 的客户端（支持 Lua 脚本，需要 lupa）"""
+    return FakeRedis(server=redis_server, decode_responses=True)
+
+
+@pytest.fixture
+async def engine(monkeypatch, redis):
+    """
+    内存 SQLite 数据库，替换 DatabaseConnector 的引擎与会话工厂；
+    resilient_redis 同时指向 fakeredis，缓存失效等附带操作不依赖本地 Redis。
+    """
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    monkeypatch.setattr(DatabaseConnector, "engine", engine, raising=False)
+    monkeypatch.setattr(
+        DatabaseConnector,
+        "async_session",
+        async_sessionmaker(bind=engine, autoflush=False),
+        raising=False,
+    )
+    monkeypatch.setattr(resilient_redis, "client", redis)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db(engine):
+    async with DatabaseConnector.async_session() as session:
+        yield session
+
+
+@pytest.fixture
+def make_user(db):
+    """创建用户并返回其 Principal（提交后刷新，避免之后访问过期属性）"""
+
+    async def _make_user(uuid: str, role: str = "student") -> Principal:
+        user = User(
+            uuid=uuid,
+            username=uuid,
+            email=f"{uuid}@example.com",
+            role=role,
+            status="active",
+            created_at=datetime.now(timezone.utc),
+            hashed_password="x",
+            profile_name=uuid,
+            avatar_url="",
+        )
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
+        return Principal(user)
+
+    return _make_user
@@ -0,0 +1,57 @@
+import time
+import pytest
+from core.revocation import RevocationList
+from core.sessions import SessionStore
+from models.user import User
+from services import auth
+from services.auth import delete_user, update_user
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def stores(monkeypatch, redis):
+    session_store = SessionStore(redis)
+    revocation_list = RevocationList(redis, token_ttl=1800, resync_interval=60)
+    monkeypatch.setattr(auth, "session_store", session_store)
+    monkeypatch.setattr(auth, "revocation_list", revocation_list)
+    return session_store, revocation_list
+
+
+async def test_disable_user_revokes_sessions(db, make_user, redis, stores):
+    session_store, revocation_list = stores
+    await make_user("u1")
+    await session_store.create("u1", ttl=3600)
+
+    updated = await update_user(db, "u1", "admin", status="disabled")
+
+    assert updated.status == "disabled"
+    assert await redis.get("sess:gen:u1") == "1"
+    assert revocation_list.is_revoked({"uuid": "u1", "iat": time.time() - 1})
+
+
+async def test_delete_user_succeeds_when_redis_is_down(
+    db, make_user, redis_server, stores
+):
+    _, revocation_list = stores
+    await make_user("u1")
+    redis_server.connected = False
+
+    await delete_user(db, "u1")
+
+    assert await db.get(User, "u1") is None
+    # Redis 不可用时访问令牌仍在当前进程内吊销
+    assert revocation_list.is_revoked({"uuid": "u1", "iat": time.time() - 1})
+
+
+async def test_disable_user_succeeds_when_redis_is_down(
+    db, make_user, redis_server, stores
+):
+    _, revocation_list = stores
+    await make_user("u1")
+    redis_server.connected = False
+
+    updated = await update_user(db, "u1", "admin", status="disabled")
+
+    assert updated.status == "disabled"
+    assert revocation_list.is_revoked({"uuid": "u1", "iat": time.time() - 1})
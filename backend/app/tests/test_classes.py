@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import func, select
+from core import exceptions
+from models.class_model import ClassModel
+from services.classes import (
+    create_assignment,
+    create_class,
+    delete_class,
+    get_class,
+    get_class_dashboard,
+    update_class,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_teacher_manages_own_class(db, make_user):
+    teacher = await make_user("t1", role="teacher")
+    new_class = await create_class(db, "C1", "d", teacher.uuid)
+    class_uuid = new_class.class_uuid
+
+    assert (await get_class(db, class_uuid, teacher)).class_name == "C1"
+    await update_class(db, class_uuid, "C1-new", "d2", teacher)
+    await delete_class(db, class_uuid, teacher)
+
+    remaining = await db.scalar(
+        select(func.count()).where(ClassModel.class_uuid == class_uuid)
+    )
+    assert remaining == 0
+
+
+async def test_other_teacher_cannot_delete_class(db, make_user):
+    owner = await make_user("t1", role="teacher")
+    other = await make_user("t2", role="teacher")
+    new_class = await create_class(db, "C1", "d", owner.uuid)
+
+    with pytest.raises(exceptions.InvalidParameter):
+        await delete_class(db, new_class.class_uuid, other)
+
+
+async def test_dashboard_upcoming_lists_only_published(db, make_user):
+    teacher = await make_user("t1", role="teacher")
+    class_uuid = (await create_class(db, "C1", "d", teacher.uuid)).class_uuid
+    deadline = datetime.now(timezone.utc) + timedelta(days=1)
+    for status in ("draft", "published", "closed"):
+        await create_assignment(
+            db,
+            class_uuid,
+            title=status,
+            description="d",
+            content="c",
+            status=status,
+            deadline=deadline,
+            max_score=100,
+            allow_late_submission=True,
+            attachments=[],
+            created_by=teacher.uuid,
+        )
+
+    dashboard = await get_class_dashboard(db, class_uuid, teacher)
+
+    assert dashboard["assignment_total"] == 3
+    assert [item["title"] for item in dashboard["upcoming_deadlines"]] == ["published"]
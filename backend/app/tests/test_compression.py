@@ -0,0 +1,95 @@
+import gzip
+import anyio
+import pytest
+from starlette.responses import FileResponse, JSONResponse, StreamingResponse
+from core.compression import CompressionMiddleware
+
+pytestmark = pytest.mark.anyio
+
+
+def _scope(extensions: dict | None = None) -> dict:
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "query_string": b"",
+        "headers": [(b"accept-encoding", b"gzip")],
+        "extensions": extensions or {},
+    }
+
+
+async def _call(app, scope: dict) -> list[dict]:
+    messages = []
+    requested = False
+
+    async def receive():
+        # 请求体只有一条消息，之后像真实服务器一样一直等待（直到客户端断开）
+        nonlocal requested
+        if requested:
+            await anyio.sleep_forever()
+        requested = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await CompressionMiddleware(app, minimum_size=16)(scope, receive, send)
+    return messages
+
+
+def _headers(message: dict) -> dict:
+    return {k.decode(): v.decode() for k, v in message["headers"]}
+
+
+async def test_compresses_single_body():
+    body = {"items": ["x" * 64] * 16}
+    messages = await _call(JSONResponse(body), _scope())
+
+    assert [m["type"] for m in messages] == [
+        "http.response.start",
+        "http.response.body",
+    ]
+    headers = _headers(messages[0])
+    assert headers["content-encoding"] == "gzip"
+    assert headers["content-length"] == str(len(messages[1]["body"]))
+    assert gzip.decompress(messages[1]["body"]) == JSONResponse(body).body
+
+
+async def test_streaming_response_passes_through():
+    async def chunks():
+        yield b"a" * 64
+        yield b"b" * 64
+
+    messages = await _call(
+        StreamingResponse(chunks(), media_type="text/plain"), _scope()
+    )
+
+    assert "content-encoding" not in _headers(messages[0])
+    assert b"".join(m.get("body", b"") for m in messages[1:]) == b"a" * 64 + b"b" * 64
+
+
+async def test_pathsend_sends_held_start_first(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("x" * 4096)
+    scope = _scope({"http.response.pathsend": {}})
+
+    messages = await _call(FileResponse(path, media_type="text/plain"), scope)
+
+    assert [m["type"] for m in messages] == [
+        "http.response.start",
+        "http.response.pathsend",
+    ]
+    headers = _headers(messages[0])
+    assert "content-encoding" not in headers
+    assert headers["content-length"] == "4096"
+    assert messages[1]["path"] == str(path)
+
+
+async def test_no_body_status_passes_through():
+    headers = {"ETag": '"abc"', "Content-Type": "application/json"}
+    response = JSONResponse(None, status_code=304, headers=headers)
+    messages = await _call(response, _scope())
+
+    assert messages[0]["status"] == 304
+    assert _headers(messages[0])["etag"] == '"abc"'
+    assert "content-encoding" not in _headers(messages[0])
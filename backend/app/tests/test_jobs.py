@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from services import jobs
+from services.jobs import FAILED, QUEUED, RUNNING, SUCCEEDED, JobContext, JobRunner
+
+pytestmark = pytest.mark.anyio
+
+_table = jobs.JobModel.__table__
+
+
+@pytest.fixture
+def runner(engine, monkeypatch):
+    """独立的任务类型注册表与 runner（不启动 worker 协程，测试直接调用领取与执行）"""
+    monkeypatch.setattr(jobs, "_job_types", {})
+    return JobRunner(
+        workers=0, poll_interval=0.05, lease=30, retry_base_delay=60, retry_max_delay=600
+    )
+
+
+async def _claim(runner):
+    claimed = await runner._claim()
+    if claimed is None:
+        return None
+    row, spec = claimed
+    spec.semaphore.release()
+    return row, spec
+
+
+async def _job(engine, job_id):
+    async with engine.connect() as conn:
+        return (await conn.execute(_table.select().where(_table.c.id == job_id))).one()
+
+
+async def _set(engine, job_id, **values):
+    async with engine.begin() as conn:
+        await conn.execute(_table.update().where(_table.c.id == job_id).values(**values))
+
+
+async def test_claimed_job_is_not_claimed_twice(db, engine, runner):
+    @jobs.job_type("test.noop")
+    async def _noop(ctx, payload):
+        return None
+
+    job = await runner.enqueue(db, "test.noop", {"n": 1})
+
+    row, _ = await _claim(runner)
+    assert row.id == job.id and row.attempts == 1 and row.payload == {"n": 1}
+    assert await _claim(runner) is None
+    assert (await _job(engine, job.id)).status == RUNNING
+
+
+async def test_expired_lease_is_reclaimed_and_old_attempt_fenced(db, engine, runner):
+    @jobs.job_type("test.noop")
+    async def _noop(ctx, payload):
+        return None
+
+    job = await runner.enqueue(db, "test.noop")
+    first, _ = await _claim(runner)
+    await _set(
+        engine, job.id, lease_until=datetime.now(timezone.utc) - timedelta(seconds=1)
+    )
+
+    second, _ = await _claim(runner)
+    assert second.attempts == 2
+
+    stale = JobContext(runner, job.id, first.attempts, None)
+    current = JobContext(runner, job.id, second.attempts, None)
+    # 旧的执行者写不回结果，也不能续约
+    assert not await runner._update(stale, status=SUCCEEDED)
+    with pytest.raises(jobs.JobLeaseLost):
+        await stale.progress(50)
+    assert await runner._update(current, progress=10)
+    assert (await _job(engine, job.id)).status == RUNNING
+
+
+async def test_success_saves_result(db, engine, runner):
+    @jobs.job_type("test.ok")
+    async def _ok(ctx, payload):
+        await ctx.progress(50, "half")
+        return {"done": payload["n"]}
+
+    job = await runner.enqueue(db, "test.ok", {"n": 3})
+    await runner._execute(*await _claim(runner))
+
+    saved = await _job(engine, job.id)
+    assert saved.status == SUCCEEDED
+    assert saved.result == {"done": 3}
+    assert saved.progress == 100
+    assert saved.lease_until is None
+
+
+async def test_failed_job_retries_until_max_attempts(db, engine, runner):
+    @jobs.job_type("test.fail", max_attempts=2)
+    async def _fail(ctx, payload):
+        raise RuntimeError(f"boom {ctx.attempt}")
+
+    job = await runner.enqueue(db, "test.fail")
+    await runner._execute(*await _claim(runner))
+
+    saved = await _job(engine, job.id)
+    assert saved.status == QUEUED
+    assert saved.attempts == 1
+    assert saved.error == "RuntimeError: boom 1"
+    # 退避期间不会被领取
+    assert await _claim(runner) is None
+
+    await _set(engine, job.id, run_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+    await runner._execute(*await _claim(runner))
+
+    saved = await _job(engine, job.id)
+    assert saved.status == FAILED
+    assert saved.attempts == 2
+    assert saved.error == "RuntimeError: boom 2"
+    assert saved.finished_at is not None
+    assert await _claim(runner) is None
+
+
+async def test_retry_delay_is_capped(runner):
+    assert [runner.retry_delay(n) for n in (1, 2, 3, 5)] == [60, 120, 240, 600]
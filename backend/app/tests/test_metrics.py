@@ -0,0 +1,46 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from api.v1 import metrics
+from core.exception_handlers import register_exception_handlers
+
+
+@pytest.fixture
+def make_client():
+    app = FastAPI()
+    app.include_router(metrics.router)
+    register_exception_handlers(app)
+
+    def _make_client(host: str = "203.0.113.7") -> TestClient:
+        return TestClient(app, client=(host, 50000))
+
+    return _make_client
+
+
+def test_denied_by_default(make_client, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "")
+    monkeypatch.setattr(metrics, "METRICS_ALLOW_NETWORKS", ())
+
+    assert make_client("127.0.0.1").get("/metrics").status_code == 403
+
+
+def test_allowed_network(make_client, monkeypatch):
+    networks = metrics.parse_networks("10.0.0.0/8, ::1/128")
+    monkeypatch.setattr(metrics, "METRICS_ALLOW_NETWORKS", networks)
+
+    assert make_client("10.1.2.3").get("/metrics").status_code == 200
+    assert make_client("::ffff:10.1.2.3").get("/metrics").status_code == 200
+    assert make_client("203.0.113.7").get("/metrics").status_code == 403
+
+
+def test_bearer_token(make_client, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "s3cret")
+    monkeypatch.setattr(metrics, "METRICS_ALLOW_NETWORKS", ())
+    client = make_client()
+
+    response = client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert client.get("/metrics").status_code == 403
+    wrong = client.get("/metrics", headers={"Authorization": "Bearer nope"})
+    assert wrong.status_code == 403
@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from db.migrate import migrate
+
+pytestmark = pytest.mark.anyio
+
+# 迁移前的旧结构：users 没有 last_seen，assignments 没有截止时间索引，也没有新增的表
+LEGACY_SCHEMA = (
+    """
+    CREATE TABLE users (
+        uuid VARCHAR(36) PRIMARY KEY,
+        username VARCHAR(50) NOT NULL UNIQUE,
+        email VARCHAR(100) NOT NULL UNIQUE,
+        role VARCHAR(20) NOT NULL,
+        status VARCHAR(20) NOT NULL,
+        created_at DATETIME,
+        last_login DATETIME,
+        hashed_password VARCHAR(255) NOT NULL,
+        profile_name VARCHAR(100),
+        avatar_url VARCHAR(255) NOT NULL
+    )
+    """,
+    "CREATE INDEX ix_users_username ON users (username)",
+    "CREATE INDEX ix_users_email ON users (email)",
+    "INSERT INTO users VALUES "
+    "('u1', 'alice', 'a@x', 'student', 'active', NULL, NULL, 'x', 'Alice', '')",
+)
+
+
+def _schema(conn) -> dict:
+    inspector = inspect(conn)
+    return {
+        "tables": set(inspector.get_table_names()),
+        "user_columns": {c["name"] for c in inspector.get_columns("users")},
+        "assignment_indexes": {i["name"] for i in inspector.get_indexes("assignments")},
+    }
+
+
+async def test_migrate_upgrades_legacy_schema(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+    async with engine.begin() as conn:
+        for statement in LEGACY_SCHEMA:
+            await conn.execute(text(statement))
+
+    assert await migrate(engine) > 0
+    async with engine.connect() as conn:
+        schema = await conn.run_sync(_schema)
+        username = (await conn.execute(text("SELECT username FROM users"))).scalar()
+
+    assert {"classes", "jobs", "notifications", "attachments"} <= schema["tables"]
+    assert "last_seen" in schema["user_columns"]
+    assert "ix_assignments_class_deadline" in schema["assignment_indexes"]
+    assert username == "alice"
+    # 已是最新结构时不做任何修改
+    assert await migrate(engine) == 0
+    await engine.dispose()
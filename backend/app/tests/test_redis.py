@@ -0,0 +1,50 @@
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import ResponseError
+from core.local_store import LocalStore
+from core.redis import CircuitBreaker, ResilientRedis
+
+pytestmark = pytest.mark.anyio
+
+
+class FlakyClient:
+    """按预设依次返回结果或抛出异常的 Redis 客户端"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+
+    async def get(self, key):
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+def _open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.is_open
+    return breaker
+
+
+async def test_probe_command_error_does_not_stick():
+    breaker = _open_breaker()
+    client = ResilientRedis(
+        FlakyClient(ResponseError("WRONGTYPE"), "value"), breaker, LocalStore()
+    )
+
+    with pytest.raises(ResponseError):
+        await client.get("key")
+    # 命令错误结束探测后，下一次请求仍会探测并恢复
+    assert await client.get("key") == "value"
+    assert not breaker.is_open
+
+
+async def test_probe_unavailable_falls_back():
+    breaker = _open_breaker()
+    client = ResilientRedis(
+        FlakyClient(RedisConnectionError("down")), breaker, LocalStore()
+    )
+
+    assert await client.get("key") is None
+    assert breaker.is_open
@@ -0,0 +1,43 @@
+import os
+import pickle
+from dataclasses import replace
+from core.config import settings
+from core.server import JitteredConfig, build_options
+
+
+def test_build_options_passes_jitter():
+    config = replace(
+        settings,
+        app_reload=False,
+        app_workers=2,
+        app_max_requests=1000,
+        app_max_requests_jitter=100,
+    )
+    options = build_options(config)
+
+    assert options["limit_max_requests"] == 1000
+    assert options["max_requests_jitter"] == 100
+    assert "max_requests_jitter" not in build_options(
+        replace(config, app_max_requests=0)
+    )
+
+
+def test_jitter_is_fixed_per_process(monkeypatch):
+    config = JitteredConfig("app:app", limit_max_requests=1000, max_requests_jitter=100)
+
+    first = config.limit_max_requests
+    assert 1000 <= first <= 1100
+    assert config.limit_max_requests == first
+
+    # 子进程拿到的是序列化后的配置：进程号不同时重新取随机偏移
+    worker = pickle.loads(pickle.dumps(config))
+    seen = set()
+    for pid in range(os.getpid() + 1, os.getpid() + 50):
+        monkeypatch.setattr(os, "getpid", lambda pid=pid: pid)
+        seen.add(worker.limit_max_requests)
+    assert all(1000 <= value <= 1100 for value in seen)
+    assert len(seen) > 1
+
+
+def test_no_limit_without_max_requests():
+    assert JitteredConfig("app:app", max_requests_jitter=100).limit_max_requests is None
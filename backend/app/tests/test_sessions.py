@@ -0,0 +1,90 @@
+from types import SimpleNamespace
+import anyio
+import pytest
+from core import exceptions, sessions
+from core.sessions import REFRESH_REUSE_GRACE, SessionStore
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """会话脚本使用的时间由调用方传入，这里只替换 core.sessions 中的 time，不影响 fakeredis 的过期"""
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(sessions, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def store(redis):
+    return SessionStore(redis)
+
+
+async def test_rotate_replaces_jti(store, redis, clock):
+    sid, jti = await store.create("u1", ttl=3600, user_meta='{"uuid": "u1"}')
+
+    new_jti, meta = await store.rotate("u1", sid, jti, ttl=3600)
+
+    assert new_jti != jti
+    assert meta == '{"uuid": "u1"}'
+    assert await redis.hget(f"sess:{sid}", "jti") == new_jti
+    # 新令牌可以继续轮换
+    clock[0] += 60
+    assert (await store.rotate("u1", sid, new_jti, ttl=3600))[0] != new_jti
+
+
+async def test_concurrent_refresh_within_grace_keeps_session(store, clock):
+    sid, jti = await store.create("u1", ttl=3600)
+    new_jti, _ = await store.rotate("u1", sid, jti, ttl=3600)
+
+    clock[0] += REFRESH_REUSE_GRACE - 1
+    with pytest.raises(exceptions.InvalidVerifyToken):
+        await store.rotate("u1", sid, jti, ttl=3600)
+
+    await store.rotate("u1", sid, new_jti, ttl=3600)
+
+
+async def test_reuse_after_grace_revokes_session(store, redis, clock):
+    sid, jti = await store.create("u1", ttl=3600)
+    new_jti, _ = await store.rotate("u1", sid, jti, ttl=3600)
+
+    clock[0] += REFRESH_REUSE_GRACE + 1
+    with pytest.raises(exceptions.InvalidVerifyToken):
+        await store.rotate("u1", sid, jti, ttl=3600)
+
+    # 整个会话被吊销，合法持有者的新令牌同样失效
+    assert not await redis.exists(f"sess:{sid}")
+    assert sid not in await redis.smembers("sess:user:u1")
+    with pytest.raises(exceptions.InvalidVerifyToken):
+        await store.rotate("u1", sid, new_jti, ttl=3600)
+
+
+async def test_revoke_all_invalidates_existing_sessions(store, clock):
+    first = await store.create("u1", ttl=3600)
+    second = await store.create("u1", ttl=3600)
+
+    await store.revoke_all("u1")
+
+    for sid, jti in (first, second):
+        with pytest.raises(exceptions.InvalidVerifyToken):
+            await store.rotate("u1", sid, jti, ttl=3600)
+    # 吊销之后新建的会话不受影响
+    sid, jti = await store.create("u1", ttl=3600)
+    await store.rotate("u1", sid, jti, ttl=3600)
+
+
+async def test_rotate_rejects_other_users_session(store, clock):
+    sid, jti = await store.create("u1", ttl=3600)
+
+    with pytest.raises(exceptions.InvalidVerifyToken):
+        await store.rotate("u2", sid, jti, ttl=3600)
+
+
+async def test_session_expires(store, redis, clock):
+    sid, jti = await store.create("u1", ttl=1)
+    assert 0 < await redis.ttl(f"sess:{sid}") <= 1
+
+    await anyio.sleep(1.1)
+
+    with pytest.raises(exceptions.InvalidVerifyToken):
+        await store.rotate("u1", sid, jti, ttl=1)
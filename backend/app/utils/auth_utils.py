@@ -1,8 +1,19 @@
 # utils/auth_utils.py
-from passlib.context import CryptContext
+from functools import lru_cache
 
-# 定义加密上下文，使用 bcrypt 算法
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    """
+    获取密码加密上下文（bcrypt 算法）
+
+    说明:
+        - passlib / bcrypt 只在登录、注册等少数接口使用，首次调用时才导入，
+          避免拖慢 worker 启动。
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def hash_password(password: str) -> str:
@@ -20,7 +31,7 @@ def hash_password(password: str) -> str:
         - hash 函数内部自动处理盐值生成。
         - 不建议明文密码存储或传输，必须先调用此函数加密。
     """
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -38,4 +49,4 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         - 通过 bcrypt 算法进行校验，自动处理盐值和算法细节。
         - 仅用于验证登录等场景，不用于生成新哈希。
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
@@ -0,0 +1,16 @@
+# utils/dates.py
+from datetime import datetime, timezone
+
+
+def to_utc(value: datetime) -> datetime:
+    """
+    把时间统一转换为 UTC（带时区）
+
+    说明:
+        - SQLite 的 DateTime(timezone=True) 不保存时区偏移，只保存墙上时间；
+          写入前必须先转换为 UTC，否则 +08:00 的 12:00 会被当作 12:00Z 比较。
+        - 不带时区的时间（如 SQLite 读出的值）按 UTC 处理。
+    """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
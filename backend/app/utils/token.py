@@ -1,19 +1,19 @@
 # utils/token_utils.py
+import secrets
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional
-from dotenv import load_dotenv
-import os
 import jwt
 
 from core import exceptions
+from core.config import settings
+from core.revocation import revocation_list
 
 
-load_dotenv()  # 加载环境变量
-
-SECRET_KEY = os.getenv("SECRET_KEY")
-ALGORITHM = os.getenv("ALGORITHM")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
-FRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("FRESH_TOKEN_EXPIRE_DAYS", 7))
+SECRET_KEY = settings.secret_key
+ALGORITHM = settings.algorithm
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
+FRESH_TOKEN_EXPIRE_DAYS = settings.fresh_token_expire_days
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -30,6 +30,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     说明:
         - 令牌中会自动包含“exp”字段，表示过期时间，JWT 解码时会自动校验。
         - 使用 UTC 时间作为过期时间，保证时区一致性。
+        - 令牌中包含 jti（令牌 ID）与 iat（签发时间，毫秒精度），用于吊销校验。
     """
     to_encode = data.copy()
 
@@ -40,7 +41,14 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
             minutes=ACCESS_TOKEN_EXPIRE_MINUTES
         )
 
-    to_encode.update({"exp": expire, "token_type": "access"})
+    to_encode.update(
+        {
+            "exp": expire,
+            "iat": round(time.time(), 3),
+            "jti": secrets.token_urlsafe(12),
+            "token_type": "access",
+        }
+    )
 
     # 生成 token
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
@@ -99,14 +107,17 @@ def verify_access_token(token: str) -> dict:
         - 使用 SECRET_KEY 和指定算法对令牌进行解码和验证。
         - 验证过程中包含对“exp”字段的自动校验，过期则视为无效。
         - 不捕获具体 jwt 异常，统一抛出自定义异常，便于统一异常处理。
+        - 吊销校验只查询进程内的吊销列表（core.revocation），不访问 Redis。
     """
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        if payload.get("token_type") != "access":
-            raise exceptions.InvalidVerifyToken()
-        return payload
     except Exception:
         raise exceptions.InvalidVerifyToken()
+    if payload.get("token_type") != "access":
+        raise exceptions.InvalidVerifyToken()
+    if revocation_list.is_revoked(payload):
+        raise exceptions.InvalidVerifyToken("令牌已吊销")
+    return payload
 
 
 def verify_fresh_token(token: str) -> dict:
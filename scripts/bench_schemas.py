@@ -0,0 +1,227 @@
+"""
+schema / 序列化层微基准
+
+单独测量请求热路径上 pydantic 相关的开销：
+- User.model_validate（ORM 对象 -> 响应模型）
+- AssignmentData.model_validate（含 attachments 字段的 JSON 字符串解析）
+- to_response 统一响应封装（PageData -> ApiResponse -> JSONResponse）
+- exception_handlers.build_response 错误响应构建
+
+每个用例输出 ops/sec、单次平均耗时以及单次调用的内存分配情况（tracemalloc）。
+
+用法:
+    python scripts/bench_schemas.py
+    python scripts/bench_schemas.py --sizes 10 100 1000 --min-time 0.5
+    python scripts/bench_schemas.py --filter assignment --json bench.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.join(os.path.dirname(SCRIPT_DIR), "backend", "app")
+sys.path.insert(0, APP_DIR)
+
+from core.exception_handlers import build_response  # noqa: E402
+from core.exceptions import NotExists, PermissionDenied  # noqa: E402
+from core.response import to_response  # noqa: E402
+from models.class_model import AssignmentModel  # noqa: E402
+from models.user import User as UserModel  # noqa: E402
+from schemas.Response import AssignmentData, PageData, Pagination  # noqa: E402
+from schemas.User import User  # noqa: E402
+
+# 基准过程中不输出日志，避免 I/O 干扰测量结果
+logging.disable(logging.CRITICAL)
+
+
+def make_user(i: int = 0) -> UserModel:
+    """构造一个与数据库加载结果字段一致的 ORM 用户对象"""
+    now = datetime.now(timezone.utc)
+    return UserModel(
+        uuid=f"00000000-0000-4000-8000-{i:012d}",
+        username=f"student_{i}",
+        email=f"student_{i}@example.edu",
+        role="student",
+        status="active",
+        created_at=now,
+        last_login=now,
+        hashed_password="$2b$12$" + "x" * 53,
+        profile_name=f"学生{i}",
+        avatar_url="https://www.gstatic.com/images/branding/product/1x/avatar_circle_blue_512dp.png",
+    )
+
+
+def make_assignment(i: int = 0) -> AssignmentModel:
+    """构造一个 ORM 作业对象，attachments 与 create_assignment 写入的格式一致（JSON 字符串）"""
+    now = datetime.now(timezone.utc)
+    attachments = json.dumps(
+        [
+            {"filename": f"作业{i}-说明.pdf", "url": f"https://cdn.example.edu/a/{i}.pdf"},
+            {"filename": f"作业{i}-模板.docx", "url": f"https://cdn.example.edu/t/{i}.docx"},
+        ],
+        separators=(",", ":"),
+    )
+    return AssignmentModel(
+        uuid=f"10000000-0000-4000-8000-{i:012d}",
+        class_uuid="20000000-0000-4000-8000-000000000000",
+        title=f"第{i}次作业：线性代数练习",
+        description="完成教材第三章课后习题",
+        content="请独立完成以下题目，并在截止时间前提交。" * 20,
+        status="published",
+        deadline=now + timedelta(days=7),
+        max_score=100,
+        allow_late_submission=False,
+        attachments=attachments,
+        submission_count=i % 50,
+        updated_at=now,
+        created_by="teacher_0",
+        created_at=now,
+    )
+
+
+def bench(func: Callable[[], object], min_time: float) -> dict:
+    """
+    运行单个用例：先预热，再在 min_time 秒内尽量多次执行以计算吞吐量，
+    最后在 tracemalloc 下单独执行一次以统计内存分配。
+    """
+    for _ in range(3):
+        func()
+
+    loops = 0
+    start = time.perf_counter()
+    deadline = start + min_time
+    while True:
+        func()
+        loops += 1
+        now = time.perf_counter()
+        if now >= deadline:
+            break
+    elapsed = now - start
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+
+    return {
+        "loops": loops,
+        "ops_per_sec": loops / elapsed,
+        "mean_us": elapsed / loops * 1e6,
+        "peak_kib": peak / 1024,
+        "net_blocks": blocks,
+    }
+
+
+def build_cases(sizes: list[int]) -> list[tuple[str, Callable[[], object]]]:
+    """构造全部基准用例，返回 (名称, 无参可调用对象) 列表"""
+    cases: list[tuple[str, Callable[[], object]]] = []
+
+    user = make_user()
+    cases.append(("user.model_validate", lambda: User.model_validate(user)))
+
+    for size in sizes:
+        users = [make_user(i) for i in range(size)]
+        assignments = [make_assignment(i) for i in range(size)]
+        pagination = Pagination(page=1, size=size, total=size, pages=1)
+
+        def validate_assignments(assignments=assignments):
+            return [AssignmentData.model_validate(item) for item in assignments]
+
+        def assignment_page(assignments=assignments, pagination=pagination):
+            return to_response(
+                data=PageData(
+                    items=[AssignmentData.model_validate(item) for item in assignments],
+                    pagination=pagination,
+                )
+            )
+
+        def user_page(users=users, pagination=pagination):
+            return to_response(
+                data=PageData(
+                    items=[User.model_validate(item) for item in users],
+                    pagination=pagination,
+                )
+            )
+
+        cases.append((f"assignment.model_validate[{size}]", validate_assignments))
+        cases.append((f"to_response.assignment_page[{size}]", assignment_page))
+        cases.append((f"to_response.user_page[{size}]", user_page))
+
+    cases.append(("to_response.empty", lambda: to_response(message="success")))
+
+    def noop_log(msg, exc_info=False):
+        return None
+
+    not_exists = NotExists(uuid=user.uuid)
+    permission_denied = PermissionDenied("非教师或管理员，拒绝访问")
+    cases.append(
+        ("build_response.not_exists", lambda: build_response(not_exists, noop_log))
+    )
+    cases.append(
+        (
+            "build_response.permission_denied",
+            lambda: build_response(permission_denied, noop_log),
+        )
+    )
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description="schema / 序列化层微基准")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1000],
+        help="每页数据条数（默认 10 100 1000）",
+    )
+    parser.add_argument(
+        "--min-time", type=float, default=1.0, help="每个用例的最短运行时间（秒）"
+    )
+    parser.add_argument("--filter", default=None, help="只运行名称包含该子串的用例")
+    parser.add_argument("--json", default=None, help="将结果写入 JSON 文件，便于对比")
+    args = parser.parse_args()
+
+    results = {}
+    header = f"{'case':<40} {'ops/sec':>12} {'mean(us)':>12} {'peak(KiB)':>11} {'blocks':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, func in build_cases(args.sizes):
+        if args.filter and args.filter not in name:
+            continue
+        result = bench(func, args.min_time)
+        results[name] = result
+        print(
+            f"{name:<40} {result['ops_per_sec']:>12.1f} {result['mean_us']:>12.1f} "
+            f"{result['peak_kib']:>11.1f} {result['net_blocks']:>8d}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "python": sys.version.split()[0],
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "results": results,
+                },
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
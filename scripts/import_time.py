@@ -0,0 +1,84 @@
+"""
+冷启动导入耗时报告
+
+在子进程中以 `python -X importtime -c "import app"` 导入后端应用，
+解析 importtime 输出，按累计耗时 / 自身耗时列出最慢的模块，
+并在总导入耗时超出预算时以非零状态码退出（可用于 CI 检查）。
+
+用法:
+    python scripts/import_time.py
+    python scripts/import_time.py --top 30 --sort self
+    python scripts/import_time.py --budget-ms 1500 --filter passlib
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.join(os.path.dirname(SCRIPT_DIR), "backend", "app")
+
+# import time:      self [us] |  cumulative | imported package
+LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def run_importtime(module: str) -> list[tuple[str, int, int, int]]:
+    """导入指定模块并返回 [(模块名, 自身耗时us, 累计耗时us, 嵌套层级)]"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=APP_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"导入 {module} 失败")
+    entries = []
+    for line in result.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="后端冷启动导入耗时报告")
+    parser.add_argument("--module", default="app", help="要导入的模块（默认 app）")
+    parser.add_argument("--top", type=int, default=20, help="列出最慢的前 N 个模块")
+    parser.add_argument(
+        "--sort", choices=("cumulative", "self"), default="cumulative", help="排序依据"
+    )
+    parser.add_argument("--filter", default=None, help="只显示名称包含该字符串的模块")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.getenv("STARTUP_BUDGET_MS", 3000)),
+        help="导入耗时预算（毫秒），超出时退出码为 1",
+    )
+    args = parser.parse_args()
+
+    entries = run_importtime(args.module)
+    # 顶层导入（层级 1）的累计耗时之和即为整体导入耗时
+    total_ms = sum(cum for _, _, cum, level in entries if level == 1) / 1000
+
+    rows = entries
+    if args.filter:
+        rows = [row for row in rows if args.filter in row[0]]
+    key_index = 2 if args.sort == "cumulative" else 1
+    rows = sorted(rows, key=lambda row: row[key_index], reverse=True)[: args.top]
+
+    print(f"{'cumulative(ms)':>15} {'self(ms)':>10}  module")
+    for name, self_us, cumulative_us, _ in rows:
+        print(f"{cumulative_us / 1000:>15.1f} {self_us / 1000:>10.1f}  {name}")
+    print(f"\n导入 {args.module} 共 {len(entries)} 个模块，总耗时 {total_ms:.0f}ms，预算 {args.budget_ms:.0f}ms")
+
+    if total_ms > args.budget_ms:
+        print("超出导入耗时预算", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()